@@ -1,23 +1,27 @@
 #!/usr/bin/env python3
 """
 Script d'intégration des questions générées dans questions.json
+
+Les chapitres de generate_all_chapters.py sont fusionnés par le compilateur
+incrémental (scripts/bank_compiler.py) : seules les questions dont le contenu
+a changé depuis la dernière intégration sont réécrites, et relancer le
+script ne ré-ajoute pas les chapitres.
 """
 
 import json
-from datetime import datetime
-from collections import Counter
-
-# Import the questions from the generation script
 import sys
-sys.path.append('.')
-from generate_all_chapters import ch2_questions, ch3_questions, ch4_questions, ch5_questions, ch6_questions
+from pathlib import Path
 
-# Load existing questions.json
-with open('data/questions.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+PROJECT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "scripts"))
+
+from bank_compiler import BankCompiler, QuestionSource
+from bank_types import AmbiguousTypeError
+from bank_profile import instrumented
 
 # Define chapter information for new chapters
-chapters_info = {
+CHAPTERS_INFO = {
     2: {
         "chapter_id": 2,
         "chapter_number": "2",
@@ -111,69 +115,62 @@ chapters_info = {
     }
 }
 
-# Add new chapters with their questions
-all_new_questions = {
-    2: ch2_questions,
-    3: ch3_questions,
-    4: ch4_questions,
-    5: ch5_questions,
-    6: ch6_questions
-}
 
-# Add new chapters to the data structure
-for chapter_num in [2, 3, 4, 5, 6]:
-    chapter_data = chapters_info[chapter_num].copy()
-    chapter_data["questions"] = all_new_questions[chapter_num]
-    data["chapters"].append(chapter_data)
-
-# Calculate new metadata
-total_questions = sum(len(ch["questions"]) for ch in data["chapters"])
-
-# Count by difficulty
-all_difficulties = []
-all_types = []
-for chapter in data["chapters"]:
-    for q in chapter["questions"]:
-        all_difficulties.append(q["difficulty"])
-        all_types.append(q["type"])
-
-difficulty_dist = dict(Counter(all_difficulties))
-type_dist = dict(Counter(all_types))
-
-# Update metadata
-data["metadata"] = {
-    "version": "1.1.0",
-    "generated_date": datetime.now().strftime("%Y-%m-%d"),
-    "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    "total_questions": total_questions,
-    "questions_by_chapter": {f"chapter_{ch['chapter_id']}": len(ch["questions"]) for ch in data["chapters"]},
-    "difficulty_distribution": difficulty_dist,
-    "question_types": type_dist
-}
 
-# Update course_info
-data["course_info"]["total_questions"] = total_questions
-
-# Write back to questions.json with proper formatting
-with open('data/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
-
-print("=" * 70)
-print("✅ INTÉGRATION RÉUSSIE!")
-print("=" * 70)
-print(f"\n📊 STATISTIQUES FINALES:")
-print(f"   • Total questions : {total_questions}")
-print(f"\n   • Par chapitre :")
-for ch in data["chapters"]:
-    print(f"      - Chapitre {ch['chapter_id']} : {len(ch['questions'])} questions")
-print(f"\n   • Par difficulté :")
-for diff, count in sorted(difficulty_dist.items()):
-    percentage = (count / total_questions) * 100
-    print(f"      - {diff:8s} : {count:3d} questions ({percentage:5.1f}%)")
-print(f"\n   • Par type :")
-for qtype, count in sorted(type_dist.items(), key=lambda x: -x[1]):
-    percentage = (count / total_questions) * 100
-    print(f"      - {qtype:15s} : {count:3d} questions ({percentage:5.1f}%)")
-print("\n" + "=" * 70)
-print("✅ Fichier data/questions.json mis à jour avec succès!")
-print("=" * 70)
+def load_generated_chapters():
+    """Importe les questions de generate_all_chapters.py (uniquement si modifié)"""
+    from generate_all_chapters import ch2_questions, ch3_questions, ch4_questions, ch5_questions, ch6_questions
+    return {
+        2: ch2_questions,
+        3: ch3_questions,
+        4: ch4_questions,
+        5: ch5_questions,
+        6: ch6_questions
+    }
+
+
+@instrumented("integrate_questions")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    source = QuestionSource(PROJECT_DIR / "generate_all_chapters.py",
+                            load_generated_chapters, CHAPTERS_INFO)
+    compiler = BankCompiler(sources=[source])
+    try:
+        report = compiler.compile(force='--force' in argv)
+    except AmbiguousTypeError as e:
+        print(f"❌ {e}")
+        print("   Ajoutez un champ \"type\" explicite à ces questions.")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("✅ INTÉGRATION RÉUSSIE!")
+    print("=" * 70)
+    report.print_summary()
+    if report.noop:
+        return
+
+    with open(compiler.bank_file, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)['metadata']
+    total_questions = metadata['total_questions']
+
+    print(f"\n📊 STATISTIQUES FINALES:")
+    print(f"   • Total questions : {total_questions}")
+    print(f"\n   • Par chapitre :")
+    for chapter, count in metadata['questions_by_chapter'].items():
+        print(f"      - Chapitre {chapter.split('_')[-1]} : {count} questions")
+    print(f"\n   • Par difficulté :")
+    for diff, count in sorted(metadata['difficulty_distribution'].items()):
+        percentage = (count / total_questions) * 100
+        print(f"      - {diff:8s} : {count:3d} questions ({percentage:5.1f}%)")
+    print(f"\n   • Par type :")
+    for qtype, count in sorted(metadata['question_types'].items(), key=lambda x: -x[1]):
+        percentage = (count / total_questions) * 100
+        print(f"      - {qtype:15s} : {count:3d} questions ({percentage:5.1f}%)")
+    print("\n" + "=" * 70)
+    print("✅ Fichier data/questions.json mis à jour avec succès!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
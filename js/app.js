@@ -11,6 +11,8 @@
 
 const CONFIG = {
     QUESTIONS_FILE: 'data/questions.json',
+    // Pointeur vers la version publiée (scripts/publish_bank.py)
+    RELEASE_POINTER: 'data/release/current.json',
     STORAGE_KEY: 'quantum_quiz_data',
     DEFAULT_QUESTION_COUNT: 20,
     TIMER_DURATION: 30 * 60, // 30 minutes en secondes pour mode examen
@@ -149,18 +151,32 @@ document.addEventListener('DOMContentLoaded', () => {
 // DATA LOADING
 // ============================================================================
 
+// Résout le fichier de questions à charger : la version publiée (nom haché,
+// cacheable indéfiniment) si le pointeur existe, sinon questions.json
+async function resolveQuestionsFile() {
+    try {
+        // Seul le pointeur (quelques centaines d'octets) est revalidé
+        const response = await fetch(CONFIG.RELEASE_POINTER, { cache: 'no-cache' });
+        if (response.ok) {
+            const pointer = await response.json();
+            if (pointer && pointer.file) {
+                return { url: pointer.file, cache: 'default' };
+            }
+        }
+    } catch (error) {
+        console.warn('Pointeur de version indisponible:', error.message);
+    }
+    return { url: CONFIG.QUESTIONS_FILE, cache: 'no-cache' };
+}
+
 async function loadQuestionsData() {
     try {
-        // Cache-busting pour Firefox + headers CORS
-        const cacheBust = `?v=${Date.now()}`;
-        console.log('📥 Chargement des questions depuis:', CONFIG.QUESTIONS_FILE);
+        const source = await resolveQuestionsFile();
+        console.log('📥 Chargement des questions depuis:', source.url);
 
-        const response = await fetch(CONFIG.QUESTIONS_FILE + cacheBust, {
+        const response = await fetch(source.url, {
             method: 'GET',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            cache: 'no-cache'
+            cache: source.cache
         });
 
         if (!response.ok) {
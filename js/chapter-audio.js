@@ -2,7 +2,10 @@
  * QUANTUM QUIZ - Module Audio des Chapitres
  * Lecture des fichiers audio MP3 pré-générés
  * Voix: fr-FR-DeniseNeural (Microsoft Edge TTS)
- * Fallback: Web Speech API si MP3 indisponible
+ * Lecture segmentée (playlist.json, Media Source Extensions) : démarre dès
+ * le premier segment, au débit choisi au démarrage selon le réseau
+ * Barre de progression : forme d'onde de la playlist, cliquable pour se déplacer
+ * Fallback: MP3 complet, puis Web Speech API si MP3 indisponible
  */
 
 const ChapterAudio = {
@@ -15,12 +18,21 @@ const ChapterAudio = {
     // État de lecture
     isPlaying: false,
 
-    // Mode de lecture actuel ('mp3' ou 'tts')
+    // Mode de lecture actuel ('stream', 'mp3' ou 'tts')
     currentMode: null,
 
     // Chemin vers les fichiers audio
     audioPath: 'assets/audio/chapters/',
 
+    // Playlists déjà chargées (numéro de chapitre -> playlist ou null)
+    playlists: {},
+
+    // Marge sur le débit estimé avant de choisir un encodage plus lourd
+    bandwidthSafety: 1.5,
+
+    // Barre de forme d'onde affichée pendant la lecture
+    waveformElement: null,
+
     /**
      * Initialisation du module
      */
@@ -30,7 +42,7 @@ const ChapterAudio = {
         // Vérifier si on est en mode file://
         if (window.location.protocol === 'file:') {
             console.warn('⚠️ Mode file:// détecté - les fichiers MP3 pourraient ne pas charger.');
-            console.warn('💡 Utilisez un serveur local: python3 -m http.server 8000');
+            console.warn('💡 Utilisez un serveur local: npm run serve (scripts/static_server.py)');
             this.forceUseTTS = true;
         }
     },
@@ -59,6 +71,246 @@ const ChapterAudio = {
             return;
         }
 
+        // Lecture segmentée si la playlist existe, sinon le MP3 complet
+        this.loadPlaylist(chapterNumber).then(playlist => {
+            if (!this.isPlaying || this.currentChapter !== chapterNumber) {
+                return;
+            }
+            if (playlist && this.canStream()) {
+                this.playSegments(chapterNumber, playlist);
+            } else {
+                this.playFile(chapterNumber);
+            }
+        });
+    },
+
+    /**
+     * Charge la playlist segmentée d'un chapitre (null si absente)
+     * @param {number} chapterNumber - Numéro du chapitre
+     * @returns {Promise<Object|null>} { duration, peaks, renditions: [{ name, bitrate, segments }] }
+     */
+    loadPlaylist(chapterNumber) {
+        if (chapterNumber in this.playlists) {
+            return Promise.resolve(this.playlists[chapterNumber]);
+        }
+        return fetch(`${this.audioPath}chapter_${chapterNumber}/playlist.json`)
+            .then(response => (response.ok ? response.json() : null))
+            .catch(() => null)
+            .then(playlist => {
+                this.playlists[chapterNumber] = playlist;
+                return playlist;
+            });
+    },
+
+    /**
+     * Durée et crêtes de la forme d'onde d'un chapitre (barre de progression)
+     * @param {number} chapterNumber - Numéro du chapitre
+     * @returns {Promise<{duration: number, peaks: number[]}|null>} crêtes de 0 à 100
+     */
+    getWaveform(chapterNumber) {
+        return this.loadPlaylist(chapterNumber).then(playlist => (
+            playlist ? { duration: playlist.duration, peaks: playlist.peaks } : null
+        ));
+    },
+
+    /**
+     * Affiche la forme d'onde du chapitre sous son en-tête : la partie lue
+     * est colorée, un clic déplace la lecture
+     * @param {number} chapterNumber - Numéro du chapitre
+     * @param {HTMLAudioElement} audio - Élément audio en cours de lecture
+     */
+    renderWaveform(chapterNumber, audio) {
+        this.getWaveform(chapterNumber).then(waveform => {
+            if (!waveform || !waveform.peaks || !waveform.peaks.length || this.currentAudio !== audio) {
+                return;
+            }
+            const btn = document.querySelector(`[data-chapter-audio="${chapterNumber}"]`);
+            const header = btn && btn.closest('.chapter-header');
+            if (!header) {
+                return;
+            }
+
+            this.removeWaveform();
+            const bar = document.createElement('div');
+            bar.className = 'audio-waveform';
+            bar.title = 'Cliquer pour se déplacer dans la lecture';
+            waveform.peaks.forEach(peak => {
+                const span = document.createElement('span');
+                span.style.height = `${Math.max(peak, 4)}%`;
+                bar.appendChild(span);
+            });
+
+            bar.addEventListener('click', event => {
+                const rect = bar.getBoundingClientRect();
+                const fraction = Math.min(Math.max((event.clientX - rect.left) / rect.width, 0), 1);
+                this.seek(audio, fraction * waveform.duration);
+            });
+            audio.addEventListener('timeupdate', () => {
+                const played = Math.round(bar.children.length * audio.currentTime / waveform.duration);
+                Array.from(bar.children).forEach((span, index) => {
+                    span.classList.toggle('played', index < played);
+                });
+            });
+
+            header.insertAdjacentElement('afterend', bar);
+            this.waveformElement = bar;
+        });
+    },
+
+    /**
+     * Déplace la lecture, sans dépasser ce qui est déjà téléchargé (lecture
+     * segmentée : les segments suivants arrivent encore)
+     * @param {HTMLAudioElement} audio - Élément audio
+     * @param {number} time - Position visée (secondes)
+     */
+    seek(audio, time) {
+        if (this.currentAudio !== audio) {
+            return;
+        }
+        const buffered = audio.buffered;
+        if (buffered && buffered.length) {
+            time = Math.min(time, buffered.end(buffered.length - 1));
+        }
+        audio.currentTime = time;
+    },
+
+    /**
+     * Retire la forme d'onde affichée
+     */
+    removeWaveform() {
+        if (this.waveformElement) {
+            this.waveformElement.remove();
+            this.waveformElement = null;
+        }
+    },
+
+    /**
+     * Le navigateur peut-il assembler des segments MP3 (Media Source Extensions) ?
+     * @returns {boolean}
+     */
+    canStream() {
+        return typeof MediaSource !== 'undefined' && MediaSource.isTypeSupported('audio/mpeg');
+    },
+
+    /**
+     * Choisit l'encodage de toute la lecture. Les segments d'un encodage ne
+     * se décodent qu'à la suite les uns des autres (réservoir de bits MP3,
+     * délai d'encodeur propre à chaque encodage) : pas de changement en cours
+     * de lecture.
+     * @param {Object} playlist - Playlist du chapitre (encodages du plus léger au plus lourd)
+     * @returns {Object} Encodage retenu
+     */
+    pickRendition(playlist) {
+        const renditions = playlist.renditions;
+        const connection = navigator.connection;
+        if (connection && connection.saveData) {
+            return renditions[0];
+        }
+
+        const estimate = connection && connection.downlink ? connection.downlink * 1000 : null;
+        if (estimate === null) {
+            const slow = connection && ['slow-2g', '2g', '3g'].includes(connection.effectiveType);
+            return slow ? renditions[0] : renditions[renditions.length - 1];
+        }
+
+        const affordable = renditions.filter(r => r.bitrate * this.bandwidthSafety <= estimate);
+        return affordable.length ? affordable[affordable.length - 1] : renditions[0];
+    },
+
+    /**
+     * Télécharge un segment
+     * @returns {Promise<ArrayBuffer>}
+     */
+    fetchSegment(segment) {
+        return fetch(segment.url).then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.arrayBuffer();
+        });
+    },
+
+    /**
+     * Lecture segment par segment : la lecture démarre après le premier
+     * segment, le suivant est téléchargé pendant l'ajout du courant
+     * @param {number} chapterNumber - Numéro du chapitre
+     * @param {Object} playlist - Playlist du chapitre
+     */
+    playSegments(chapterNumber, playlist) {
+        const mediaSource = new MediaSource();
+        const audio = new Audio();
+        audio.src = URL.createObjectURL(mediaSource);
+        this.currentAudio = audio;
+        this.currentMode = 'stream';
+
+        const isCurrent = () => this.currentAudio === audio && this.isPlaying;
+        const rendition = this.pickRendition(playlist);
+        const segmentCount = rendition.segments.length;
+        const append = (sourceBuffer, data) => new Promise((resolve, reject) => {
+            sourceBuffer.addEventListener('updateend', resolve, { once: true });
+            sourceBuffer.addEventListener('error', reject, { once: true });
+            sourceBuffer.appendBuffer(data);
+        });
+
+        audio.addEventListener('ended', () => {
+            URL.revokeObjectURL(audio.src);
+            if (this.currentAudio === audio) {
+                this.onPlaybackEnded(chapterNumber);
+            }
+        });
+
+        mediaSource.addEventListener('sourceopen', async () => {
+            const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+            // Segments placés bout à bout
+            sourceBuffer.mode = 'sequence';
+
+            let started = false;
+            try {
+                let pending = this.fetchSegment(rendition.segments[0]);
+                for (let index = 0; index < segmentCount; index++) {
+                    const data = await pending;
+                    if (!isCurrent()) {
+                        return;
+                    }
+                    pending = index + 1 < segmentCount ? this.fetchSegment(rendition.segments[index + 1]) : null;
+                    await append(sourceBuffer, data);
+                    if (!started) {
+                        started = true;
+                        console.log(`✅ Lecture segmentée chapitre ${chapterNumber} (${rendition.name}, ${rendition.bitrate} kb/s)`);
+                        this.renderWaveform(chapterNumber, audio);
+                        audio.play().catch(err => {
+                            console.warn('❌ Erreur lecture segmentée:', err);
+                            this.switchToTTS(chapterNumber);
+                        });
+                    }
+                }
+                if (isCurrent() && mediaSource.readyState === 'open') {
+                    mediaSource.endOfStream();
+                }
+            } catch (err) {
+                if (!isCurrent()) {
+                    return;
+                }
+                if (started) {
+                    // Le début est déjà lu : on termine avec ce qui a été reçu
+                    console.warn('⚠️ Segment indisponible, fin de la lecture:', err);
+                    if (mediaSource.readyState === 'open') {
+                        mediaSource.endOfStream();
+                    }
+                } else {
+                    console.warn('❌ Lecture segmentée impossible, fallback vers le MP3 complet:', err);
+                    audio.src = '';
+                    this.playFile(chapterNumber);
+                }
+            }
+        }, { once: true });
+    },
+
+    /**
+     * Joue le fichier MP3 complet d'un chapitre (fallback: synthèse vocale)
+     * @param {number} chapterNumber - Numéro du chapitre
+     */
+    playFile(chapterNumber) {
         // Essayer de charger le fichier MP3
         const audioFile = `${this.audioPath}chapter_${chapterNumber}.mp3`;
         console.log(`🔍 Tentative de chargement: ${audioFile}`);
@@ -84,17 +336,12 @@ const ChapterAudio = {
                     console.warn('❌ Erreur lecture MP3:', err);
                     this.switchToTTS(chapterNumber);
                 });
+                this.renderWaveform(chapterNumber, this.currentAudio);
             }
         }, { once: true });
 
         // Quand la lecture se termine
-        this.currentAudio.addEventListener('ended', () => {
-            console.log(`✅ Fin lecture chapitre ${chapterNumber}`);
-            this.isPlaying = false;
-            this.currentChapter = null;
-            this.currentMode = null;
-            this.updateButtonState(chapterNumber, false);
-        });
+        this.currentAudio.addEventListener('ended', () => this.onPlaybackEnded(chapterNumber));
 
         // En cas d'erreur de chargement
         this.currentAudio.addEventListener('error', (e) => {
@@ -107,6 +354,19 @@ const ChapterAudio = {
         this.currentAudio.load();
     },
 
+    /**
+     * Fin normale de la lecture d'un fichier audio
+     * @param {number} chapterNumber - Numéro du chapitre
+     */
+    onPlaybackEnded(chapterNumber) {
+        console.log(`✅ Fin lecture chapitre ${chapterNumber}`);
+        this.removeWaveform();
+        this.isPlaying = false;
+        this.currentChapter = null;
+        this.currentMode = null;
+        this.updateButtonState(chapterNumber, false);
+    },
+
     /**
      * Bascule vers la synthèse vocale
      * @param {number} chapterNumber - Numéro du chapitre
@@ -118,6 +378,7 @@ const ChapterAudio = {
             this.currentAudio.src = '';
             this.currentAudio = null;
         }
+        this.removeWaveform();
 
         // Si on n'est plus en mode lecture, ne pas démarrer TTS
         if (!this.isPlaying || this.currentChapter !== chapterNumber) {
@@ -189,6 +450,7 @@ const ChapterAudio = {
             this.currentAudio.src = '';
             this.currentAudio = null;
         }
+        this.removeWaveform();
 
         // Arrêter la synthèse vocale
         if ('speechSynthesis' in window && speechSynthesis.speaking) {
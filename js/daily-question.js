@@ -79,8 +79,7 @@ const DailyQuestion = {
      */
     async loadQuestions() {
         try {
-            const response = await fetch('data/questions.json');
-            this.questionsData = await response.json();
+            this.questionsData = await loadQuestionBank();
         } catch (error) {
             console.error('Erreur chargement questions:', error);
         }
@@ -94,8 +94,7 @@ const ExamMode = {
      */
     async loadQuestionsData() {
         try {
-            const response = await fetch('data/questions.json');
-            this.questionsData = await response.json();
+            this.questionsData = await loadQuestionBank();
             console.log('✅ Questions chargées pour l\'examen');
         } catch (error) {
             console.error('Erreur chargement questions:', error);
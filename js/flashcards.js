@@ -41,8 +41,7 @@ const FlashcardsMode = {
      */
     async loadQuestions() {
         try {
-            const response = await fetch('data/questions.json');
-            this.questionsData = await response.json();
+            this.questionsData = await loadQuestionBank();
             this.generateFlashcards();
         } catch (error) {
             console.error('Erreur chargement questions:', error);
@@ -47,7 +47,7 @@ const QuestionRenderer = {
             img.alt = question.image_alt || 'Image de la question';
             img.className = 'question-image';
             img.loading = 'lazy'; // Lazy loading natif pour meilleures performances
-            header.appendChild(img);
+            header.appendChild(createResponsiveImage(question, img));
         }
 
         // Formule principale (optionnel)
@@ -452,6 +452,10 @@ const QuestionRenderer = {
 
         // Attendre que l'image soit chargée pour initialiser le canvas
         img.onload = () => {
+            // Dimensions propres à la question (image_dimensions peut différer
+            // d'une question à l'autre pour une même figure)
+            const size = this.figureSize(question, img);
+
             // Petit délai pour s'assurer que le layout CSS est terminé
             setTimeout(() => {
                 const displayWidth = img.clientWidth || img.offsetWidth;
@@ -463,34 +467,7 @@ const QuestionRenderer = {
                 canvas.style.height = displayHeight + 'px';
 
                 const ctx = canvas.getContext('2d');
-
-                // Pour les SVG, naturalWidth/Height peut être 0 ou incorrect
-                // Utiliser les dimensions définies dans l'image ou estimer à partir des hotspots
-                let naturalWidth = img.naturalWidth;
-                let naturalHeight = img.naturalHeight;
-
-                // Si les dimensions naturelles ne sont pas disponibles (SVG), essayer d'autres méthodes
-                if (!naturalWidth || !naturalHeight || naturalWidth === 0 || naturalHeight === 0) {
-                    // Pour les SVG, utiliser les dimensions connues basées sur le nom du fichier
-                    // ou estimer à partir des coordonnées hotspot
-                    if (question.image_dimensions) {
-                        // Dimensions explicites fournies dans la question
-                        naturalWidth = question.image_dimensions.width;
-                        naturalHeight = question.image_dimensions.height;
-                    } else {
-                        // Trouver les coordonnées max dans les hotspots pour estimer les dimensions
-                        const maxX = Math.max(...question.hotspots.map(h => h.x + h.radius));
-                        const maxY = Math.max(...question.hotspots.map(h => h.y + h.radius));
-                        // Ajouter une marge de 15% et arrondir
-                        naturalWidth = Math.max(600, Math.ceil(maxX * 1.15));
-                        naturalHeight = Math.max(400, Math.ceil(maxY * 1.15));
-                    }
-                    console.log(`Hotspot: dimensions estimées à ${naturalWidth}x${naturalHeight}`);
-                }
-
-                // S'assurer que les dimensions sont cohérentes
-                if (naturalWidth < 100) naturalWidth = 600;
-                if (naturalHeight < 100) naturalHeight = 400;
+                const { width: naturalWidth, height: naturalHeight } = size;
 
                 const scaleX = displayWidth / naturalWidth;
                 const scaleY = displayHeight / naturalHeight;
@@ -557,7 +534,9 @@ const QuestionRenderer = {
             }, 50); // Délai de 50ms pour le layout CSS
         };
 
-        svgContainer.appendChild(img);
+        const picture = createResponsiveImage(question, img);
+        picture.style.display = 'block';
+        svgContainer.appendChild(picture);
         svgContainer.appendChild(canvas);
         hotspotArea.appendChild(svgContainer);
 
@@ -572,6 +551,41 @@ const QuestionRenderer = {
         container.appendChild(hotspotArea);
     },
 
+    // Dimensions d'origine de la figure, dans lesquelles sont exprimées les zones
+    figureSize(question, img) {
+        // Pour les SVG, naturalWidth/Height peut être 0 ou incorrect
+        // Utiliser les dimensions définies dans l'image ou estimer à partir des hotspots
+        // Avec srcset, naturalWidth est celle de la variante chargée : les
+        // coordonnées des hotspots sont exprimées dans l'image d'origine
+        let naturalWidth = question.image_variants ? question.image_variants.width : img.naturalWidth;
+        let naturalHeight = question.image_variants ? question.image_variants.height : img.naturalHeight;
+
+        // Si les dimensions naturelles ne sont pas disponibles (SVG), essayer d'autres méthodes
+        if (!naturalWidth || !naturalHeight || naturalWidth === 0 || naturalHeight === 0) {
+            // Pour les SVG, utiliser les dimensions connues basées sur le nom du fichier
+            // ou estimer à partir des coordonnées hotspot
+            if (question.image_dimensions) {
+                // Dimensions explicites fournies dans la question
+                naturalWidth = question.image_dimensions.width;
+                naturalHeight = question.image_dimensions.height;
+            } else {
+                // Trouver les coordonnées max dans les hotspots pour estimer les dimensions
+                const maxX = Math.max(...question.hotspots.map(h => h.x + h.radius));
+                const maxY = Math.max(...question.hotspots.map(h => h.y + h.radius));
+                // Ajouter une marge de 15% et arrondir
+                naturalWidth = Math.max(600, Math.ceil(maxX * 1.15));
+                naturalHeight = Math.max(400, Math.ceil(maxY * 1.15));
+            }
+            console.log(`Hotspot: dimensions estimées à ${naturalWidth}x${naturalHeight}`);
+        }
+
+        // S'assurer que les dimensions sont cohérentes
+        if (naturalWidth < 100) naturalWidth = 600;
+        if (naturalHeight < 100) naturalHeight = 400;
+
+        return { width: naturalWidth, height: naturalHeight };
+    },
+
     // Drag & Drop (glisser-déposer)
     renderDragDrop(question, container, mode) {
         const instruction = document.createElement('p');
@@ -48,16 +48,37 @@ const QuizEngine = {
                 return;
             }
 
-            const response = await fetch('data/questions.json');
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+            const targeted = this.config.questionIds && this.config.questionIds.length > 0;
+            const facetFilters = {
+                chapter: this.config.chapter === 'all' ? null : this.config.chapter,
+                difficulty: this.config.difficulties && this.config.difficulties.length > 0
+                    ? this.config.difficulties : null,
+                type: this.config.questionTypes && this.config.questionTypes.length > 0
+                    ? this.config.questionTypes : null
+            };
+
+            // Service de questions disponible : seules les questions du quiz sont téléchargées
+            if (!targeted) {
+                const served = await fetchQuestionsFromAPI(
+                    facetFilters, this.config.questionCount, this.getRecentQuestions()
+                );
+                if (served && served.length > 0) {
+                    this.questions = served;
+                    this.saveUsedQuestions(this.questions.map(q => q.id));
+                    console.log(`✅ Quiz final: ${this.questions.length} questions (service de questions)`);
+                    return;
+                }
             }
 
-            const data = await response.json();
+            // Un seul chapitre demandé : ne télécharger que son fragment
+            const singleChapter = this.config.chapter !== 'all' && !targeted;
+            const data = await loadQuestionBank(
+                singleChapter ? [parseInt(this.config.chapter)] : null
+            );
             console.log('Données chargées:', data);
 
             // Mode révision ciblée : sélectionner par IDs spécifiques
-            if (this.config.questionIds && this.config.questionIds.length > 0) {
+            if (targeted) {
                 console.log('🎯 Mode révision ciblée:', this.config.questionIds.length, 'questions');
                 const allQuestions = [];
                 data.chapters.forEach(ch => {
@@ -77,7 +98,13 @@ const QuizEngine = {
             // Sélectionne les questions selon la configuration
             let allQuestions = [];
 
-            if (this.config.chapter === 'all') {
+            // Index de facettes : intersection au lieu d'un parcours de la banque
+            const facets = await loadQuestionFacets();
+            const facetSelection = facets && selectQuestionsByFacets(facets, data, facetFilters);
+
+            if (facetSelection) {
+                allQuestions = facetSelection;
+            } else if (this.config.chapter === 'all') {
                 // Toutes les questions de tous les chapitres
                 data.chapters.forEach(ch => {
                     allQuestions.push(...ch.questions);
@@ -92,15 +119,15 @@ const QuizEngine = {
                 }
             }
 
-            // Filtre par difficulté
-            if (this.config.difficulties && this.config.difficulties.length > 0) {
+            // Filtre par difficulté (déjà appliqué par l'index de facettes)
+            if (!facetSelection && this.config.difficulties && this.config.difficulties.length > 0) {
                 allQuestions = allQuestions.filter(q =>
                     this.config.difficulties.includes(q.difficulty)
                 );
             }
 
             // Filtre par type de question
-            if (this.config.questionTypes && this.config.questionTypes.length > 0) {
+            if (!facetSelection && this.config.questionTypes && this.config.questionTypes.length > 0) {
                 allQuestions = allQuestions.filter(q => {
                     const questionType = getQuestionType(q);
                     return this.config.questionTypes.includes(questionType);
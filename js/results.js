@@ -273,11 +273,15 @@ const ResultsPage = {
 
         reviewContainer.innerHTML = '<p class="loading">Chargement de la révision...</p>';
 
+        // Explications pas encore chargées pendant le quiz (chargées à part de la banque)
+        await ensureExplanations(this.results.details.map(detail => detail.question));
+        const narrations = await loadExplanationAudio();
+
         const reviewHTML = [];
 
         for (let i = 0; i < this.results.details.length; i++) {
             const detail = this.results.details[i];
-            const questionHTML = await this.renderQuestionReview(detail, i + 1);
+            const questionHTML = await this.renderQuestionReview(detail, i + 1, narrations);
             reviewHTML.push(questionHTML);
         }
 
@@ -290,8 +294,9 @@ const ResultsPage = {
     },
 
     // Rend une question pour la révision
-    async renderQuestionReview(detail, questionNumber) {
+    async renderQuestionReview(detail, questionNumber, narrations = {}) {
         const { question, userAnswer, isCorrect, message } = detail;
+        const narration = narrations[question.id];
 
         const statusClass = isCorrect ? 'correct' : 'incorrect';
         const statusIcon = isCorrect ? '✓' : '✗';
@@ -315,7 +320,9 @@ const ResultsPage = {
 
                 <div class="review-explanation">
                     <strong>📖 Explication :</strong>
-                    <p>${question.explanation}</p>
+                    <p>${question.explanation || 'Pas d\'explication disponible.'}</p>
+                    ${narration ? `<audio class="explanation-audio" controls preload="none" src="${narration.url}"
+                        aria-label="Écouter l'explication"></audio>` : ''}
                     ${question.section_ref ? `<p class="section-ref">📚 Référence : Section ${question.section_ref}</p>` : ''}
                     ${this.getAnimationLinks(question)}
                 </div>
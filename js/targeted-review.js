@@ -434,8 +434,7 @@ const TargetedReview = {
         }
 
         // Charger les questions
-        const response = await fetch('data/questions.json');
-        const data = await response.json();
+        const data = await loadQuestionBank();
 
         const favoriteIds = Favorites.getIds();
         const questions = [];
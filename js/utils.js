@@ -78,8 +78,16 @@ async function waitForMathJax(timeout = 5000) {
     return true;
 }
 
+// Délimiteurs TeX reconnus par MathJax (voir js/mathjax-config.js)
+const TEX_DELIMITER_PATTERN = /\$|\\\(|\\\[/;
+
 // Rend les formules LaTeX avec MathJax (avec cache pour performance)
 async function renderMath(element) {
+    // Formules déjà pré-rendues en MathML (data/math/) : rien à faire
+    if (element && !TEX_DELIMITER_PATTERN.test(element.textContent || '')) {
+        return;
+    }
+
     // Attend que MathJax soit prêt
     const ready = await waitForMathJax();
     if (!ready) {
@@ -106,6 +114,50 @@ async function renderMath(element) {
     }
 }
 
+// Aperçu affiché pendant le chargement (image_placeholder : couleur dominante
+// et miniature floue en data URI), retiré une fois l'image arrivée
+function applyImagePlaceholder(question, img) {
+    const placeholder = question.image_placeholder;
+    if (!placeholder) {
+        return;
+    }
+    img.style.backgroundColor = placeholder.color;
+    if (placeholder.thumbnail) {
+        img.style.backgroundImage = `url("${placeholder.thumbnail}")`;
+        img.style.backgroundSize = 'cover';
+    }
+    img.addEventListener('load', () => {
+        img.style.backgroundImage = '';
+        img.style.backgroundColor = '';
+    }, { once: true });
+}
+
+// Image d'une question : <picture> avec les variantes WebP/AVIF produites par
+// scripts/optimize_images.py (champ image_variants), sinon l'<img> seule.
+// Retourne l'élément à insérer ; `img` reste l'image d'origine (repli).
+function createResponsiveImage(question, img, sizes = '(max-width: 600px) 100vw, 600px') {
+    applyImagePlaceholder(question, img);
+    const variants = question.image_variants;
+    if (!variants || !variants.sources || variants.sources.length === 0) {
+        return img;
+    }
+    // Dimensions d'origine : le navigateur réserve la place (ratio) avant le chargement
+    img.width = variants.width;
+    img.height = variants.height;
+    img.style.height = 'auto';
+
+    const picture = document.createElement('picture');
+    variants.sources.forEach(entry => {
+        const source = document.createElement('source');
+        source.type = entry.type;
+        source.srcset = entry.srcset;
+        source.sizes = sizes;
+        picture.appendChild(source);
+    });
+    picture.appendChild(img);
+    return picture;
+}
+
 // Affiche une notification toast
 function showToast(message, type = 'info', duration = 3000) {
     const toast = document.createElement('div');
@@ -156,6 +208,568 @@ function getQuestionType(question) {
     return 'unknown';
 }
 
+// Banque binaire (data/questions.msgpack, scripts/bank_binary.py) : document
+// MessagePack avec une table de chaînes partagée et des codes d'énumération.
+// Plus rapide à décoder que JSON.parse de questions.min.json ; référencée
+// (url versionnée, tailles) par l'entrée 'binary' du manifeste des fragments.
+const BINARY_BANK_MAGIC = 'qq-bank';
+const BINARY_BANK_VERSION = 1;
+const BINARY_BANK_STRING_REF = 1;
+
+/**
+ * Décode la banque binaire (ArrayBuffer) en objet { course_info, metadata, chapters },
+ * identique à celui de questions.json.
+ */
+function decodeBinaryBank(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const view = new DataView(buffer);
+    const utf8 = new TextDecoder();
+    let pos = 0;
+    let strings = null;
+
+    const need = (n) => {
+        if (pos + n > bytes.length) {
+            throw new Error('Banque binaire tronquée');
+        }
+    };
+    const readStr = (n) => {
+        need(n);
+        pos += n;
+        return utf8.decode(bytes.subarray(pos - n, pos));
+    };
+    const readArray = (n) => {
+        const array = new Array(n);
+        for (let i = 0; i < n; i++) {
+            array[i] = read();
+        }
+        return array;
+    };
+    const readMap = (n) => {
+        const map = {};
+        for (let i = 0; i < n; i++) {
+            const key = read();
+            map[key] = read();
+        }
+        return map;
+    };
+    const readRef = (size) => {
+        need(1 + size);
+        const type = view.getInt8(pos);
+        const index = size === 1 ? view.getUint8(pos + 1)
+            : size === 2 ? view.getUint16(pos + 1) : view.getUint32(pos + 1);
+        pos += 1 + size;
+        if (type !== BINARY_BANK_STRING_REF || !strings) {
+            throw new Error(`Extension MessagePack inconnue: ${type}`);
+        }
+        return strings[index];
+    };
+
+    function read() {
+        need(1);
+        const code = bytes[pos++];
+        if (code < 0x80) return code;
+        if (code >= 0xe0) return code - 0x100;
+        if (code <= 0x8f) return readMap(code & 0x0f);
+        if (code <= 0x9f) return readArray(code & 0x0f);
+        if (code <= 0xbf) return readStr(code & 0x1f);
+
+        let value;
+        switch (code) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xd4: return readRef(1);
+            case 0xd5: return readRef(2);
+            case 0xd6: return readRef(4);
+            case 0xca: need(4); value = view.getFloat32(pos); pos += 4; return value;
+            case 0xcb: need(8); value = view.getFloat64(pos); pos += 8; return value;
+            case 0xcc: need(1); return bytes[pos++];
+            case 0xcd: need(2); value = view.getUint16(pos); pos += 2; return value;
+            case 0xce: need(4); value = view.getUint32(pos); pos += 4; return value;
+            case 0xcf: need(8); value = Number(view.getBigUint64(pos)); pos += 8; return value;
+            case 0xd0: need(1); return view.getInt8(pos++);
+            case 0xd1: need(2); value = view.getInt16(pos); pos += 2; return value;
+            case 0xd2: need(4); value = view.getInt32(pos); pos += 4; return value;
+            case 0xd3: need(8); value = Number(view.getBigInt64(pos)); pos += 8; return value;
+            case 0xd9: need(1); return readStr(bytes[pos++]);
+            case 0xda: need(2); pos += 2; return readStr(view.getUint16(pos - 2));
+            case 0xdb: need(4); pos += 4; return readStr(view.getUint32(pos - 4));
+            case 0xdc: need(2); pos += 2; return readArray(view.getUint16(pos - 2));
+            case 0xdd: need(4); pos += 4; return readArray(view.getUint32(pos - 4));
+            case 0xde: need(2); pos += 2; return readMap(view.getUint16(pos - 2));
+            case 0xdf: need(4); pos += 4; return readMap(view.getUint32(pos - 4));
+            default:
+                throw new Error(`Code MessagePack non supporté: 0x${code.toString(16)}`);
+        }
+    }
+
+    if (bytes[pos++] !== 0x96) {
+        throw new Error('En-tête de banque binaire invalide');
+    }
+    const magic = read();
+    const version = read();
+    if (magic !== BINARY_BANK_MAGIC || version !== BINARY_BANK_VERSION) {
+        throw new Error(`Format de banque inconnu: ${magic} v${version}`);
+    }
+
+    // Table des chaînes : un seul texte découpé selon les longueurs UTF-16
+    const text = read();
+    const lengths = read();
+    strings = new Array(lengths.length);
+    let offset = 0;
+    for (let i = 0; i < lengths.length; i++) {
+        strings[i] = text.slice(offset, offset + lengths[i]);
+        offset += lengths[i];
+    }
+
+    const enums = read();
+    const data = read();
+    const fields = Object.keys(enums);
+    data.chapters.forEach(chapter => {
+        chapter.questions.forEach(question => {
+            fields.forEach(field => {
+                if (field in question) {
+                    question[field] = enums[field][question[field]];
+                }
+            });
+        });
+    });
+    return data;
+}
+
+async function fetchBinaryBank(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return decodeBinaryBank(await response.arrayBuffer());
+}
+
+/**
+ * La banque binaire vaut-elle mieux que les fragments JSON ? Un hébergement
+ * statique ne la compresse pas forcément (GitHub Pages) : elle n'est choisie
+ * que si sa taille brute ne dépasse pas celle du JSON compressé.
+ */
+function preferBinaryBank(entry) {
+    return Boolean(entry && entry.url) && typeof TextDecoder !== 'undefined'
+        && entry.bytes <= entry.json_gzip_bytes;
+}
+
+// Banque de questions : chargement par fragments (un fichier par chapitre)
+const QUESTION_BANK_MANIFEST = 'data/shards/manifest.json';
+const QUESTION_BANK_FILE = 'data/questions.json';
+const questionBankCache = {
+    manifest: null,
+    chapters: new Map(),
+    figures: null,
+    binary: null
+};
+
+// Champs d'image partagés par les questions d'une même figure (data/shards/figures.json)
+const FIGURE_FIELDS = ['image_url', 'image_alt', 'image_dimensions', 'image_variants', 'image_placeholder'];
+
+/**
+ * Redéveloppe les questions hotspot d'un fragment (scripts/bank_figures.py) :
+ * { figure, regions: ['north', {...}] } -> { image_url, ..., hotspots: [{...}, {...}] }
+ */
+function expandFigures(chapter, catalog) {
+    chapter.questions = chapter.questions.map(question => {
+        const figure = question.figure !== undefined ? catalog.figures[question.figure] : null;
+        if (!figure) {
+            return question;
+        }
+        const expanded = {};
+        Object.keys(question).forEach(key => {
+            const value = question[key];
+            if (key === 'figure') {
+                FIGURE_FIELDS.forEach(field => {
+                    if (field in figure && !(field in question)) {
+                        expanded[field] = figure[field];
+                    }
+                });
+            } else if (key === 'regions') {
+                expanded.hotspots = value.map(region =>
+                    typeof region === 'string' ? { ...figure.regions[region] } : region);
+            } else if (value !== null || !FIGURE_FIELDS.includes(key)) {
+                expanded[key] = value;
+            }
+        });
+        return expanded;
+    });
+    return chapter;
+}
+
+async function fetchJSON(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+}
+
+/**
+ * Charge la banque de questions au format { course_info, metadata, chapters }.
+ * Si chapterIds est fourni, seuls ces chapitres sont téléchargés ; sinon
+ * la banque binaire est utilisée si le manifeste la désigne comme plus
+ * légère (preferBinaryBank).
+ * Sans manifeste (fragments non générés), retombe sur questions.json.
+ */
+async function loadQuestionBank(chapterIds = null) {
+    try {
+        if (!questionBankCache.manifest) {
+            questionBankCache.manifest = await fetchJSON(QUESTION_BANK_MANIFEST);
+        }
+        const manifest = questionBankCache.manifest;
+
+        if (!chapterIds && preferBinaryBank(manifest.binary)) {
+            try {
+                if (!questionBankCache.binary) {
+                    questionBankCache.binary = fetchBinaryBank(manifest.binary.url).then(async data => {
+                        await applyPrerenderedMath(data.chapters);
+                        return data;
+                    });
+                }
+                return await questionBankCache.binary;
+            } catch (err) {
+                console.warn('Banque binaire indisponible:', err.message);
+                questionBankCache.binary = null;
+            }
+        }
+
+        const wanted = chapterIds
+            ? manifest.shards.filter(shard => chapterIds.includes(shard.chapter_id))
+            : manifest.shards;
+
+        if (manifest.figures && !questionBankCache.figures) {
+            questionBankCache.figures = fetchJSON(manifest.figures.url);
+        }
+        const chapters = await Promise.all(wanted.map(async shard => {
+            if (!questionBankCache.chapters.has(shard.url)) {
+                questionBankCache.chapters.set(shard.url, fetchJSON(shard.url).then(async chapter => {
+                    if (questionBankCache.figures) {
+                        expandFigures(chapter, await questionBankCache.figures);
+                    }
+                    return chapter;
+                }));
+            }
+            return questionBankCache.chapters.get(shard.url);
+        }));
+        await applyPrerenderedMath(chapters);
+
+        // Explications : attendues pour la banque complète, préchargées sinon
+        if (chapterIds) {
+            prefetchChapterExplanations(chapters);
+        } else {
+            await loadChapterExplanations(chapters);
+        }
+
+        return {
+            course_info: manifest.course_info,
+            metadata: manifest.metadata,
+            chapters
+        };
+    } catch (err) {
+        console.warn('Fragments indisponibles, chargement de la banque complète:', err.message);
+        questionBankCache.manifest = null;
+        questionBankCache.figures = null;
+        questionBankCache.binary = null;
+        questionBankCache.chapters.clear();
+        return fetchJSON(QUESTION_BANK_FILE);
+    }
+}
+
+// Formules pré-rendues en MathML (data/math/, scripts/prerender_math.py).
+// Utilisées seulement si le navigateur affiche MathML nativement ; sinon
+// (ou si les fichiers manquent) MathJax rend le TeX comme avant.
+const PRERENDERED_MATH_MANIFEST = 'data/math/manifest.json';
+const prerenderedMathCache = {
+    manifest: null,
+    chapters: new Map()
+};
+
+function supportsNativeMathML() {
+    return typeof MathMLElement !== 'undefined';
+}
+
+async function applyPrerenderedMath(chapters) {
+    if (!supportsNativeMathML()) {
+        return;
+    }
+    try {
+        if (!prerenderedMathCache.manifest) {
+            prerenderedMathCache.manifest = fetchJSON(PRERENDERED_MATH_MANIFEST);
+        }
+        const manifest = await prerenderedMathCache.manifest;
+        const urls = new Map(manifest.chapters.map(entry => [entry.chapter_id, entry.url]));
+
+        await Promise.all(chapters.map(async chapter => {
+            const url = urls.get(chapter.chapter_id);
+            if (!url) {
+                return;
+            }
+            if (!prerenderedMathCache.chapters.has(url)) {
+                prerenderedMathCache.chapters.set(url, fetchJSON(url));
+            }
+            const math = await prerenderedMathCache.chapters.get(url);
+            chapter.questions.forEach((question, index) => {
+                // Alignement par position, vérifié par l'ID
+                const fields = math.fields[index];
+                if (fields && math.ids[index] === question.id) {
+                    Object.assign(question, fields);
+                }
+            });
+        }));
+    } catch (err) {
+        console.warn('Formules pré-rendues indisponibles:', err.message);
+        prerenderedMathCache.manifest = null;
+        prerenderedMathCache.chapters.clear();
+    }
+}
+
+// Explications chargées à part (data/explanations/, scripts/bank_explanations.py).
+// Les fragments n'en contiennent pas : elles sont préchargées en arrière-plan
+// une fois le quiz affiché, ou demandées au moment de la révision.
+const EXPLANATIONS_MANIFEST = 'data/explanations/manifest.json';
+const explanationsCache = {
+    manifest: null,
+    chapters: new Map()
+};
+
+function loadExplanationsManifest() {
+    if (!explanationsCache.manifest) {
+        explanationsCache.manifest = fetchJSON(EXPLANATIONS_MANIFEST);
+    }
+    return explanationsCache.manifest;
+}
+
+async function fetchExplanationBlock(chapterId) {
+    const manifest = await loadExplanationsManifest();
+    const entry = manifest.chapters.find(e => e.chapter_id === chapterId);
+    if (!entry) {
+        return null;
+    }
+    // Variante MathML si le navigateur la rend nativement
+    const url = entry.mathml_url && supportsNativeMathML() ? entry.mathml_url : entry.url;
+    if (!explanationsCache.chapters.has(url)) {
+        explanationsCache.chapters.set(url, fetchJSON(url));
+    }
+    return explanationsCache.chapters.get(url);
+}
+
+// Complète les questions d'un chapitre (alignement par position, vérifié par l'ID)
+function attachChapterExplanations(chapter, block) {
+    chapter.questions.forEach((question, index) => {
+        const text = block.explanations[index];
+        if (question.explanation === undefined && block.ids[index] === question.id && text != null) {
+            question.explanation = text;
+        }
+    });
+}
+
+async function loadChapterExplanations(chapters) {
+    try {
+        await Promise.all(chapters.map(async chapter => {
+            const block = await fetchExplanationBlock(chapter.chapter_id);
+            if (block) {
+                attachChapterExplanations(chapter, block);
+            }
+        }));
+    } catch (err) {
+        console.warn('Explications indisponibles:', err.message);
+        explanationsCache.manifest = null;
+        explanationsCache.chapters.clear();
+    }
+}
+
+// Préchargement sans retarder l'affichage de la première question
+function prefetchChapterExplanations(chapters) {
+    const run = () => loadChapterExplanations(chapters);
+    if (typeof requestIdleCallback === 'function') {
+        requestIdleCallback(run, { timeout: 2000 });
+    } else {
+        setTimeout(run, 0);
+    }
+}
+
+/**
+ * Complète l'explication de questions isolées (révision des résultats).
+ * Le chapitre d'une question est son chapter_id, sinon celui que donne
+ * l'index de facettes, sinon tous les chapitres sont consultés.
+ */
+async function ensureExplanations(questions) {
+    const missing = questions.filter(q => q && q.explanation === undefined);
+    if (missing.length === 0) {
+        return;
+    }
+    try {
+        const chapterIds = new Set(missing.filter(q => q.chapter_id !== undefined).map(q => q.chapter_id));
+        const unknown = new Set(missing.filter(q => q.chapter_id === undefined).map(q => q.id));
+        if (unknown.size > 0) {
+            const facets = await loadQuestionFacets();
+            if (facets) {
+                facets.chapters.forEach(entry => {
+                    for (let p = entry.start; p < entry.start + entry.count; p++) {
+                        if (unknown.has(facets.ids[p])) {
+                            chapterIds.add(entry.chapter_id);
+                        }
+                    }
+                });
+            } else {
+                const manifest = await loadExplanationsManifest();
+                manifest.chapters.forEach(entry => chapterIds.add(entry.chapter_id));
+            }
+        }
+
+        // Par ID et par (chapitre, ID) : un ID dupliqué désigne sa première occurrence
+        const byId = new Map();
+        const blocks = await Promise.all([...chapterIds].map(fetchExplanationBlock));
+        blocks.filter(Boolean).forEach(block => {
+            block.ids.forEach((id, index) => {
+                const text = block.explanations[index];
+                if (text == null) {
+                    return;
+                }
+                [`${block.chapter_id}:${id}`, id].forEach(key => {
+                    if (!byId.has(key)) {
+                        byId.set(key, text);
+                    }
+                });
+            });
+        });
+        missing.forEach(question => {
+            const key = question.chapter_id !== undefined ? `${question.chapter_id}:${question.id}` : question.id;
+            if (byId.has(key)) {
+                question.explanation = byId.get(key);
+            }
+        });
+    } catch (err) {
+        console.warn('Explications indisponibles:', err.message);
+        explanationsCache.manifest = null;
+        explanationsCache.chapters.clear();
+    }
+}
+
+// Lecture à voix haute des explications (assets/audio/explanations/,
+// scripts/narrate_explanations.py) : manifeste ID de question -> fichier.
+// Facultative : sans manifeste, aucune question n'a de lecture audio.
+const EXPLANATION_AUDIO_MANIFEST = 'assets/audio/explanations/manifest.json';
+let explanationAudioPromise = null;
+
+async function loadExplanationAudio() {
+    if (!explanationAudioPromise) {
+        explanationAudioPromise = fetchJSON(EXPLANATION_AUDIO_MANIFEST)
+            .then(manifest => manifest.questions || {})
+            .catch(() => ({}));
+    }
+    return explanationAudioPromise;
+}
+
+// Index de facettes (data/facets.json) : positions des questions par
+// chapitre, difficulté, type, tag et section
+const QUESTION_FACETS_FILE = 'data/facets.json';
+let questionFacetsPromise = null;
+
+async function loadQuestionFacets() {
+    if (!questionFacetsPromise) {
+        questionFacetsPromise = fetchJSON(QUESTION_FACETS_FILE).catch(err => {
+            console.warn('Index de facettes indisponible:', err.message);
+            return null;
+        });
+    }
+    return questionFacetsPromise;
+}
+
+/**
+ * Sélectionne les questions par intersection des facettes.
+ * filters: { chapter: '4', difficulty: ['hard'], type: ['hotspot'] }
+ * Retourne null si l'index ne correspond pas aux chapitres chargés
+ * (l'appelant retombe alors sur un parcours de la banque).
+ */
+function selectQuestionsByFacets(facets, data, filters) {
+    const chaptersById = new Map(data.chapters.map(ch => [ch.chapter_id, ch]));
+    for (const entry of facets.chapters) {
+        const chapter = chaptersById.get(entry.chapter_id);
+        if (chapter && chapter.questions.length !== entry.count) {
+            return null;
+        }
+    }
+
+    let selected = null;
+    for (const [name, wanted] of Object.entries(filters)) {
+        if (wanted === null || wanted === undefined) continue;
+        const values = Array.isArray(wanted) ? wanted : [wanted];
+        const positions = new Set();
+        values.forEach(value => {
+            (facets.index[name][String(value)] || []).forEach(p => positions.add(p));
+        });
+        selected = selected === null
+            ? positions
+            : new Set([...selected].filter(p => positions.has(p)));
+    }
+
+    const result = [];
+    const wantedPositions = selected === null
+        ? facets.ids.map((_, p) => p)
+        : [...selected].sort((a, b) => a - b);
+    for (const entry of facets.chapters) {
+        const chapter = chaptersById.get(entry.chapter_id);
+        if (!chapter) continue;
+        for (const p of wantedPositions) {
+            if (p < entry.start || p >= entry.start + entry.count) continue;
+            const question = chapter.questions[p - entry.start];
+            if (question.id !== facets.ids[p]) {
+                return null;
+            }
+            result.push(question);
+        }
+    }
+    return result;
+}
+
+// Service de questions (scripts/question_server.py) : le serveur tire les
+// questions du quiz et seules celles-ci sont téléchargées. Sur un hébergement
+// statique (pas de service), on retombe sur les fragments de la banque.
+const QUESTION_API_URL = 'api/questions';
+const QUESTION_API_UNAVAILABLE_KEY = 'question_api_unavailable';
+
+/**
+ * Tire `count` questions côté serveur.
+ * filters: { chapter: '3', difficulty: ['medium'], type: ['qcm', 'numerical'] }
+ * exclude: IDs déjà vus, utilisés seulement s'il ne reste pas assez d'autres questions.
+ * Retourne null si le service ne répond pas (mémorisé pour la session).
+ */
+async function fetchQuestionsFromAPI(filters, count, exclude = []) {
+    if (sessionStorage.getItem(QUESTION_API_UNAVAILABLE_KEY)) {
+        return null;
+    }
+
+    const params = new URLSearchParams({ count: String(count) });
+    for (const [name, wanted] of Object.entries(filters)) {
+        if (wanted === null || wanted === undefined) continue;
+        params.set(name, [].concat(wanted).join(','));
+    }
+    if (exclude.length > 0) {
+        params.set('exclude', exclude.join(','));
+    }
+
+    try {
+        const response = await fetch(`${QUESTION_API_URL}?${params}`);
+        if (response.status === 400) {
+            console.warn('Service de questions: requête refusée', await response.text());
+            return null;
+        }
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const payload = await response.json();
+        return payload.questions;
+    } catch (err) {
+        console.info('Service de questions indisponible, banque statique utilisée:', err.message);
+        sessionStorage.setItem(QUESTION_API_UNAVAILABLE_KEY, '1');
+        return null;
+    }
+}
+
 // Stockage local avec fallback
 const storage = {
     get(key, defaultValue = null) {
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP/1.1 minimal sur asyncio (bibliothèque standard uniquement)
+
+Utilisé par les services Python du projet (question_server.py,
+static_server.py). Un
+gestionnaire reçoit une Request et retourne une Response :
+
+    async def handler(request):
+        return json_response(request, {'ok': True})
+
+    await serve(handler, '127.0.0.1', 8001)
+
+Connexions persistantes (keep-alive), réponses HEAD sans corps, compression
+gzip négociée (Accept-Encoding) et validation par ETag (304 Not Modified)
+pour les réponses construites avec json_response / bytes_response.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+from email.utils import formatdate
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Limites de lecture d'une requête
+MAX_REQUEST_LINE = 8192
+MAX_HEADERS = 100
+# Connexion inactive fermée au bout de (secondes)
+KEEP_ALIVE_TIMEOUT = 15
+
+# Corps plus petits : pas de compression (l'en-tête gzip coûterait plus qu'il ne gagne)
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+
+class HTTPError(Exception):
+    """Erreur renvoyée au client avec son code HTTP"""
+
+    def __init__(self, status, message=None):
+        self.status = status
+        self.message = message or HTTPStatus(status).phrase
+        super().__init__(self.message)
+
+
+class Request:
+    def __init__(self, method, target, version, headers):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = parse_qs(parts.query)
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('accept-encoding', '')
+
+    def param(self, name, default=None):
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+    def list_param(self, name):
+        """Valeurs d'un paramètre répété ou séparé par des virgules (?type=qcm,numerical)"""
+        return [value for raw in self.query.get(name, []) for value in raw.split(',') if value]
+
+
+class Response:
+    """
+    Réponse HTTP. Le corps est soit `body` (octets), soit une portion de
+    fichier (`file_path`, `offset`, `length`) envoyée sans la charger en
+    mémoire.
+    """
+
+    def __init__(self, status=200, body=b'', headers=None, file_path=None, offset=0, length=None):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+        self.file_path = file_path
+        self.offset = offset
+        self.length = length
+
+    @property
+    def content_length(self):
+        return self.length if self.file_path is not None else len(self.body)
+
+
+def error_response(status, message=None):
+    body = json.dumps({'error': message or HTTPStatus(status).phrase}, ensure_ascii=False).encode('utf-8')
+    return Response(status, body, {'Content-Type': 'application/json; charset=utf-8'})
+
+
+def etag_for(payload):
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def etag_matches(request, etag):
+    """If-None-Match contient l'ETag (comparaison faible : W/ ignoré)"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag in candidates
+
+
+def bytes_response(request, payload, content_type, cache_control='no-cache', etag=None, headers=None):
+    """Réponse validée par ETag (304 si le client a déjà ce contenu), compressée si possible"""
+    headers = dict(headers or {})
+    headers['Content-Type'] = content_type
+    headers['Cache-Control'] = cache_control
+    if cache_control != 'no-store':
+        etag = etag or etag_for(payload)
+        headers['ETag'] = etag
+        if etag_matches(request, etag):
+            return Response(304, b'', {k: v for k, v in headers.items() if k != 'Content-Type'})
+    headers['Vary'] = 'Accept-Encoding'
+    if len(payload) >= GZIP_MIN_BYTES and request.accepts_gzip():
+        payload = gzip.compress(payload, GZIP_LEVEL, mtime=0)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(200, payload, headers)
+
+
+def json_response(request, obj, cache_control='no-cache', headers=None):
+    payload = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return bytes_response(request, payload, 'application/json; charset=utf-8', cache_control, headers=headers)
+
+
+async def read_request(reader):
+    """Lit la ligne de requête et les en-têtes ; None si le client a fermé la connexion"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if len(line) > MAX_REQUEST_LINE or not line.endswith(b'\n'):
+        raise HTTPError(414 if len(line) > MAX_REQUEST_LINE else 400)
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "ligne de requête invalide") from None
+    if not version.startswith('HTTP/1.'):
+        raise HTTPError(505)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS or len(line) > MAX_REQUEST_LINE:
+            raise HTTPError(431)
+        name, sep, value = line.decode('latin-1').partition(':')
+        if not sep:
+            raise HTTPError(400, "en-tête invalide")
+        headers[name.strip().lower()] = value.strip()
+
+    # Corps éventuel (ignoré : les services ne traitent que GET/HEAD)
+    length = int(headers.get('content-length') or 0)
+    if length:
+        await reader.readexactly(length)
+    return Request(method.upper(), target, version, headers)
+
+
+async def write_response(writer, request, response, keep_alive):
+    status = HTTPStatus(response.status)
+    headers = {
+        'Date': formatdate(usegmt=True),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+    }
+    if response.status != 304:
+        headers['Content-Length'] = str(response.content_length)
+    headers.update(response.headers)
+    head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+    head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    writer.write(head.encode('latin-1'))
+
+    if (request is not None and request.method == 'HEAD') or response.status in (204, 304):
+        await writer.drain()
+        return
+    if response.file_path is None:
+        writer.write(response.body)
+        await writer.drain()
+        return
+
+    await writer.drain()
+    loop = asyncio.get_running_loop()
+    with open(response.file_path, 'rb') as f:
+        await loop.sendfile(writer.transport, f, response.offset, response.length)
+
+
+async def handle_connection(handler, reader, writer):
+    try:
+        while True:
+            request = None
+            try:
+                request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                if request is None:
+                    break
+                if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+                    raise HTTPError(405)
+                response = await handler(request)
+                keep_alive = request.keep_alive
+            except HTTPError as e:
+                response = error_response(e.status, e.message)
+                keep_alive = False
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                break
+            except Exception as e:
+                print(f"❌ {request.method if request else '?'} {request.target if request else ''}: {e!r}")
+                response = error_response(500)
+                keep_alive = False
+            await write_response(writer, request, response, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def serve(handler, host, port, backlog=512):
+    """Démarre le serveur (connexions traitées par `handler`) ; retourne l'asyncio.Server"""
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(handler, reader, writer),
+        host, port, backlog=backlog,
+    )
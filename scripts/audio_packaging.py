@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Découpage des audios de chapitres en segments, en deux débits
+
+Pour chaque chapitre assets/audio/chapters/chapter_N.mp3 :
+
+    assets/audio/chapters/chapter_N/standard/000.mp3 ...   débit standard
+    assets/audio/chapters/chapter_N/low/000.mp3 ...        bas débit (réseaux lents)
+    assets/audio/chapters/chapter_N/playlist.json          segments, débits, durée, crêtes
+
+Les segments (~6 s) sont coupés aux limites de trames MP3 : le lecteur
+(js/chapter-audio.js) commence dès le premier segment. Une trame peut
+puiser ses données dans celles qui la précèdent (réservoir de bits,
+main_data_begin), et chaque encodage a son propre délai d'encodeur : les
+segments d'un encodage ne se décodent que bout à bout, dans l'ordre. Le
+lecteur choisit donc le débit au démarrage et le garde jusqu'à la fin.
+
+La durée, le débit de chaque encodage (choix du lecteur selon le réseau)
+et les crêtes de la forme d'onde (barre de progression) sont calculés à
+partir des en-têtes de trames, sans décoder l'audio : le débit est mesuré
+(octets des trames sur leur durée, même pour un MP3 à débit variable), et
+le gain global de chaque trame donne l'enveloppe du signal.
+
+Le réencodage (bas débit, ou source WAV) utilise ffmpeg s'il est installé ;
+sans ffmpeg, seul le MP3 d'origine est découpé (débit standard).
+"""
+
+import json
+import shutil
+import subprocess
+import wave
+from array import array
+from pathlib import Path
+
+from bank_io import atomic_write_bytes, atomic_write_text
+from bank_utils import bytes_hash, content_hash
+
+PLAYLIST_NAME = "playlist.json"
+PLAYLIST_VERSION = 2
+
+SEGMENT_SECONDS = 6
+PEAK_COUNT = 200
+# Gain global en dessous duquel une trame est affichée comme silence
+GAIN_FLOOR = 120
+SAMPLE_RATE = 24000
+
+# Encodages : nom -> débit de réencodage (kb/s). Le standard d'un MP3 est
+# le fichier d'origine : son débit réel est mesuré (mp3_bitrate).
+RENDITIONS = {
+    'low': 24,
+    'standard': 48,
+}
+
+# Tables des en-têtes MPEG audio, Layer III
+MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],   # MPEG-1
+    2: [22050, 24000, 16000],   # MPEG-2
+    0: [11025, 12000, 8000],    # MPEG-2.5
+}
+
+
+class Mp3Frame:
+    __slots__ = ('offset', 'length', 'samples', 'sample_rate', 'gain')
+
+    def __init__(self, offset, length, samples, sample_rate, gain):
+        self.offset = offset
+        self.length = length
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.gain = gain
+
+    @property
+    def duration(self):
+        return self.samples / self.sample_rate
+
+
+def id3v2_size(data):
+    """Taille de l'étiquette ID3v2 en tête de fichier (0 s'il n'y en a pas)"""
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def read_bits(data, start_bit, count):
+    value = 0
+    for i in range(start_bit, start_bit + count):
+        value = (value << 1) | ((data[i >> 3] >> (7 - (i & 7))) & 1)
+    return value
+
+
+def frame_gain(data, offset, version, protected, mono):
+    """
+    Gain global du premier granule de la trame (0 si la trame est silencieuse).
+    Position dans les informations annexes : main_data_begin, bits privés,
+    (scfsi en MPEG-1), part2_3_length, big_values, global_gain.
+    """
+    side = offset + 4 + (0 if protected else 2)
+    if version == 3:
+        bit = 9 + (5 if mono else 3) + (4 if mono else 8)
+    else:
+        bit = 8 + (1 if mono else 2)
+    if side + 8 > len(data):
+        return 0
+    part2_3_length = read_bits(data[side:side + 8], bit, 12)
+    if part2_3_length == 0:
+        return 0
+    return read_bits(data[side:side + 8], bit + 21, 8)
+
+
+def mp3_frames(data):
+    """Trames MPEG Layer III d'un fichier MP3 (étiquettes ID3 ignorées)"""
+    frames = []
+    pos = id3v2_size(data)
+    while pos + 4 <= len(data):
+        header = int.from_bytes(data[pos:pos + 4], 'big')
+        if header >> 21 != 0x7FF:
+            if data[pos:pos + 3] == b'TAG':  # ID3v1 en fin de fichier
+                break
+            raise ValueError(f"synchronisation MP3 perdue à l'octet {pos}")
+        version = (header >> 19) & 3
+        layer = (header >> 17) & 3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 3
+        if layer != 1 or version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+            raise ValueError(f"trame non prise en charge à l'octet {pos} (Layer III uniquement)")
+        protected = (header >> 16) & 1
+        padding = (header >> 9) & 1
+        mono = ((header >> 6) & 3) == 3
+        sample_rate = SAMPLE_RATES[version][rate_index]
+        if version == 3:
+            bitrate = MPEG1_BITRATES[bitrate_index]
+            samples = 1152
+            length = 144000 * bitrate // sample_rate + padding
+        else:
+            bitrate = MPEG2_BITRATES[bitrate_index]
+            samples = 576
+            length = 72000 * bitrate // sample_rate + padding
+        gain = frame_gain(data, pos, version, protected, mono)
+        frames.append(Mp3Frame(pos, length, samples, sample_rate, gain))
+        pos += length
+    if not frames:
+        raise ValueError("aucune trame MP3")
+    return frames
+
+
+def mp3_bitrate(frames):
+    """Débit moyen mesuré (kb/s) : octets des trames sur leur durée"""
+    duration = sum(frame.duration for frame in frames)
+    return round(sum(frame.length for frame in frames) * 8 / duration / 1000)
+
+
+def normalize_peaks(values, count=PEAK_COUNT):
+    """Regroupe `values` en `count` crêtes entières de 0 à 100"""
+    if not values:
+        return []
+    bins = []
+    for i in range(min(count, len(values))):
+        start = i * len(values) // min(count, len(values))
+        end = (i + 1) * len(values) // min(count, len(values))
+        bins.append(max(values[start:end]))
+    top = max(bins) or 1
+    return [round(100 * value / top) for value in bins]
+
+
+def mp3_peaks(frames, count=PEAK_COUNT):
+    """
+    Enveloppe d'après le gain global des trames (1,5 dB par pas), en échelle
+    logarithmique au-dessus de GAIN_FLOOR : la parole reste lisible à côté
+    des syllabes les plus fortes.
+    """
+    return normalize_peaks([max(0, frame.gain - GAIN_FLOOR) for frame in frames], count)
+
+
+def wav_peaks(path, count=PEAK_COUNT):
+    """Crêtes d'un WAV PCM 8 ou 16 bits (lu directement, sans décodage)"""
+    with wave.open(str(path), 'rb') as f:
+        width = f.getsampwidth()
+        raw = f.readframes(f.getnframes())
+        channels = f.getnchannels()
+    if width == 1:
+        samples = [abs(b - 128) for b in raw[::channels]]
+    elif width == 2:
+        samples = [abs(s) for s in array('h', raw)[::channels]]
+    else:
+        raise ValueError(f"WAV {width * 8} bits non pris en charge")
+    return normalize_peaks(samples, count)
+
+
+def ffmpeg_available():
+    return shutil.which('ffmpeg') is not None
+
+
+def encode_mp3(source, bitrate):
+    """Réencode `source` en MP3 mono à `bitrate` kb/s (ffmpeg) ; retourne les octets"""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-i', str(source), '-map_metadata', '-1', '-ac', '1',
+         '-ar', str(SAMPLE_RATE), '-b:a', f"{bitrate}k", '-f', 'mp3', '-'],
+        capture_output=True, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout
+
+
+def segment_frames(frames, seconds=SEGMENT_SECONDS):
+    """
+    Groupes de trames d'environ `seconds` secondes. Une coupure peut tomber
+    au milieu du réservoir de bits : les segments ne sont décodables qu'à la
+    suite du précédent, du même encodage.
+    """
+    per_segment = max(1, round(seconds / frames[0].duration))
+    return [frames[i:i + per_segment] for i in range(0, len(frames), per_segment)]
+
+
+def packaging_settings():
+    return content_hash({
+        'renditions': RENDITIONS,
+        'segment_seconds': SEGMENT_SECONDS,
+        'peaks': [PEAK_COUNT, GAIN_FLOOR],
+        'sample_rate': SAMPLE_RATE,
+    })
+
+
+def package_dir_for(source):
+    source = Path(source)
+    return source.with_name(source.stem)
+
+
+def read_playlist(package_dir):
+    try:
+        with open(Path(package_dir) / PLAYLIST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def rendition_sources(source, payload):
+    """Encodages disponibles : {nom: octets MP3}"""
+    encoded = {}
+    can_encode = ffmpeg_available()
+    for name, bitrate in RENDITIONS.items():
+        if name == 'standard' and Path(source).suffix == '.mp3':
+            # Le MP3 d'origine sert tel quel (pas de perte de réencodage)
+            encoded[name] = payload
+        elif can_encode:
+            encoded[name] = encode_mp3(source, bitrate)
+    return encoded
+
+
+def package_audio(source, url_prefix, force=False):
+    """
+    Découpe un audio de chapitre (MP3, ou WAV avec ffmpeg) en segments.
+    Retourne la playlist, ou None si l'audio est déjà découpé à l'identique.
+    """
+    source = Path(source)
+    payload = source.read_bytes()
+    digest = bytes_hash(payload)
+    settings = packaging_settings()
+    out_dir = package_dir_for(source)
+    previous = read_playlist(out_dir)
+    if (not force and previous and previous.get('version') == PLAYLIST_VERSION
+            and previous.get('source_sha256') == digest
+            and previous.get('settings') == settings
+            and previous.get('ffmpeg') == ffmpeg_available()):
+        return None
+
+    encoded = rendition_sources(source, payload)
+    if not encoded:
+        raise RuntimeError(f"{source.name}: ffmpeg requis pour découper un fichier {source.suffix}")
+
+    renditions = []
+    duration = None
+    peaks = None
+    for name, data in encoded.items():
+        frames = mp3_frames(data)
+        segments = []
+        for index, group in enumerate(segment_frames(frames)):
+            chunk = data[group[0].offset:group[-1].offset + group[-1].length]
+            path = out_dir / name / f"{index:03d}.mp3"
+            atomic_write_bytes(path, chunk)
+            segments.append({
+                'url': f"{url_prefix}{out_dir.name}/{name}/{path.name}",
+                'duration': round(sum(frame.duration for frame in group), 3),
+                'bytes': len(chunk),
+            })
+        # Segments d'un encodage précédent plus long
+        for stale in (out_dir / name).glob("*.mp3"):
+            if int(stale.stem) >= len(segments):
+                stale.unlink()
+        renditions.append({
+            'name': name,
+            'bitrate': mp3_bitrate(frames),
+            'sample_rate': frames[0].sample_rate,
+            'segments': segments,
+        })
+        if name == 'standard' or duration is None:
+            duration = round(sum(frame.duration for frame in frames), 3)
+            peaks = mp3_peaks(frames)
+
+    if source.suffix == '.wav':
+        peaks = wav_peaks(source)
+
+    # Les encodages disparus (ffmpeg désinstallé) sont retirés
+    names = {rendition['name'] for rendition in renditions}
+    for directory in out_dir.iterdir():
+        if directory.is_dir() and directory.name not in names:
+            shutil.rmtree(directory)
+
+    playlist = {
+        'version': PLAYLIST_VERSION,
+        'source': source.name,
+        'source_sha256': digest,
+        'settings': settings,
+        'ffmpeg': ffmpeg_available(),
+        'duration': duration,
+        'segment_seconds': SEGMENT_SECONDS,
+        'peaks': peaks,
+        # Du plus léger au plus lourd (ordre de choix du lecteur)
+        'renditions': sorted(renditions, key=lambda rendition: rendition['bitrate']),
+    }
+    atomic_write_text(out_dir / PLAYLIST_NAME, json.dumps(playlist, ensure_ascii=False, indent=2))
+    return playlist
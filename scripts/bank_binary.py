@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Format binaire compact de la banque de questions (data/questions.msgpack)
+
+Document MessagePack standard, émis par le compilateur à côté de
+questions.min.json (avec une version gzip précompressée) :
+
+    ["qq-bank", version, chaînes, longueurs, énumérations, banque]
+
+- chaînes : toutes les chaînes de la banque (clés et valeurs), chacune une
+  seule fois, concaténées en un seul texte ; les plus répétées en tête ;
+- longueurs : longueur de chaque chaîne en unités UTF-16 (le décodeur JS
+  découpe le texte décodé en un seul appel à TextDecoder) ;
+- énumérations : {champ: [valeurs]} pour les champs de question à valeurs
+  fermées (difficulty, type), codés par leur indice ;
+- banque : la structure de questions.json, où chaque chaîne est remplacée
+  par une extension MessagePack de type 1 contenant son indice.
+
+read_binary_bank() (Python) et decodeBinaryBank() (js/utils.js) rendent
+exactement l'objet de questions.json.
+
+Le fichier est référencé par le manifeste des fragments (entrée 'binary' :
+url versionnée par le hash, tailles brute et gzip, taille gzip du JSON
+équivalent). Un hébergement statique ne compresse pas forcément ce type de
+fichier (GitHub Pages) : le client ne le préfère que si sa taille brute ne
+dépasse pas celle du JSON compressé.
+
+Usage :
+    python3 scripts/bank_binary.py [banque.json] [sortie.msgpack]
+"""
+
+import gzip
+import json
+import struct
+import sys
+from collections import Counter
+from pathlib import Path
+
+from bank_io import atomic_write_bytes
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, serialize_min
+
+BINARY_NAME = "questions.msgpack"
+FORMAT_MAGIC = "qq-bank"
+FORMAT_VERSION = 1
+
+# Champs de question codés par un indice d'énumération
+ENUM_FIELDS = ('difficulty', 'type')
+
+# Extension MessagePack : référence à la table des chaînes
+STRING_REF = 1
+
+GZIP_LEVEL = 9
+
+
+class BinaryBankError(ValueError):
+    """Fichier binaire illisible ou de version inconnue"""
+
+
+# ----------------------------------------------------------------------
+# Encodage
+# ----------------------------------------------------------------------
+
+def collect_strings(obj, counter):
+    if isinstance(obj, str):
+        counter[obj] += 1
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            counter[key] += 1
+            collect_strings(value, counter)
+    elif isinstance(obj, list):
+        for item in obj:
+            collect_strings(item, counter)
+
+
+def build_enums(data):
+    """Valeurs de chaque champ énuméré ; un champ dont une valeur n'est pas une chaîne n'est pas codé"""
+    enums = {}
+    for field in ENUM_FIELDS:
+        values = [q[field] for chapter in data['chapters'] for q in chapter['questions'] if field in q]
+        if values and all(isinstance(value, str) for value in values):
+            enums[field] = sorted(set(values))
+    return enums
+
+
+def encode_enums(data, enums):
+    """Copie de la banque où les champs énumérés des questions sont remplacés par leur indice"""
+    codes = {field: {value: index for index, value in enumerate(values)} for field, values in enums.items()}
+    chapters = []
+    for chapter in data['chapters']:
+        questions = []
+        for q in chapter['questions']:
+            q = dict(q)
+            for field, table in codes.items():
+                if field in q:
+                    q[field] = table[q[field]]
+            questions.append(q)
+        chapters.append({**chapter, 'questions': questions})
+    return {**data, 'chapters': chapters}
+
+
+class Packer:
+    def __init__(self, refs=None):
+        self.refs = refs
+        self.parts = []
+
+    def pack(self, obj):
+        out = self.parts.append
+        if obj is None:
+            out(b'\xc0')
+        elif obj is True:
+            out(b'\xc3')
+        elif obj is False:
+            out(b'\xc2')
+        elif isinstance(obj, int):
+            self.pack_int(obj)
+        elif isinstance(obj, float):
+            out(struct.pack('>Bd', 0xcb, obj))
+        elif isinstance(obj, str):
+            if self.refs is not None:
+                self.pack_ref(self.refs[obj])
+            else:
+                self.pack_str(obj)
+        elif isinstance(obj, (list, tuple)):
+            self.pack_header(len(obj), 0x90, 0xdc, 0xdd)
+            for item in obj:
+                self.pack(item)
+        elif isinstance(obj, dict):
+            self.pack_header(len(obj), 0x80, 0xde, 0xdf)
+            for key, value in obj.items():
+                self.pack(key)
+                self.pack(value)
+        else:
+            raise TypeError(f"type non sérialisable: {type(obj).__name__}")
+
+    def pack_int(self, n):
+        out = self.parts.append
+        if 0 <= n < 0x80:
+            out(bytes([n]))
+        elif -32 <= n < 0:
+            out(struct.pack('b', n))
+        elif n >= 0:
+            for code, fmt, limit in ((0xcc, '>BB', 0xff), (0xcd, '>BH', 0xffff),
+                                     (0xce, '>BI', 0xffffffff), (0xcf, '>BQ', 0xffffffffffffffff)):
+                if n <= limit:
+                    out(struct.pack(fmt, code, n))
+                    return
+            raise ValueError(f"entier hors de la plage MessagePack: {n}")
+        else:
+            for code, fmt, limit in ((0xd0, '>Bb', 0x80), (0xd1, '>Bh', 0x8000),
+                                     (0xd2, '>Bi', 0x80000000), (0xd3, '>Bq', 0x8000000000000000)):
+                if n >= -limit:
+                    out(struct.pack(fmt, code, n))
+                    return
+            raise ValueError(f"entier hors de la plage MessagePack: {n}")
+
+    def pack_str(self, s):
+        payload = s.encode('utf-8')
+        n = len(payload)
+        if n < 32:
+            self.parts.append(bytes([0xa0 | n]))
+        elif n <= 0xff:
+            self.parts.append(struct.pack('>BB', 0xd9, n))
+        elif n <= 0xffff:
+            self.parts.append(struct.pack('>BH', 0xda, n))
+        else:
+            self.parts.append(struct.pack('>BI', 0xdb, n))
+        self.parts.append(payload)
+
+    def pack_ref(self, index):
+        if index <= 0xff:
+            self.parts.append(struct.pack('>BbB', 0xd4, STRING_REF, index))
+        elif index <= 0xffff:
+            self.parts.append(struct.pack('>BbH', 0xd5, STRING_REF, index))
+        else:
+            self.parts.append(struct.pack('>BbI', 0xd6, STRING_REF, index))
+
+    def pack_header(self, n, fix, code16, code32):
+        if n < 16:
+            self.parts.append(bytes([fix | n]))
+        elif n <= 0xffff:
+            self.parts.append(struct.pack('>BH', code16, n))
+        else:
+            self.parts.append(struct.pack('>BI', code32, n))
+
+    def getvalue(self):
+        return b''.join(self.parts)
+
+
+def utf16_length(s):
+    return len(s.encode('utf-16-le')) // 2
+
+
+def encode_bank(data):
+    """Octets du format binaire pour une banque au format questions.json"""
+    enums = build_enums(data)
+    body = encode_enums(data, enums)
+
+    counter = Counter()
+    collect_strings(body, counter)
+    # Les chaînes répétées, par fréquence, reçoivent les indices courts (1 octet) ;
+    # les chaînes uniques suivent dans l'ordre du document (le texte voisin
+    # reste voisin, ce qui profite à gzip)
+    shared = sorted((s for s in counter if counter[s] > 1), key=lambda s: -counter[s])
+    strings = shared + [s for s in counter if counter[s] == 1]
+    refs = {s: index for index, s in enumerate(strings)}
+
+    header = Packer()
+    header.parts.append(b'\x96')
+    header.pack(FORMAT_MAGIC)
+    header.pack(FORMAT_VERSION)
+    header.pack(''.join(strings))
+    header.pack([utf16_length(s) for s in strings])
+    header.pack(enums)
+
+    packer = Packer(refs)
+    packer.pack(body)
+    return header.getvalue() + packer.getvalue()
+
+
+# ----------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------
+
+class Unpacker:
+    def __init__(self, payload):
+        self.data = memoryview(payload)
+        self.pos = 0
+        self.strings = None
+
+    def take(self, n):
+        start = self.pos
+        self.pos += n
+        if self.pos > len(self.data):
+            raise BinaryBankError("fichier tronqué")
+        return self.data[start:self.pos]
+
+    def unpack_from(self, fmt):
+        size = struct.calcsize(fmt)
+        return struct.unpack(fmt, self.take(size))[0]
+
+    def unpack(self):
+        code = self.take(1)[0]
+        if code < 0x80:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if code <= 0x8f:
+            return self.unpack_map(code & 0x0f)
+        if code <= 0x9f:
+            return self.unpack_array(code & 0x0f)
+        if code <= 0xbf:
+            return self.unpack_str(code & 0x1f)
+        simple = {0xc0: None, 0xc2: False, 0xc3: True}
+        if code in simple:
+            return simple[code]
+        formats = {
+            0xca: '>f', 0xcb: '>d', 0xcc: '>B', 0xcd: '>H', 0xce: '>I', 0xcf: '>Q',
+            0xd0: '>b', 0xd1: '>h', 0xd2: '>i', 0xd3: '>q',
+        }
+        if code in formats:
+            return self.unpack_from(formats[code])
+        if code in (0xd9, 0xda, 0xdb):
+            return self.unpack_str(self.unpack_from({0xd9: '>B', 0xda: '>H', 0xdb: '>I'}[code]))
+        if code in (0xdc, 0xdd):
+            return self.unpack_array(self.unpack_from('>H' if code == 0xdc else '>I'))
+        if code in (0xde, 0xdf):
+            return self.unpack_map(self.unpack_from('>H' if code == 0xde else '>I'))
+        if code in (0xd4, 0xd5, 0xd6):
+            ext_type = self.unpack_from('>b')
+            index = self.unpack_from({0xd4: '>B', 0xd5: '>H', 0xd6: '>I'}[code])
+            if ext_type != STRING_REF or self.strings is None:
+                raise BinaryBankError(f"extension inconnue: {ext_type}")
+            return self.strings[index]
+        raise BinaryBankError(f"code MessagePack non supporté: 0x{code:02x}")
+
+    def unpack_str(self, n):
+        return str(self.take(n), 'utf-8')
+
+    def unpack_array(self, n):
+        return [self.unpack() for _ in range(n)]
+
+    def unpack_map(self, n):
+        result = {}
+        for _ in range(n):
+            key = self.unpack()
+            result[key] = self.unpack()
+        return result
+
+
+def split_strings(text, lengths):
+    """Découpe le texte de la table des chaînes (longueurs en unités UTF-16)"""
+    units = text.encode('utf-16-le')
+    strings = []
+    offset = 0
+    for length in lengths:
+        end = offset + 2 * length
+        strings.append(units[offset:end].decode('utf-16-le'))
+        offset = end
+    return strings
+
+
+def decode_bank(payload):
+    """Banque (objet de questions.json) à partir des octets du format binaire"""
+    unpacker = Unpacker(payload)
+    if unpacker.take(1)[0] != 0x96:
+        raise BinaryBankError("en-tête invalide")
+    magic, version = unpacker.unpack(), unpacker.unpack()
+    if magic != FORMAT_MAGIC or version != FORMAT_VERSION:
+        raise BinaryBankError(f"format inconnu: {magic!r} version {version!r}")
+    text, lengths = unpacker.unpack(), unpacker.unpack()
+    enums = unpacker.unpack()
+    unpacker.strings = split_strings(text, lengths)
+    data = unpacker.unpack()
+
+    for chapter in data['chapters']:
+        for q in chapter['questions']:
+            for field, values in enums.items():
+                if field in q:
+                    q[field] = values[q[field]]
+    return data
+
+
+def read_binary_bank(path):
+    return decode_bank(Path(path).read_bytes())
+
+
+def binary_path_for(bank_file):
+    return Path(bank_file).with_name(BINARY_NAME)
+
+
+# Dernier encodage : emit_binary et le manifeste des fragments (bank_shards)
+# reçoivent le même objet banque pendant une compilation
+_last_encoded = {'data': None, 'result': None}
+
+
+def encoded_bank(data):
+    """
+    {payload, gzip, json_gzip_bytes} de la banque : fichier binaire, sa
+    version gzip et la taille gzip du JSON minifié équivalent (référence
+    du client pour choisir le format)
+    """
+    if _last_encoded['data'] is not data:
+        payload = encode_bank(data)
+        _last_encoded['result'] = {
+            'payload': payload,
+            'gzip': gzip.compress(payload, GZIP_LEVEL, mtime=0),
+            'json_gzip_bytes': len(gzip.compress(serialize_min(data).encode('utf-8'), GZIP_LEVEL, mtime=0)),
+        }
+        _last_encoded['data'] = data
+    return _last_encoded['result']
+
+
+def emit_binary(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : banque binaire + version gzip"""
+    path = binary_path_for(compiler.bank_file)
+    encoded = encoded_bank(data)
+    compressed = path.with_name(path.name + '.gz')
+    compiler.write_bytes(path, encoded['payload'])
+    compiler.write_bytes(compressed, encoded['gzip'])
+    return [path, compressed]
+
+
+@instrumented("bank_binary")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    source = Path(argv[0]) if argv else BANK_FILE
+    target = Path(argv[1]) if len(argv) > 1 else binary_path_for(source)
+
+    print("📦 ENCODAGE BINAIRE DE LA BANQUE")
+    print("=" * 50)
+
+    with phase('load'), open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with phase('serialize'):
+        payload = encode_bank(data)
+    atomic_write_bytes(target, payload)
+
+    # Vérification : relecture identique à la banque
+    with phase('load'):
+        if decode_bank(payload) != data:
+            print("❌ La relecture du fichier binaire ne redonne pas la banque")
+            sys.exit(1)
+
+    minified = serialize_min(data).encode('utf-8')
+    print(f"  questions.min.json : {len(minified) / 1024:7.1f} KB "
+          f"(gzip {len(gzip.compress(minified, GZIP_LEVEL)) / 1024:.1f} KB)")
+    print(f"  {target.name:<18} : {len(payload) / 1024:7.1f} KB "
+          f"(gzip {len(gzip.compress(payload, GZIP_LEVEL)) / 1024:.1f} KB)")
+    print(f"✅ Banque binaire écrite dans {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Compilateur incrémental de la banque de questions (data/questions.json)
+
+Chaque question est identifiée par un hash de son contenu. L'état de la
+dernière compilation est conservé dans .build-cache/bank_state.json, ce qui
+permet de ne ré-émettre que les chapitres, compteurs et fichiers dérivés
+qui ont réellement changé. Une recompilation sans changement se contente
+de comparer les signatures (taille, mtime) des fichiers d'entrée.
+
+Les fichiers dérivés reçoivent la banque publiée : questions.json plus les
+champs calculés ailleurs (image_variants et image_placeholder du manifeste
+des images, voir optimize_images.py), qui ne sont jamais écrits dans
+questions.json.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bank_binary import emit_binary
+from bank_explanations import emit_explanations
+from bank_facets import emit_facets, merge_counts
+from bank_io import WriteBatch, atomic_write_text, file_lock
+from bank_ndjson import emit_ndjson
+from bank_profile import instrumented, phase
+from bank_shards import emit_shards
+from bank_types import AmbiguousTypeError, normalize_types
+from optimize_images import attach_image_fields, image_manifest_for, load_manifest
+from prerender_math import emit_math
+from publish_bank import emit_release
+from bank_utils import (
+    BANK_FILE, CACHE_DIR, PROJECT_DIR, bytes_hash, content_hash, count_chapter,
+    file_signature, project_path, serialize_bank, serialize_min
+)
+
+STATE_FILE = CACHE_DIR / "bank_state.json"
+
+# Version du format de l'état : l'incrémenter invalide les caches existants
+STATE_VERSION = 4
+
+# Champs d'en-tête d'un chapitre (tout sauf la liste des questions)
+CHAPTER_HEADER_FIELDS = [
+    'chapter_id', 'chapter_number', 'chapter_title',
+    'chapter_description', 'section_reference', 'key_concepts'
+]
+
+
+class QuestionSource:
+    """
+    Source de questions externe (ex: generate_all_chapters.py).
+
+    `loader` n'est appelé que si la signature du fichier source a changé
+    depuis la dernière compilation ; il retourne {chapter_id: [questions]}.
+    """
+
+    def __init__(self, path, loader, chapters_info=None):
+        self.path = Path(path)
+        self.loader = loader
+        self.chapters_info = chapters_info or {}
+
+    @property
+    def key(self):
+        return project_path(self.path)
+
+
+class BuildReport:
+    """Résumé d'une compilation"""
+
+    def __init__(self):
+        self.noop = False
+        self.bank_written = False
+        self.added = []
+        self.updated = []
+        self.typed = []
+        self.changed_chapters = []
+        self.outputs_written = []
+        self.elapsed = 0.0
+
+    def print_summary(self):
+        if self.noop:
+            print(f"✨ Banque à jour - rien à recompiler ({self.elapsed * 1000:.1f} ms)")
+            return
+        print(f"➕ Questions ajoutées: {len(self.added)}")
+        print(f"🔄 Questions mises à jour: {len(self.updated)}")
+        if self.typed:
+            print(f"🏷️  Types explicités: {len(self.typed)}")
+        if self.changed_chapters:
+            chapters = ', '.join(str(c) for c in self.changed_chapters)
+            print(f"📚 Chapitres modifiés: {chapters}")
+        else:
+            print("📚 Aucun chapitre modifié")
+        if self.bank_written:
+            print(f"💾 {BANK_FILE.name} réécrit")
+        for path in self.outputs_written:
+            print(f"📄 Fichier dérivé émis: {path}")
+        print(f"⏱️  Compilation terminée en {self.elapsed * 1000:.1f} ms")
+
+
+def emit_min_json(compiler, data, changed_chapters):
+    """Fichier dérivé : version minifiée de la banque"""
+    path = compiler.bank_file.with_name('questions.min.json')
+    compiler.write_text(path, serialize_min(data))
+    return [path]
+
+
+# Fichiers dérivés de la banque : (nom, fonction d'émission).
+# Une fonction reçoit (compiler, data, changed_chapters) et retourne la liste
+# des chemins écrits. Elle n'est appelée que si la banque a changé ou si l'un
+# de ses fichiers a disparu / été modifié à la main.
+DERIVED_OUTPUTS = [
+    ('min', emit_min_json),
+    ('shards', emit_shards),
+    ('facets', emit_facets),
+    ('ndjson', emit_ndjson),
+    ('binary', emit_binary),
+    ('math', emit_math),
+    ('explanations', emit_explanations),
+    ('release', emit_release),
+]
+
+
+class BankCompiler:
+    def __init__(self, bank_file=BANK_FILE, state_file=STATE_FILE, sources=(),
+                 derived_outputs=None):
+        self.bank_file = Path(bank_file)
+        self.state_file = Path(state_file)
+        self.image_manifest = image_manifest_for(bank_file)
+        self.sources = list(sources)
+        self.derived_outputs = DERIVED_OUTPUTS if derived_outputs is None else derived_outputs
+        self.batch = WriteBatch()
+
+    # ------------------------------------------------------------------
+    # État persistant
+    # ------------------------------------------------------------------
+
+    def load_state(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if state.get('version') != STATE_VERSION or state.get('bank') != str(self.bank_file):
+            return None
+        return state
+
+    def save_state(self, state):
+        atomic_write_text(self.state_file, json.dumps(state, ensure_ascii=False, separators=(',', ':')))
+
+    def write_text(self, path, text):
+        """Écriture d'un fichier dérivé (différée jusqu'à la fin de la compilation)"""
+        self.batch.add_text(path, text)
+
+    def write_bytes(self, path, payload):
+        self.batch.add(path, payload)
+
+    def remove(self, path):
+        """Suppression d'un fichier dérivé (différée comme les écritures)"""
+        self.batch.remove(path)
+
+    def input_signatures(self):
+        signatures = {'bank': file_signature(self.bank_file), 'images': file_signature(self.image_manifest)}
+        for source in self.sources:
+            signatures[source.key] = file_signature(source.path)
+        return signatures
+
+    def outputs_intact(self, state):
+        for path, signature in state.get('outputs', {}).items():
+            if file_signature(PROJECT_DIR / path) != signature:
+                return False
+        names = {name for name, _ in self.derived_outputs}
+        return names <= set(state.get('derived', []))
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def compile(self, force=False):
+        start = time.perf_counter()
+        report = BuildReport()
+        state = self.load_state()
+        signatures = self.input_signatures()
+
+        if (not force and state is not None and state.get('inputs') == signatures
+                and self.outputs_intact(state)):
+            report.noop = True
+            report.elapsed = time.perf_counter() - start
+            return report
+
+        # Verrou sur la banque : un générateur lancé en parallèle attend la fin
+        with file_lock(self.bank_file):
+            self._compile_locked(report, force)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _compile_locked(self, report, force):
+        # L'état est relu sous verrou (une autre compilation a pu se terminer)
+        state = self.load_state()
+        signatures = self.input_signatures()
+
+        with phase('load'):
+            with open(self.bank_file, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            data = json.loads(raw)
+
+        previous = state or {}
+        with phase('transform'):
+            source_hashes = dict(previous.get('sources', {}))
+            for source in self.sources:
+                if not force and previous.get('inputs', {}).get(source.key) == signatures[source.key]:
+                    continue
+                self.merge_source(data, source, source_hashes, report, baseline=state is None)
+
+            # Type explicite pour chaque question (refus si la structure est ambiguë)
+            report.typed = normalize_types(data)
+
+            # Chapitres publiés : champs d'images dérivés ajoutés (les hash
+            # changent donc aussi quand seul le manifeste des images change)
+            published_chapters = attach_image_fields(data['chapters'], load_manifest(self.image_manifest))
+
+            chapter_hashes = {}
+            question_hashes = {}
+            for chapter in published_chapters:
+                cid = str(chapter['chapter_id'])
+                hashes = [[q.get('id'), content_hash(q)] for q in chapter['questions']]
+                question_hashes[cid] = hashes
+                header = {k: chapter.get(k) for k in CHAPTER_HEADER_FIELDS}
+                chapter_hashes[cid] = content_hash([header, hashes])
+
+            old_chapter_hashes = previous.get('chapters', {})
+            report.changed_chapters = [
+                chapter['chapter_id'] for chapter in data['chapters']
+                if old_chapter_hashes.get(str(chapter['chapter_id'])) != chapter_hashes[str(chapter['chapter_id'])]
+            ]
+
+            chapter_counts = self.update_counters(data, previous, chapter_hashes)
+
+        with phase('serialize'):
+            text = serialize_bank(data)
+        if text != raw:
+            # La date n'est touchée que si le contenu a effectivement changé
+            data['metadata']['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with phase('serialize'):
+                text = serialize_bank(data)
+            atomic_write_text(self.bank_file, text)
+            report.bank_written = True
+
+        bank_hash = bytes_hash(text.encode('utf-8'))
+        published = {**data, 'chapters': published_chapters}
+        published_hash = content_hash([bank_hash, chapter_hashes])
+        outputs = dict(previous.get('outputs', {}))
+        owners = dict(previous.get('owners', {}))
+        bank_changed = published_hash != previous.get('published_hash')
+        done = set(previous.get('derived', []))
+        emitted = []
+        for name, emit in self.derived_outputs:
+            owned = [p for p, owner in owners.items() if owner == name]
+            intact = all(file_signature(PROJECT_DIR / p) == outputs.get(p) for p in owned)
+            if not force and not bank_changed and name in done and intact:
+                continue
+            changed = [c['chapter_id'] for c in data['chapters']] if (force or name not in done or not intact) \
+                else report.changed_chapters
+            with phase('serialize'):
+                emitted.extend((path, name) for path in emit(self, published, changed))
+            done.add(name)
+
+        # Tous les fichiers dérivés sont écrits en un seul lot
+        self.batch.commit()
+        for path, name in emitted:
+            rel = project_path(path)
+            outputs[rel] = file_signature(path)
+            owners[rel] = name
+            report.outputs_written.append(rel)
+
+        # Oublie les fichiers dérivés qui ont été supprimés par leur émetteur
+        for rel in [p for p in outputs if file_signature(PROJECT_DIR / p) is None]:
+            outputs.pop(rel)
+            owners.pop(rel, None)
+
+        new_state = {
+            'version': STATE_VERSION,
+            'bank': str(self.bank_file),
+            'bank_hash': bank_hash,
+            'published_hash': published_hash,
+            'inputs': self.input_signatures(),
+            'sources': source_hashes,
+            'chapters': chapter_hashes,
+            'questions': question_hashes,
+            'counts': chapter_counts,
+            'outputs': outputs,
+            'owners': owners,
+            'derived': sorted(done),
+        }
+        self.save_state(new_state)
+
+    def merge_source(self, data, source, source_hashes, report, baseline):
+        """
+        Intègre les questions d'une source dans la banque.
+
+        Une question n'est (ré)écrite que si son hash diffère de celui
+        enregistré lors de la dernière intégration : les corrections faites
+        directement dans questions.json ne sont donc pas écrasées. Lors de la
+        toute première compilation (pas d'état), les questions déjà présentes
+        sont considérées comme intégrées.
+        """
+        chapters = {ch['chapter_id']: ch for ch in data['chapters']}
+        locations = {}
+        for chapter in data['chapters']:
+            for index, q in enumerate(chapter['questions']):
+                locations.setdefault(q.get('id'), (chapter, index))
+
+        for chapter_id, questions in source.loader().items():
+            chapter = chapters.get(chapter_id)
+            if chapter is None:
+                info = source.chapters_info.get(chapter_id, {'chapter_id': chapter_id})
+                chapter = dict(info, questions=[])
+                data['chapters'].append(chapter)
+                chapters[chapter_id] = chapter
+
+            for q in questions:
+                q_hash = content_hash(q)
+                known = source_hashes.get(q['id'])
+                source_hashes[q['id']] = q_hash
+                if known == q_hash:
+                    continue
+                location = locations.get(q['id'])
+                if location is None:
+                    chapter['questions'].append(q)
+                    locations[q['id']] = (chapter, len(chapter['questions']) - 1)
+                    report.added.append(q['id'])
+                elif known is not None and not baseline:
+                    owner, index = location
+                    owner['questions'][index] = q
+                    report.updated.append(q['id'])
+
+    def update_counters(self, data, previous, chapter_hashes):
+        """Met à jour les compteurs de métadonnées, chapitre par chapitre
+
+        Seuls les chapitres dont le hash a changé sont recomptés ; les
+        autres reprennent les compteurs enregistrés dans l'état.
+        """
+        old_hashes = previous.get('chapters', {})
+        old_counts = previous.get('counts', {})
+        counts = {}
+        for chapter in data['chapters']:
+            cid = str(chapter['chapter_id'])
+            if old_hashes.get(cid) == chapter_hashes[cid] and cid in old_counts:
+                counts[cid] = old_counts[cid]
+            else:
+                counts[cid] = count_chapter(chapter)
+
+        # Les blocs de métadonnées sont les compteurs de facettes (data/facets.json)
+        facet_counts = merge_counts(counts)
+        total = sum(c['total'] for c in counts.values())
+
+        metadata = data.setdefault('metadata', {})
+        metadata.setdefault('generated_date', datetime.now().strftime("%Y-%m-%d"))
+        metadata['total_questions'] = total
+        metadata['questions_by_chapter'] = {
+            f"chapter_{ch['chapter_id']}": counts[str(ch['chapter_id'])]['total']
+            for ch in data['chapters']
+        }
+        metadata['difficulty_distribution'] = facet_counts['difficulty']
+        metadata['question_types'] = facet_counts['type']
+        data['course_info']['total_questions'] = total
+        data['course_info']['total_chapters'] = len(data['chapters'])
+        return counts
+
+
+@instrumented("bank_compiler")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    force = '--force' in argv
+
+    print("🔧 COMPILATION DE LA BANQUE DE QUESTIONS")
+    print("=" * 50)
+
+    try:
+        report = BankCompiler().compile(force=force)
+    except AmbiguousTypeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    report.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Explications des questions, chargées à part du cœur de la banque
+
+Les explications (souvent plusieurs centaines de caractères avec du TeX)
+représentent une grande partie de la banque mais ne sont affichées qu'après
+la réponse. Les fragments par chapitre (bank_shards.py) n'en contiennent
+plus ; elles sont émises par chapitre à côté :
+
+    data/explanations/chapter_<id>.json         {chapter_id, ids, explanations}
+                                                alignés sur la position des questions
+                                                (l'ID est répété pour vérifier l'alignement)
+    data/explanations/chapter_<id>.mathml.json  même fichier, formules pré-rendues en
+                                                MathML (prerender_math.py), si latex2mathml
+                                                est installé
+    data/explanations/manifest.json             index : urls versionnées, tailles et nombre
+                                                d'explications de chaque chapitre
+
+Le client ne télécharge que l'une des deux variantes (MathML si le
+navigateur l'affiche nativement), en arrière-plan une fois le quiz
+affiché ou au moment de la révision (prefetchChapterExplanations et
+ensureExplanations dans js/utils.js).
+"""
+
+import json
+from pathlib import Path
+
+from bank_io import atomic_write_text
+from bank_profile import instrumented, phase
+from bank_shards import DEFERRED_FIELDS, shard_name, shard_url
+from bank_utils import BANK_FILE, bytes_hash, serialize_min
+from prerender_math import FORMULA_CACHE_FILE, FormulaCache, formula_cache_for, latex_to_mathml
+
+EXPLANATIONS_DIRNAME = "explanations"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+EXPLANATION_FIELD = DEFERRED_FIELDS[0]
+
+
+def explanations_dir_for(bank_file):
+    return Path(bank_file).parent / EXPLANATIONS_DIRNAME
+
+
+def mathml_name(chapter_id):
+    return f"chapter_{chapter_id}.mathml.json"
+
+
+def explanation_block(chapter, cache=None):
+    """
+    Explications d'un chapitre, alignées sur la position des questions ;
+    avec `cache`, les formules sont remplacées par leur MathML.
+    """
+    explanations = [q.get(EXPLANATION_FIELD) for q in chapter['questions']]
+    if cache is not None:
+        explanations = [
+            (cache.render_text(text) or text) if isinstance(text, str) else text
+            for text in explanations
+        ]
+    return {
+        'chapter_id': chapter['chapter_id'],
+        'ids': [q.get('id') for q in chapter['questions']],
+        'explanations': explanations,
+    }
+
+
+def write_block(path, block, rewrite, write_text, written):
+    """Écrit un fichier d'explications si nécessaire ; retourne son contenu"""
+    if rewrite or not path.exists():
+        with phase('transform'):
+            text = serialize_min(block())
+        write_text(path, text)
+        written.append(path)
+        return text.encode('utf-8')
+    return path.read_bytes()
+
+
+def write_explanations(data, bank_file=BANK_FILE, changed_chapters=None, write_text=None, cache=None,
+                       cache_file=FORMULA_CACHE_FILE):
+    """
+    Écrit les explications des chapitres modifiés et l'index.
+    Retourne la liste des fichiers écrits.
+    """
+    write_text = write_text or atomic_write_text
+    out_dir = explanations_dir_for(bank_file)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    changed = None if changed_chapters is None else set(changed_chapters)
+    if cache is None and latex_to_mathml is not None:
+        cache = FormulaCache.load(cache_file)
+
+    written = []
+    entries = []
+    for chapter in data['chapters']:
+        chapter_id = chapter['chapter_id']
+        rewrite = changed is None or chapter_id in changed
+        path = out_dir / shard_name(chapter_id)
+        payload = write_block(path, lambda: explanation_block(chapter), rewrite, write_text, written)
+        entry = {
+            'chapter_id': chapter_id,
+            'url': shard_url(bank_file, path, bytes_hash(payload)),
+            'bytes': len(payload),
+            'count': sum(1 for q in chapter['questions'] if q.get(EXPLANATION_FIELD) is not None),
+        }
+        if cache is not None:
+            math_path = out_dir / mathml_name(chapter_id)
+            math_payload = write_block(math_path, lambda: explanation_block(chapter, cache),
+                                       rewrite, write_text, written)
+            entry['mathml_url'] = shard_url(bank_file, math_path, bytes_hash(math_payload))
+            entry['mathml_bytes'] = len(math_payload)
+        entries.append(entry)
+
+    # Supprime les fichiers de chapitres disparus (et les variantes MathML sans moteur)
+    expected = {shard_name(chapter['chapter_id']) for chapter in data['chapters']}
+    if cache is not None:
+        expected |= {mathml_name(chapter['chapter_id']) for chapter in data['chapters']}
+    for stale in out_dir.glob("chapter_*.json"):
+        if stale.name not in expected:
+            stale.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'renderer': cache.renderer if cache is not None else None,
+        'total_bytes': sum(entry['bytes'] for entry in entries),
+        'chapters': entries,
+    }
+    manifest_path = out_dir / MANIFEST_NAME
+    write_text(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    written.append(manifest_path)
+    if cache is not None:
+        cache.save()
+    return written
+
+
+def emit_explanations(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : explications par chapitre + index"""
+    return write_explanations(data, compiler.bank_file, changed_chapters, compiler.write_text,
+                              cache_file=formula_cache_for(compiler))
+
+
+@instrumented("bank_explanations")
+def main():
+    print("📖 EXPLICATIONS PAR CHAPITRE")
+    print("=" * 50)
+
+    with phase('load'), open(BANK_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    with phase('serialize'):
+        written = write_explanations(data)
+    for path in written:
+        size = path.stat().st_size / 1024
+        print(f"  📄 {path.name} ({size:.1f} KB)")
+
+    print("✅ Explications écrites dans", explanations_dir_for(BANK_FILE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Index de facettes de la banque de questions (data/facets.json)
+
+Pour chaque facette (chapitre, difficulté, type, tag, section) et chaque
+valeur, l'index donne la liste triée des positions des questions dans
+l'ordre de la banque. Sélectionner « chapitre 4, difficile, hotspot »
+revient alors à intersecter trois listes au lieu de parcourir la banque :
+
+    {
+      "ids": ["ch1-q001", ...],                      position -> id
+      "chapters": [{"chapter_id": 1, "start": 0, "count": 132}, ...],
+      "index": {"difficulty": {"hard": [3, 7, ...]}, ...},
+      "counts": {"difficulty": {"hard": 225}, ...}
+    }
+
+Les compteurs sont aussi ceux recopiés dans metadata par le compilateur.
+"""
+
+import json
+from collections import Counter
+
+from bank_io import atomic_write_text
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, question_type
+
+FACETS_NAME = "facets.json"
+FACETS_VERSION = 1
+
+# Facettes indexées : nom -> fonction retournant la (les) valeur(s) d'une question
+FACETS = {
+    'chapter': lambda chapter, q: [str(chapter['chapter_id'])],
+    'difficulty': lambda chapter, q: [q.get('difficulty', 'unknown')],
+    'type': lambda chapter, q: [question_type(q)],
+    'tag': lambda chapter, q: sorted(set(q.get('tags') or [])),
+    'section_ref': lambda chapter, q: [str(q.get('section_ref', ''))],
+}
+
+
+def build_facets(data):
+    """Construit l'index de facettes et ses compteurs"""
+    ids = []
+    chapters = []
+    index = {name: {} for name in FACETS}
+
+    position = 0
+    for chapter in data['chapters']:
+        chapters.append({
+            'chapter_id': chapter['chapter_id'],
+            'start': position,
+            'count': len(chapter['questions']),
+        })
+        for q in chapter['questions']:
+            ids.append(q.get('id'))
+            for name, values in FACETS.items():
+                for value in values(chapter, q):
+                    index[name].setdefault(value, []).append(position)
+            position += 1
+
+    counts = {
+        name: {value: len(positions) for value, positions in values.items()}
+        for name, values in index.items()
+    }
+    return {
+        'version': FACETS_VERSION,
+        'total': position,
+        'ids': ids,
+        'chapters': chapters,
+        'index': index,
+        'counts': counts,
+    }
+
+
+def merge_counts(chapter_counts):
+    """Agrège les compteurs par chapitre (voir count_chapter) en compteurs de facettes"""
+    merged = {name: Counter() for name in ('difficulty', 'type', 'tag', 'section_ref')}
+    by_chapter = {}
+    for chapter_id, counts in chapter_counts.items():
+        by_chapter[str(chapter_id)] = counts['total']
+        merged['difficulty'].update(counts['difficulty'])
+        merged['type'].update(counts['types'])
+        merged['tag'].update(counts['tags'])
+        merged['section_ref'].update(counts['sections'])
+    result = {'chapter': by_chapter}
+    result.update({name: dict(counter) for name, counter in merged.items()})
+    return result
+
+
+def select(facets, **filters):
+    """
+    Positions des questions satisfaisant tous les filtres.
+
+    Chaque filtre est une valeur ou une liste de valeurs (union), les
+    facettes entre elles sont intersectées : select(f, chapter='4',
+    difficulty='hard', type=['hotspot', 'drag_drop']).
+    """
+    result = None
+    for name, wanted in filters.items():
+        if wanted is None:
+            continue
+        if isinstance(wanted, (str, int)):
+            wanted = [wanted]
+        positions = set()
+        for value in wanted:
+            positions.update(facets['index'][name].get(str(value), []))
+        result = positions if result is None else result & positions
+    if result is None:
+        return list(range(facets['total']))
+    return sorted(result)
+
+
+def facets_path_for(bank_file):
+    return bank_file.with_name(FACETS_NAME)
+
+
+def emit_facets(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : index de facettes"""
+    path = facets_path_for(compiler.bank_file)
+    compiler.write_text(path, json.dumps(build_facets(data), ensure_ascii=False, separators=(',', ':')))
+    return [path]
+
+
+@instrumented("bank_facets")
+def main():
+    print("🗂️  INDEX DE FACETTES DE LA BANQUE")
+    print("=" * 50)
+
+    with phase('load'), open(BANK_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    with phase('transform'):
+        facets = build_facets(data)
+    path = facets_path_for(BANK_FILE)
+    with phase('serialize'):
+        text = json.dumps(facets, ensure_ascii=False, separators=(',', ':'))
+    atomic_write_text(path, text)
+
+    for name, counts in facets['counts'].items():
+        print(f"  • {name}: {len(counts)} valeurs")
+    print(f"✅ Index écrit: {path} ({path.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Catalogue des figures des questions à zones cliquables (hotspots)
+
+Les questions hotspot d'une même image (sphère de Bloch, fentes d'Young,
+Stern-Gerlach...) répètent toutes image_url, image_alt, image_dimensions,
+image_variants, image_placeholder et des listes de zones presque
+identiques. Le catalogue les factorise :
+
+    {"version": 1, "figures": {
+        "ch1/bloch-sphere": {
+            "image_url": "assets/images/ch1/bloch-sphere.svg", "image_alt": "...", ...,
+            "regions": {"north": {"id": "north", "label": "Pôle Nord", "x": 200, "y": 50, "radius": 30},
+                        "north#2": {...}, ...}
+        }
+    }}
+
+Une question normalisée référence sa figure et le sous-ensemble de zones ;
+une zone utilisée par une seule question reste écrite dans la question :
+    {"id": "ch1-h002", "figure": "ch1/bloch-sphere",
+     "regions": ["north", "south", {"id": "equator", "label": "Équateur", ...}], ...}
+
+Les champs d'image d'une question sont ceux de sa figure (valeur la plus
+fréquente) ; une question qui en diffère garde sa propre valeur (null :
+champ absent). Une zone qui existe en plusieurs versions (coordonnées ou
+libellé différents) reçoit une clé suffixée : north#2, north#3...
+
+La banque (questions.json) reste sous forme développée ; seuls les
+fragments par chapitre (bank_shards.py) sont normalisés, et
+expandFigures() (js/utils.js) les redéveloppe au chargement.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import PurePosixPath
+
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, canonical_json, content_hash, serialize_min
+
+CATALOG_VERSION = 1
+FIGURES_NAME = "figures.json"
+
+# Champs d'une question qui décrivent son image (partagés par la figure)
+FIGURE_FIELDS = ('image_url', 'image_alt', 'image_dimensions', 'image_variants', 'image_placeholder')
+
+# Une zone n'entre dans le catalogue que si plusieurs questions l'utilisent
+# (une zone propre à une question reste écrite dans la question)
+MIN_SHARED_REGION = 2
+
+IMAGES_PREFIX = "assets/images/"
+REGION_VARIANT_SEPARATOR = "#"
+
+
+def is_figure_question(question):
+    return bool(question.get('image_url')) and isinstance(question.get('hotspots'), list)
+
+
+def figure_questions(data):
+    return [q for chapter in data['chapters'] for q in chapter['questions'] if is_figure_question(q)]
+
+
+def figure_ids(urls):
+    """
+    ID de figure de chaque URL d'image : chemin sous assets/images/ sans
+    extension (ch1/bloch-sphere), extension conservée si deux images ne
+    diffèrent que par elle (SGSzSxSzP.png / SGSzSxSzP.pdf).
+    """
+    stems = Counter()
+    names = {}
+    for url in urls:
+        path = PurePosixPath(url.removeprefix('./').removeprefix(IMAGES_PREFIX))
+        names[url] = path
+        stems[str(path.with_suffix(''))] += 1
+    return {
+        url: str(path.with_suffix('')) if stems[str(path.with_suffix(''))] == 1 else str(path)
+        for url, path in names.items()
+    }
+
+
+def most_common(values):
+    """Valeur la plus fréquente (la première rencontrée en cas d'égalité)"""
+    counts = Counter(canonical_json(value) for value in values)
+    best = max(counts.values())
+    return next(value for value in values if counts[canonical_json(value)] == best)
+
+
+def build_catalog(data):
+    """Catalogue {version, figures} des questions hotspot de la banque"""
+    questions = figure_questions(data)
+    urls = list(dict.fromkeys(q['image_url'] for q in questions))
+    ids = figure_ids(urls)
+
+    figures = {}
+    for url in urls:
+        members = [q for q in questions if q['image_url'] == url]
+        figure = {}
+        for field in FIGURE_FIELDS:
+            value = most_common([q.get(field) for q in members])
+            if value is not None:
+                figure[field] = value
+
+        # Versions de chaque zone, de la plus fréquente à la plus rare
+        variants = {}
+        for q in members:
+            for region in q['hotspots']:
+                counter = variants.setdefault(region.get('id'), Counter())
+                counter[canonical_json(region)] += 1
+        regions = {}
+        for region_id, counter in variants.items():
+            shared = [text for text, count in counter.most_common() if count >= MIN_SHARED_REGION]
+            for rank, text in enumerate(shared, 1):
+                key = str(region_id) if rank == 1 else f"{region_id}{REGION_VARIANT_SEPARATOR}{rank}"
+                regions[key] = json.loads(text)
+        figure['regions'] = regions
+        figures[ids[url]] = figure
+
+    return {'version': CATALOG_VERSION, 'figures': figures}
+
+
+def catalog_hash(catalog):
+    return content_hash(catalog)
+
+
+class FigureIndex:
+    """Recherche inverse dans un catalogue : URL -> figure, zone -> clé"""
+
+    def __init__(self, catalog):
+        self.figures = catalog['figures']
+        self.by_url = {figure['image_url']: figure_id for figure_id, figure in self.figures.items()}
+        self.region_keys = {
+            (figure_id, canonical_json(region)): key
+            for figure_id, figure in self.figures.items()
+            for key, region in figure['regions'].items()
+        }
+
+    def normalize(self, question):
+        """Question où les champs d'image et les zones sont remplacés par des références"""
+        figure_id = self.by_url.get(question.get('image_url')) if is_figure_question(question) else None
+        if figure_id is None:
+            return question
+        figure = self.figures[figure_id]
+
+        normalized = {}
+        for key, value in question.items():
+            if key == 'image_url':
+                normalized['figure'] = figure_id
+            elif key == 'hotspots':
+                normalized['regions'] = [self.region_keys.get((figure_id, canonical_json(r)), r) for r in value]
+            elif key not in FIGURE_FIELDS or value != figure.get(key):
+                normalized[key] = value
+        # Champ présent dans la figure mais absent de la question
+        for field in FIGURE_FIELDS:
+            if field in figure and field not in question:
+                normalized[field] = None
+        return normalized
+
+
+def expand_question(question, catalog):
+    """Inverse de FigureIndex.normalize : question développée (image et hotspots)"""
+    figure = catalog['figures'].get(question.get('figure')) if 'figure' in question else None
+    if figure is None:
+        return question
+
+    expanded = {}
+    for key, value in question.items():
+        if key == 'figure':
+            for field in FIGURE_FIELDS:
+                if field in figure and field not in question:
+                    expanded[field] = figure[field]
+        elif key == 'regions':
+            expanded['hotspots'] = [
+                dict(figure['regions'][region]) if isinstance(region, str) else region
+                for region in value
+            ]
+        elif value is not None or key not in FIGURE_FIELDS:
+            expanded[key] = value
+    return expanded
+
+
+def normalize_chapter(chapter, index):
+    return {**chapter, 'questions': [index.normalize(q) for q in chapter['questions']]}
+
+
+@instrumented("bank_figures")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    source = argv[0] if argv else BANK_FILE
+
+    print("🖼️  CATALOGUE DES FIGURES")
+    print("=" * 50)
+
+    with phase('load'), open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with phase('transform'):
+        catalog = build_catalog(data)
+        index = FigureIndex(catalog)
+        chapters = [normalize_chapter(chapter, index) for chapter in data['chapters']]
+
+    # Vérification : le développement redonne les questions d'origine
+    for chapter, normalized in zip(data['chapters'], chapters):
+        for q, n in zip(chapter['questions'], normalized['questions']):
+            if expand_question(n, catalog) != q:
+                print(f"❌ {q.get('id')}: normalisation non réversible")
+                sys.exit(1)
+
+    questions = figure_questions(data)
+    regions = sum(len(figure['regions']) for figure in catalog['figures'].values())
+    before = sum(len(serialize_min(chapter)) for chapter in data['chapters'])
+    after = sum(len(serialize_min(chapter)) for chapter in chapters) + len(serialize_min(catalog))
+    print(f"🎯 {len(questions)} questions hotspot, {len(catalog['figures'])} figures, {regions} zones")
+    print(f"📉 Fragments : {before / 1024:.1f} KB -> {after / 1024:.1f} KB (catalogue compris)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Attribution et réparation des IDs de questions
+
+Les IDs suivent le format ch<chapitre>-<préfixe><numéro> : q (qcm, vrai/faux,
+numérique...), h (hotspot), dd (drag & drop), fc (flashcard), anim
+(animation). IdAllocator tient un compteur par chapitre et par préfixe,
+conservé dans data/id_counters.json : un nouvel ID s'obtient en temps
+constant, et un ID retiré de la banque n'est jamais réattribué (la
+progression des étudiants, indexée par ID, ne peut pas pointer vers une
+autre question).
+
+Utilisé comme script, repère en une passe les IDs dupliqués ou manquants
+et les renomme de façon déterministe : la première occurrence garde son ID,
+les suivantes reçoivent un nouvel ID dans l'ordre de la banque.
+
+Usage :
+    python3 scripts/bank_ids.py [--check]
+"""
+
+import argparse
+import json
+import re
+import sys
+
+from bank_io import atomic_write_text, edit_bank, file_lock, load_bank
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, CACHE_DIR, DATA_DIR, content_hash, question_type
+
+COUNTERS_FILE = DATA_DIR / "id_counters.json"
+REPAIR_REPORT_FILE = CACHE_DIR / "id_repairs.json"
+COUNTERS_VERSION = 1
+
+ID_PATTERN = re.compile(r"^ch(\d+)-([a-z]+?)(\d+)$")
+
+# Préfixe d'ID par type de question (les autres types utilisent 'q')
+TYPE_PREFIXES = {
+    'hotspot': 'h',
+    'drag_drop': 'dd',
+    'flashcard': 'fc',
+    'animation': 'anim',
+}
+DEFAULT_PREFIX = 'q'
+
+
+def id_prefix(q_type):
+    return TYPE_PREFIXES.get(q_type, DEFAULT_PREFIX)
+
+
+def format_id(chapter_id, prefix, number):
+    return f"ch{chapter_id}-{prefix}{number:03d}"
+
+
+def content_key(question):
+    """Hash du contenu d'une question, ID exclu (même question sous un autre ID)"""
+    return content_hash({key: value for key, value in question.items() if key != 'id'})
+
+
+def bank_keys(data):
+    """IDs et hash de contenu des questions de la banque"""
+    ids = set()
+    contents = set()
+    for chapter in data['chapters']:
+        for q in chapter['questions']:
+            if q.get('id'):
+                ids.add(q['id'])
+            contents.add(content_key(q))
+    return ids, contents
+
+
+class IdAllocator:
+    """Compteurs d'IDs par chapitre et par préfixe"""
+
+    def __init__(self, counters_file=COUNTERS_FILE):
+        self.counters_file = counters_file
+        self.counters = {}
+        self.used = set()
+
+    @classmethod
+    def load(cls, data=None, counters_file=COUNTERS_FILE):
+        """
+        Charge les compteurs persistés ; si `data` est fourni, les IDs de la
+        banque sont aussi pris en compte (les compteurs ne sont jamais en
+        retard sur la banque, même si elle a été modifiée à la main).
+        """
+        allocator = cls(counters_file)
+        try:
+            with open(counters_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            stored = {}
+        for chapter_id, prefixes in stored.get('counters', {}).items():
+            for prefix, number in prefixes.items():
+                allocator.counters[(chapter_id, prefix)] = number
+
+        if data is not None:
+            for chapter in data['chapters']:
+                for q in chapter['questions']:
+                    if q.get('id'):
+                        allocator.observe(q['id'])
+        return allocator
+
+    def observe(self, q_id):
+        """Enregistre un ID existant (le compteur de sa série passe au moins à son numéro)"""
+        self.used.add(q_id)
+        match = ID_PATTERN.match(q_id)
+        if match:
+            key = (match.group(1), match.group(2))
+            self.counters[key] = max(self.counters.get(key, 0), int(match.group(3)))
+
+    def allocate(self, chapter_id, q_type):
+        """Nouvel ID unique pour une question de ce chapitre et de ce type"""
+        key = (str(chapter_id), id_prefix(q_type))
+        while True:
+            self.counters[key] = self.counters.get(key, 0) + 1
+            q_id = format_id(chapter_id, key[1], self.counters[key])
+            # Un ID hors format peut occuper la place (ex: ch1-q7 contre ch1-q007)
+            if q_id not in self.used:
+                self.used.add(q_id)
+                return q_id
+
+    def claim(self, q_id, chapter_id, q_type):
+        """Garde `q_id` s'il est libre, sinon attribue un nouvel ID"""
+        if q_id and q_id not in self.used:
+            self.observe(q_id)
+            return q_id
+        return self.allocate(chapter_id, q_type)
+
+    def save(self):
+        counters = {}
+        for (chapter_id, prefix), number in sorted(self.counters.items(), key=lambda item: (int(item[0][0]), item[0][1])):
+            counters.setdefault(chapter_id, {})[prefix] = number
+        with file_lock(self.counters_file):
+            atomic_write_text(self.counters_file, json.dumps(
+                {'version': COUNTERS_VERSION, 'counters': counters}, ensure_ascii=False, indent=2
+            ))
+
+
+def find_id_collisions(data):
+    """Positions (chapitre, index) des questions dont l'ID est manquant ou déjà vu"""
+    seen = set()
+    collisions = []
+    for chapter in data['chapters']:
+        for index, q in enumerate(chapter['questions']):
+            q_id = q.get('id')
+            if q_id and q_id not in seen:
+                seen.add(q_id)
+            else:
+                collisions.append((chapter, index))
+    return collisions
+
+
+def repair_ids(data, allocator):
+    """Renomme les IDs dupliqués ou manquants ; retourne la liste des renommages"""
+    renames = []
+    for chapter, index in find_id_collisions(data):
+        q = chapter['questions'][index]
+        new_id = allocator.allocate(chapter['chapter_id'], question_type(q))
+        renames.append({
+            'chapter_id': chapter['chapter_id'],
+            'index': index,
+            'old_id': q.get('id'),
+            'new_id': new_id,
+        })
+        q['id'] = new_id
+    return renames
+
+
+@instrumented("bank_ids")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Réparation des IDs de questions dupliqués")
+    parser.add_argument('--check', action='store_true',
+                        help="signale les collisions sans modifier la banque (code de sortie 1 si il y en a)")
+    args = parser.parse_args(argv)
+
+    print("🆔 VÉRIFICATION DES IDS DE QUESTIONS")
+    print("=" * 50)
+
+    if args.check:
+        data = load_bank()
+        with phase('validate'):
+            collisions = find_id_collisions(data)
+        for chapter, index in collisions:
+            print(f"  ❌ Chapitre {chapter['chapter_id']}: ID dupliqué ou manquant "
+                  f"{chapter['questions'][index].get('id')!r} (position {index})")
+        print(f"{'❌' if collisions else '✅'} {len(collisions)} collision(s)")
+        sys.exit(1 if collisions else 0)
+
+    with edit_bank(BANK_FILE) as data:
+        allocator = IdAllocator.load(data)
+        renames = repair_ids(data, allocator)
+        allocator.save()
+
+    for rename in renames:
+        print(f"  🔁 Chapitre {rename['chapter_id']}: {rename['old_id']} → {rename['new_id']}")
+    atomic_write_text(REPAIR_REPORT_FILE, json.dumps(renames, ensure_ascii=False, indent=2))
+    print(f"✅ {len(renames)} ID(s) renommé(s) (détail: {REPAIR_REPORT_FILE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Écriture sûre de la banque de questions et de ses fichiers dérivés
+
+Tous les scripts qui réécrivent data/questions.json passent par ce module :
+    - verrou consultatif (questions.json.lock) : deux scripts lancés en
+      parallèle se succèdent au lieu de s'écraser mutuellement ;
+    - écriture atomique : fichier temporaire dans le même dossier, fsync,
+      puis os.replace ; une interruption laisse l'ancienne version intacte ;
+    - regroupement : edit_bank() n'écrit qu'une fois à la sortie du bloc,
+      WriteBatch écrit un lot de fichiers en fin de traitement.
+
+Exemple :
+    with edit_bank() as data:
+        data['chapters'][0]['questions'].append(question)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from bank_profile import phase
+from bank_utils import BANK_FILE, serialize_bank
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Verrous détenus par ce processus : (chemin, thread) -> [descripteur, profondeur].
+# Un thread peut reprendre un verrou qu'il détient déjà ; un autre thread
+# ouvre son propre descripteur et attend, comme un autre processus.
+_held_locks = {}
+_held_locks_guard = threading.RLock()
+
+
+def lock_path_for(path):
+    path = Path(path)
+    return path.with_name(path.name + '.lock')
+
+
+def _try_lock(fd):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, timeout=None, poll_interval=0.05):
+    """Verrou consultatif exclusif sur `path` (via le fichier `path`.lock)"""
+    key = (str(Path(path).resolve()), threading.get_ident())
+    with _held_locks_guard:
+        held = _held_locks.get(key)
+        if held is not None:
+            held[1] += 1
+    if held is not None:
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                held[1] -= 1
+        return
+
+    lock_file = lock_path_for(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        start = time.monotonic()
+        waiting = False
+        while not _try_lock(fd):
+            if not waiting:
+                print(f"⏳ En attente du verrou sur {Path(path).name}...", file=sys.stderr)
+                waiting = True
+            if timeout is not None and time.monotonic() - start > timeout:
+                raise TimeoutError(f"Verrou {lock_file} non obtenu après {timeout} s")
+            time.sleep(poll_interval)
+
+        with _held_locks_guard:
+            _held_locks[key] = [fd, 1]
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                del _held_locks[key]
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory):
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, payload):
+    """Écrit `payload` dans `path` de façon atomique (temp + fsync + rename)"""
+    with phase('write'):
+        _atomic_write_bytes(Path(path), payload)
+
+
+def _atomic_write_bytes(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        else:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def atomic_write_text(path, text):
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def load_bank(path=BANK_FILE):
+    with phase('load'), open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_bank(data, path=BANK_FILE):
+    """Écrit la banque de façon atomique, sous verrou"""
+    with file_lock(path):
+        with phase('serialize'):
+            text = serialize_bank(data)
+        atomic_write_text(path, text)
+
+
+@contextmanager
+def edit_bank(path=BANK_FILE, output=None):
+    """
+    Lecture-modification-écriture de la banque sous verrou.
+
+    Toutes les modifications faites dans le bloc sont écrites en une seule
+    fois à la sortie, et seulement si le contenu a changé. Si le bloc lève
+    une exception, rien n'est écrit. `output` permet d'écrire le résultat
+    ailleurs que dans le fichier lu.
+    """
+    path = Path(path)
+    output = Path(output) if output is not None else path
+    with file_lock(path):
+        with phase('load'):
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            data = json.loads(raw)
+        with phase('transform'):
+            yield data
+        with phase('serialize'):
+            text = serialize_bank(data)
+        if output != path or text != raw:
+            with file_lock(output):
+                atomic_write_text(output, text)
+
+
+class WriteBatch:
+    """
+    Lot d'écritures différées : les fichiers ajoutés sont écrits
+    (atomiquement, un par un) et les fichiers retirés supprimés au moment
+    de commit(). Pour un même chemin, seule la dernière opération compte.
+    """
+
+    def __init__(self):
+        self.pending = {}
+
+    def add(self, path, payload):
+        self.pending[Path(path)] = payload
+
+    def add_text(self, path, text):
+        self.add(path, text.encode('utf-8'))
+
+    def remove(self, path):
+        self.pending[Path(path)] = None
+
+    def commit(self):
+        written = []
+        for path, payload in self.pending.items():
+            if payload is None:
+                path.unlink(missing_ok=True)
+            else:
+                atomic_write_bytes(path, payload)
+                written.append(path)
+        self.pending.clear()
+        return written
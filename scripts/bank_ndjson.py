@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Représentation NDJSON de la banque de questions (data/questions.ndjson)
+
+Une question par ligne, complétée par son chapter_id :
+    {"chapter_id": 1, "id": "ch1-q001", "type": "qcm", ...}
+
+Ce format se lit question par question sans charger toute la banque en
+mémoire ; iter_questions() accepte indifféremment .ndjson et .json.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from bank_io import atomic_write_text
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE
+
+NDJSON_NAME = "questions.ndjson"
+
+
+def question_line(chapter_id, question):
+    record = {'chapter_id': chapter_id}
+    record.update(question)
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def bank_to_ndjson(data):
+    """Texte NDJSON d'une banque au format questions.json"""
+    lines = [
+        question_line(chapter['chapter_id'], q)
+        for chapter in data['chapters']
+        for q in chapter['questions']
+    ]
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def iter_questions(path):
+    """
+    Itère sur (chapter_id, question) d'un fichier .ndjson (en flux) ou
+    .json (chargé entièrement). Les lignes vides sont ignorées ; une ligne
+    invalide lève ValueError avec son numéro.
+    """
+    path = Path(path)
+    if path.suffix != '.ndjson':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for chapter in data['chapters']:
+            for q in chapter['questions']:
+                yield chapter['chapter_id'], q
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path.name}:{line_number}: JSON invalide ({e.msg})") from e
+            yield record.pop('chapter_id', None), record
+
+
+def ndjson_path_for(bank_file):
+    return Path(bank_file).with_name(NDJSON_NAME)
+
+
+def emit_ndjson(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : banque au format NDJSON"""
+    path = ndjson_path_for(compiler.bank_file)
+    compiler.write_text(path, bank_to_ndjson(data))
+    return [path]
+
+
+@instrumented("bank_ndjson")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    source = Path(argv[0]) if argv else BANK_FILE
+    target = Path(argv[1]) if len(argv) > 1 else ndjson_path_for(source)
+
+    print("📜 CONVERSION DE LA BANQUE EN NDJSON")
+    print("=" * 50)
+
+    with phase('load'), open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with phase('serialize'):
+        text = bank_to_ndjson(data)
+    atomic_write_text(target, text)
+
+    print(f"✅ {text.count(chr(10))} questions écrites dans {target}")
+
+
+if __name__ == "__main__":
+    main()
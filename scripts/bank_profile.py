@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Instrumentation commune des outils de la banque de questions
+
+Chaque script décore sa fonction main() avec @instrumented("nom") et
+découpe son travail en phases :
+
+    @instrumented("validate_questions")
+    def main():
+        with phase('load'):
+            ...
+        with phase('validate'):
+            ...
+
+Sans option, phase() ne coûte presque rien. Lancé avec --profile (ou
+--profile=DOSSIER), le script est exécuté sous cProfile et tracemalloc et
+écrit dans .build-cache/profiles/ (ou DOSSIER) :
+
+    <nom>.pstats    statistiques cProfile (python3 -m pstats <nom>.pstats)
+    <nom>.json      résumé : temps réel et CPU par phase, pic mémoire
+                    tracemalloc et RSS, fonctions les plus coûteuses
+
+Phases usuelles : load, transform, validate, serialize, write. Une phase
+imbriquée dans une autre est aussi comptée dans celle qui l'englobe. Les
+processus du pool de validation ne sont pas profilés (seul leur temps
+d'attente apparaît dans la phase qui les attend).
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from bank_utils import CACHE_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+PROFILE_FLAG = "--profile"
+
+# Nombre de fonctions listées dans le résumé
+TOP_FUNCTIONS = 25
+
+# Profil actif (un seul par processus)
+_active = None
+
+
+class PhaseTimer:
+    """Temps réel et CPU cumulés d'une phase"""
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'wall_s': round(self.wall, 6), 'cpu_s': round(self.cpu, 6)}
+
+
+class ToolProfile:
+    """Profilage d'une exécution d'outil (cProfile, phases, mémoire)"""
+
+    def __init__(self, tool, output_dir=PROFILE_DIR):
+        self.tool = tool
+        self.output_dir = Path(output_dir)
+        self.phases = {}
+        self.profiler = cProfile.Profile()
+        self.started = None
+
+    def record(self, name, wall, cpu):
+        timer = self.phases.setdefault(name, PhaseTimer())
+        timer.calls += 1
+        timer.wall += wall
+        timer.cpu += cpu
+
+    def start(self):
+        self.started = datetime.now()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        tracemalloc.start()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.wall = time.perf_counter() - self.start_wall
+        self.cpu = time.process_time() - self.start_cpu
+        _, self.memory_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def top_functions(self, stats):
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': f"{Path(filename).name}:{line}({name})",
+                'calls': calls,
+                'tottime_s': round(tottime, 6),
+                'cumtime_s': round(cumtime, 6),
+            })
+        rows.sort(key=lambda row: row['cumtime_s'], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    def summary(self, stats):
+        return {
+            'tool': self.tool,
+            'argv': sys.argv[1:],
+            'started': self.started.strftime("%Y-%m-%d %H:%M:%S"),
+            'wall_s': round(self.wall, 6),
+            'cpu_s': round(self.cpu, 6),
+            'tracemalloc_peak_mb': round(self.memory_peak / 1024 / 1024, 2),
+            'peak_rss_mb': peak_rss_mb(),
+            'phases': {name: timer.as_dict() for name, timer in self.phases.items()},
+            'top_functions': self.top_functions(stats),
+        }
+
+    def write(self):
+        """Écrit les fichiers .pstats et .json ; retourne le résumé"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        pstats_file = self.output_dir / f"{self.tool}.pstats"
+        self.profiler.dump_stats(pstats_file)
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+
+        summary = self.summary(stats)
+        summary['pstats'] = str(pstats_file)
+        with open(self.output_dir / f"{self.tool}.json", 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        return summary
+
+    def print_summary(self, summary):
+        print(f"\n⏱️  PROFIL DE {self.tool} : {summary['wall_s']:.3f} s réel, "
+              f"{summary['cpu_s']:.3f} s CPU, pic tracemalloc {summary['tracemalloc_peak_mb']:.1f} MB",
+              file=sys.stderr)
+        for name, timer in summary['phases'].items():
+            print(f"   • {name:<10} {timer['wall_s']:>9.3f} s réel {timer['cpu_s']:>9.3f} s CPU "
+                  f"({timer['calls']}x)", file=sys.stderr)
+        print(f"   📄 {self.output_dir / (self.tool + '.json')}", file=sys.stderr)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+@contextmanager
+def phase(name):
+    """Chronomètre une phase de l'outil en cours de profilage (sinon ne fait rien)"""
+    profile = _active
+    if profile is None:
+        yield
+        return
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        profile.record(name, time.perf_counter() - start_wall, time.process_time() - start_cpu)
+
+
+def pop_profile_flag(argv):
+    """Retire --profile[=DOSSIER] de argv (en place) ; retourne le dossier ou None"""
+    for i, arg in enumerate(argv):
+        if arg == PROFILE_FLAG:
+            del argv[i]
+            return PROFILE_DIR
+        if arg.startswith(PROFILE_FLAG + '='):
+            del argv[i]
+            return Path(arg.split('=', 1)[1])
+    return None
+
+
+@contextmanager
+def profiling(tool, output_dir=PROFILE_DIR):
+    """Profile le bloc et écrit le résumé à la sortie (même sur sys.exit)"""
+    global _active
+    profile = ToolProfile(tool, output_dir)
+    _active = profile
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active = None
+        profile.print_summary(profile.write())
+
+
+def instrumented(tool):
+    """Décorateur de main() : active le profilage si --profile est passé"""
+    def output_dir_for(args):
+        output_dir = pop_profile_flag(sys.argv)
+        if args and isinstance(args[0], list):
+            output_dir = pop_profile_flag(args[0]) or output_dir
+        return output_dir
+
+    def decorator(main):
+        if inspect.iscoroutinefunction(main):
+            @functools.wraps(main)
+            async def async_wrapper(*args, **kwargs):
+                output_dir = output_dir_for(args)
+                if output_dir is None:
+                    return await main(*args, **kwargs)
+                with profiling(tool, output_dir):
+                    return await main(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            output_dir = output_dir_for(args)
+            if output_dir is None:
+                return main(*args, **kwargs)
+            with profiling(tool, output_dir):
+                return main(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Découpage de la banque en fragments (un fichier par chapitre)
+
+Émis par le compilateur (scripts/bank_compiler.py) à côté de questions.json :
+    data/shards/chapter_<id>.json   un objet chapitre, identique à celui de la banque
+                                    sans les explications (bank_explanations.py) et
+                                    avec les questions hotspot normalisées (ci-dessous)
+    data/shards/figures.json        catalogue des figures des questions hotspot
+                                    (bank_figures.py) ; les questions des fragments
+                                    y font référence au lieu de répéter image et zones
+    data/shards/manifest.json       course_info, metadata, le catalogue, la liste
+                                    des fragments (url, taille, hash, compteurs) et
+                                    la banque binaire (bank_binary.py)
+
+Les clients chargent le manifeste puis uniquement les chapitres nécessaires
+(voir loadQuestionBank dans js/utils.js).
+"""
+
+import json
+from pathlib import Path
+
+from bank_binary import binary_path_for, encoded_bank
+from bank_figures import FIGURES_NAME, FigureIndex, build_catalog, normalize_chapter
+from bank_io import atomic_write_text
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, bytes_hash, count_chapter, serialize_min
+
+SHARDS_DIRNAME = "shards"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 3
+
+# Champs des questions absents des fragments, chargés à la demande
+# (data/explanations/, voir bank_explanations.py)
+DEFERRED_FIELDS = ('explanation',)
+
+
+def shard_name(chapter_id):
+    return f"chapter_{chapter_id}.json"
+
+
+def shards_dir_for(bank_file):
+    return Path(bank_file).parent / SHARDS_DIRNAME
+
+
+def shard_url(bank_file, path, digest):
+    """URL relative à la racine du site, versionnée par le hash du contenu"""
+    site_root = Path(bank_file).resolve().parent.parent
+    return f"{Path(path).resolve().relative_to(site_root).as_posix()}?v={digest[:12]}"
+
+
+def core_chapter(chapter, index):
+    """Chapitre tel qu'il est écrit dans son fragment (cœur des questions, figures en référence)"""
+    chapter = normalize_chapter(chapter, index)
+    chapter['questions'] = [
+        {key: value for key, value in q.items() if key not in DEFERRED_FIELDS}
+        for q in chapter['questions']
+    ]
+    return chapter
+
+
+def binary_entry(data, bank_file):
+    """Entrée 'binary' du manifeste : banque binaire versionnée et tailles de transfert"""
+    encoded = encoded_bank(data)
+    digest = bytes_hash(encoded['payload'])
+    return {
+        'url': shard_url(bank_file, binary_path_for(bank_file), digest),
+        'bytes': len(encoded['payload']),
+        'gzip_bytes': len(encoded['gzip']),
+        'json_gzip_bytes': encoded['json_gzip_bytes'],
+        'sha256': digest,
+    }
+
+
+def read_manifest(out_dir):
+    try:
+        with open(out_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_shards(data, bank_file=BANK_FILE, changed_chapters=None, write_text=None):
+    """
+    Écrit les fragments des chapitres modifiés et le manifeste.
+
+    Les fragments des chapitres inchangés ne sont pas réécrits ; leur
+    entrée du manifeste est recalculée à partir du fichier existant. Si le
+    catalogue des figures a changé, tous les fragments sont réécrits (leurs
+    références en dépendent). Retourne la liste des fichiers écrits.
+    """
+    write_text = write_text or atomic_write_text
+    out_dir = shards_dir_for(bank_file)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    changed = None if changed_chapters is None else set(changed_chapters)
+
+    written = []
+    catalog = build_catalog(data)
+    catalog_text = serialize_min(catalog)
+    catalog_digest = bytes_hash(catalog_text.encode('utf-8'))
+    figures_path = out_dir / FIGURES_NAME
+    previous = read_manifest(out_dir)
+    if (previous or {}).get('figures', {}).get('sha256') != catalog_digest or not figures_path.exists():
+        write_text(figures_path, catalog_text)
+        written.append(figures_path)
+        changed = None
+    index = FigureIndex(catalog)
+
+    entries = []
+    for chapter in data['chapters']:
+        chapter_id = chapter['chapter_id']
+        path = out_dir / shard_name(chapter_id)
+        if changed is None or chapter_id in changed or not path.exists():
+            text = serialize_min(core_chapter(chapter, index))
+            write_text(path, text)
+            written.append(path)
+            payload = text.encode('utf-8')
+        else:
+            payload = path.read_bytes()
+
+        digest = bytes_hash(payload)
+        counts = count_chapter(chapter)
+        entries.append({
+            'chapter_id': chapter_id,
+            'chapter_title': chapter.get('chapter_title'),
+            'url': shard_url(bank_file, path, digest),
+            'bytes': len(payload),
+            'sha256': digest,
+            'questions': counts['total'],
+            'difficulty': counts['difficulty'],
+            'types': counts['types'],
+        })
+
+    # Supprime les fragments de chapitres disparus
+    expected = {shard_name(chapter['chapter_id']) for chapter in data['chapters']}
+    for stale in out_dir.glob("chapter_*.json"):
+        if stale.name not in expected:
+            stale.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'course_info': data.get('course_info', {}),
+        'metadata': data.get('metadata', {}),
+        'total_bytes': sum(entry['bytes'] for entry in entries),
+        'figures': {
+            'url': shard_url(bank_file, figures_path, catalog_digest),
+            'bytes': len(catalog_text.encode('utf-8')),
+            'sha256': catalog_digest,
+        },
+        'binary': binary_entry(data, bank_file),
+        'shards': entries,
+    }
+    manifest_path = out_dir / MANIFEST_NAME
+    write_text(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    written.append(manifest_path)
+    return written
+
+
+def emit_shards(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : fragments par chapitre + manifeste"""
+    return write_shards(data, compiler.bank_file, changed_chapters, compiler.write_text)
+
+
+@instrumented("bank_shards")
+def main():
+    print("🧩 DÉCOUPAGE DE LA BANQUE PAR CHAPITRE")
+    print("=" * 50)
+
+    with phase('load'), open(BANK_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    with phase('serialize'):
+        written = write_shards(data)
+    for path in written:
+        size = path.stat().st_size / 1024
+        print(f"  📄 {path.name} ({size:.1f} KB)")
+
+    print("✅ Fragments écrits dans", shards_dir_for(BANK_FILE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Stockage SQLite de la banque de questions (data/questions.db)
+
+La base est la source d'édition de la banque : une ligne par question,
+dont le contenu complet est une colonne JSON (champs propres à chaque type
+compris). Les champs interrogés sont des colonnes générées à partir de ce
+JSON, donc toujours cohérentes avec lui, et indexées. Comme à la
+compilation, une question sans type reçoit à l'écriture celui que déduit
+bank_types.py (une question ambiguë est refusée) :
+
+    questions       question_key, chapter_id, position, data (JSON)
+                    + id, type, difficulty, section_ref, question, explanation
+    question_tags   tags de chaque question (index sur le tag)
+    questions_fts   index plein texte FTS5 (énoncé et explication, sans accents)
+    chapters        en-têtes de chapitres (JSON, ordre des champs conservé)
+    bank_meta       course_info, metadata, ordre des blocs du fichier
+
+Les tables d'index sont tenues à jour par des triggers : modifier une
+question revient à réécrire sa ligne, dans une transaction d'une ligne.
+data/questions.json se régénère avec `export` (même disposition que le
+fichier historique) ; le compilateur (bank_compiler.py) prend le relais
+pour les fichiers dérivés.
+
+Les scripts generate_*, fix_flashcards et validate_hotspots --fix
+modifient encore questions.json directement : le hash du fichier importé
+est gardé dans bank_meta, et `export` refuse d'écraser un fichier modifié
+depuis (réimporter, ou --force pour écraser quand même).
+
+Usage :
+    python3 scripts/bank_store.py import [--bank data/questions.json]
+    python3 scripts/bank_store.py export [--output data/questions.json] [--force]
+    python3 scripts/bank_store.py search [--chapter 3] [--type numerical] [--difficulty hard]
+                                         [--tag spin] [--limit N] [texte]
+    python3 scripts/bank_store.py get ID
+    python3 scripts/bank_store.py put FICHIER.json [--chapter N]
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from bank_io import edit_bank, file_lock, save_bank
+from bank_profile import instrumented, phase
+from bank_types import AmbiguousTypeError, infer_type, normalize_types
+from bank_utils import BANK_FILE, DATA_DIR, bytes_hash
+
+STORE_FILE = DATA_DIR / "questions.db"
+
+# Version du schéma (PRAGMA user_version) : l'incrémenter impose un nouvel import
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bank_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL CHECK (json_valid(value))
+);
+
+CREATE TABLE IF NOT EXISTS chapters (
+    chapter_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    header TEXT NOT NULL CHECK (json_valid(header))
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    question_key INTEGER PRIMARY KEY,
+    chapter_id INTEGER NOT NULL REFERENCES chapters(chapter_id),
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL CHECK (json_valid(data)),
+    id TEXT GENERATED ALWAYS AS (json_extract(data, '$.id')) VIRTUAL,
+    type TEXT GENERATED ALWAYS AS (json_extract(data, '$.type')) VIRTUAL,
+    difficulty TEXT GENERATED ALWAYS AS (json_extract(data, '$.difficulty')) VIRTUAL,
+    section_ref TEXT GENERATED ALWAYS AS (json_extract(data, '$.section_ref')) VIRTUAL,
+    question TEXT GENERATED ALWAYS AS (
+        coalesce(json_extract(data, '$.question'), json_extract(data, '$.front'))) VIRTUAL,
+    explanation TEXT GENERATED ALWAYS AS (
+        coalesce(json_extract(data, '$.explanation'), json_extract(data, '$.back'))) VIRTUAL
+);
+
+CREATE INDEX IF NOT EXISTS questions_chapter ON questions(chapter_id, position);
+CREATE INDEX IF NOT EXISTS questions_id ON questions(id);
+CREATE INDEX IF NOT EXISTS questions_type ON questions(type, difficulty);
+CREATE INDEX IF NOT EXISTS questions_difficulty ON questions(difficulty);
+
+CREATE TABLE IF NOT EXISTS question_tags (
+    question_key INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS question_tags_tag ON question_tags(tag);
+CREATE INDEX IF NOT EXISTS question_tags_question ON question_tags(question_key);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question, explanation,
+    content='questions', content_rowid='question_key',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+    INSERT INTO question_tags(question_key, tag)
+        SELECT DISTINCT new.question_key, value FROM json_each(new.data, '$.tags');
+    INSERT INTO questions_fts(rowid, question, explanation)
+        VALUES (new.question_key, new.question, new.explanation);
+END;
+
+CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions BEGIN
+    DELETE FROM question_tags WHERE question_key = old.question_key;
+    INSERT INTO questions_fts(questions_fts, rowid, question, explanation)
+        VALUES ('delete', old.question_key, old.question, old.explanation);
+END;
+
+CREATE TRIGGER IF NOT EXISTS questions_au AFTER UPDATE OF data ON questions BEGIN
+    DELETE FROM question_tags WHERE question_key = old.question_key;
+    INSERT INTO question_tags(question_key, tag)
+        SELECT DISTINCT new.question_key, value FROM json_each(new.data, '$.tags');
+    INSERT INTO questions_fts(questions_fts, rowid, question, explanation)
+        VALUES ('delete', old.question_key, old.question, old.explanation);
+    INSERT INTO questions_fts(rowid, question, explanation)
+        VALUES (new.question_key, new.question, new.explanation);
+END;
+"""
+
+# Filtres de find_questions : nom -> colonne
+FILTER_COLUMNS = {
+    'chapter': 'q.chapter_id',
+    'type': 'q.type',
+    'difficulty': 'q.difficulty',
+    'section_ref': 'q.section_ref',
+}
+
+CHAPTER_ID_PATTERN = re.compile(r"^ch(\d+)-")
+
+# Clé de bank_meta : hash du questions.json importé ou exporté en dernier
+SOURCE_HASH_KEY = 'source_hash'
+
+
+class StoreError(RuntimeError):
+    """Base absente, à réimporter, ou question introuvable"""
+
+
+def open_store(path=STORE_FILE, create=False):
+    """Connexion à la base (schéma créé si `create`, sinon la base doit exister)"""
+    path = Path(path)
+    if not create and not path.exists():
+        raise StoreError(f"{path.name} absent - lancez d'abord: python3 scripts/bank_store.py import")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        raise StoreError(f"{path.name}: schéma v{version}, v{SCHEMA_VERSION} attendu - réimportez la banque")
+    if version == 0:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def typed(question):
+    """Question avec un type explicite (déduit de sa structure s'il manque)"""
+    if question.get('type'):
+        return question
+    q_type = infer_type(question)
+    if q_type is None:
+        raise StoreError(f"{question.get('id')}: type ambigu - précisez le champ 'type'")
+    return {**question, 'type': q_type}
+
+
+def read_bank_file(path=BANK_FILE):
+    """Banque et hash du fichier, lus sous verrou"""
+    with file_lock(path), phase('load'):
+        raw = Path(path).read_bytes()
+    return json.loads(raw), bytes_hash(raw)
+
+
+def import_bank(conn, data, source_hash=None):
+    """
+    Remplace le contenu de la base par une banque au format questions.json
+    (une transaction). `source_hash` : hash du fichier importé, vérifié par
+    export_to_file. Les types manquants sont complétés (bank_types.py).
+    """
+    try:
+        normalize_types(data)
+    except AmbiguousTypeError as exc:
+        raise StoreError(str(exc)) from None
+    with conn:
+        conn.execute("DELETE FROM questions")
+        conn.execute("DELETE FROM chapters")
+        conn.execute("DELETE FROM bank_meta")
+
+        layout = list(data)
+        meta = [('layout', dumps(layout)), (SOURCE_HASH_KEY, dumps(source_hash))]
+        meta.extend((key, dumps(value)) for key, value in data.items() if key != 'chapters')
+        conn.executemany("INSERT INTO bank_meta(key, value) VALUES (?, ?)", meta)
+
+        for position, chapter in enumerate(data['chapters']):
+            # La clé 'questions' est gardée (vide) pour conserver l'ordre des champs
+            header = {key: (None if key == 'questions' else value) for key, value in chapter.items()}
+            conn.execute("INSERT INTO chapters(chapter_id, position, header) VALUES (?, ?, ?)",
+                         (chapter['chapter_id'], position, dumps(header)))
+            conn.executemany(
+                "INSERT INTO questions(chapter_id, position, data) VALUES (?, ?, ?)",
+                ((chapter['chapter_id'], index, dumps(q)) for index, q in enumerate(chapter['questions'])),
+            )
+        conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('optimize')")
+    return conn.execute("SELECT count(*) FROM questions").fetchone()[0]
+
+
+def export_bank(conn):
+    """Banque au format questions.json (ordre des chapitres, des questions et des champs conservé)"""
+    meta = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM bank_meta")}
+    if 'layout' not in meta:
+        raise StoreError("base vide - importez d'abord la banque")
+
+    chapters = []
+    by_id = {}
+    for chapter_id, header in conn.execute("SELECT chapter_id, header FROM chapters ORDER BY position"):
+        chapter = json.loads(header)
+        chapter['questions'] = []
+        chapters.append(chapter)
+        by_id[chapter_id] = chapter
+    for chapter_id, data in conn.execute("SELECT chapter_id, data FROM questions ORDER BY chapter_id, position"):
+        by_id[chapter_id]['questions'].append(json.loads(data))
+
+    return {key: (chapters if key == 'chapters' else meta[key]) for key in meta['layout']}
+
+
+def stored_source_hash(conn):
+    row = conn.execute("SELECT value FROM bank_meta WHERE key = ?", (SOURCE_HASH_KEY,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def export_to_file(conn, path=BANK_FILE, force=False):
+    """
+    Réécrit questions.json depuis la base (sous verrou, seulement s'il change).
+    Le bloc metadata du fichier existant est conservé : ses compteurs sont
+    recalculés par le compilateur.
+
+    Un fichier modifié depuis l'import (ou le dernier export) n'est pas
+    écrasé, sauf avec `force` : ses modifications seraient perdues.
+    """
+    exported = export_bank(conn)
+    count = sum(len(chapter['questions']) for chapter in exported['chapters'])
+    path = Path(path)
+    if not path.exists():
+        save_bank(exported, path)
+    else:
+        expected = stored_source_hash(conn)
+        with edit_bank(path) as data:
+            if not force and bytes_hash(path.read_bytes()) != expected:
+                raise StoreError(f"{path.name} a été modifié depuis l'import - réimportez-le "
+                                 "(python3 scripts/bank_store.py import) ou utilisez --force pour l'écraser")
+            if 'metadata' in data and 'metadata' in exported:
+                exported['metadata'] = data['metadata']
+            data.clear()
+            data.update(exported)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO bank_meta(key, value) VALUES (?, ?)",
+                     (SOURCE_HASH_KEY, dumps(bytes_hash(path.read_bytes()))))
+    return count
+
+
+def fts_query(text):
+    """Requête FTS5 : chaque mot (préfixe) doit apparaître, sans syntaxe FTS à échapper"""
+    words = re.findall(r"\w+", text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def find_questions(conn, text=None, tag=None, limit=None, **filters):
+    """
+    Questions satisfaisant tous les filtres : [(question_key, chapter_id, question)].
+
+    Chaque filtre (chapter, type, difficulty, section_ref, tag) est une
+    valeur ou une liste de valeurs (union) ; `text` est cherché dans
+    l'énoncé et l'explication (tous les mots, accents ignorés) et classe
+    les résultats par pertinence. Sans texte, l'ordre est celui de la banque.
+    """
+    clauses = []
+    params = []
+    for name, wanted in filters.items():
+        if wanted is None:
+            continue
+        if name not in FILTER_COLUMNS:
+            raise TypeError(f"filtre inconnu: {name}")
+        values = [wanted] if isinstance(wanted, (str, int)) else list(wanted)
+        clauses.append(f"{FILTER_COLUMNS[name]} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    if tag is not None:
+        tags = [tag] if isinstance(tag, str) else list(tag)
+        clauses.append("q.question_key IN (SELECT question_key FROM question_tags "
+                       f"WHERE tag IN ({', '.join('?' * len(tags))}))")
+        params.extend(tags)
+
+    sql = "SELECT q.question_key, q.chapter_id, q.data FROM questions q"
+    order = "c.position, q.position"
+    if text:
+        sql += " JOIN questions_fts f ON f.rowid = q.question_key"
+        clauses.insert(0, "questions_fts MATCH ?")
+        params.insert(0, fts_query(text))
+        order = "f.rank"
+    sql += " JOIN chapters c ON c.chapter_id = q.chapter_id"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [(key, chapter_id, json.loads(data)) for key, chapter_id, data in conn.execute(sql, params)]
+
+
+def get_question(conn, q_id):
+    """Première question portant cet ID (ordre de la banque) : (question_key, chapter_id, question)"""
+    row = conn.execute(
+        "SELECT q.question_key, q.chapter_id, q.data FROM questions q "
+        "JOIN chapters c ON c.chapter_id = q.chapter_id "
+        "WHERE q.id = ? ORDER BY c.position, q.position LIMIT 1", (q_id,)
+    ).fetchone()
+    if row is None:
+        raise StoreError(f"question {q_id} introuvable")
+    return row[0], row[1], json.loads(row[2])
+
+
+def update_question(conn, question_key, question):
+    """Remplace le contenu d'une question (transaction d'une ligne)"""
+    with conn:
+        cursor = conn.execute("UPDATE questions SET data = ? WHERE question_key = ?",
+                              (dumps(typed(question)), question_key))
+    if cursor.rowcount != 1:
+        raise StoreError(f"question #{question_key} introuvable")
+
+
+def add_question(conn, chapter_id, question):
+    """Ajoute une question à la fin d'un chapitre ; retourne sa question_key"""
+    with conn:
+        if conn.execute("SELECT 1 FROM chapters WHERE chapter_id = ?", (chapter_id,)).fetchone() is None:
+            raise StoreError(f"chapitre {chapter_id} introuvable")
+        cursor = conn.execute(
+            "INSERT INTO questions(chapter_id, position, data) "
+            "SELECT ?, coalesce(max(position) + 1, 0), ? FROM questions WHERE chapter_id = ?",
+            (chapter_id, dumps(typed(question)), chapter_id),
+        )
+    return cursor.lastrowid
+
+
+def delete_question(conn, question_key):
+    with conn:
+        conn.execute("DELETE FROM questions WHERE question_key = ?", (question_key,))
+
+
+def put_question(conn, question, chapter_id=None):
+    """
+    Met à jour la question de même ID, ou l'ajoute (chapitre donné, sinon
+    déduit de l'ID ch<N>-...). Retourne ('updated' | 'added', question_key).
+    Une question sans ID, ou dont l'ID est porté par plusieurs questions de
+    la base, est refusée.
+    """
+    q_id = question.get('id')
+    if not q_id:
+        raise StoreError("question sans ID")
+    copies = conn.execute("SELECT count(*) FROM questions WHERE id = ?", (q_id,)).fetchone()[0]
+    if copies > 1:
+        raise StoreError(f"ID {q_id} porté par {copies} questions - réparez les IDs "
+                         "(python3 scripts/bank_ids.py) puis réimportez la banque")
+    try:
+        key, _, _ = get_question(conn, q_id)
+    except StoreError:
+        if chapter_id is None:
+            match = CHAPTER_ID_PATTERN.match(q_id)
+            if match is None:
+                raise StoreError(f"chapitre de {q_id!r} inconnu (utilisez --chapter)") from None
+            chapter_id = int(match.group(1))
+        return 'added', add_question(conn, chapter_id, question)
+    update_question(conn, key, question)
+    return 'updated', key
+
+
+@instrumented("bank_store")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Base SQLite de la banque de questions")
+    parser.add_argument('--db', type=Path, default=STORE_FILE, help=f"base SQLite (défaut: {STORE_FILE.name})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="remplace la base par le contenu de questions.json")
+    import_parser.add_argument('--bank', type=Path, default=BANK_FILE)
+
+    export_parser = commands.add_parser('export', help="réécrit questions.json depuis la base")
+    export_parser.add_argument('--output', type=Path, default=BANK_FILE)
+    export_parser.add_argument('--force', action='store_true',
+                               help="écrase le fichier même s'il a été modifié depuis l'import")
+
+    search_parser = commands.add_parser('search', help="recherche par facettes et plein texte")
+    search_parser.add_argument('text', nargs='*', help="mots cherchés dans l'énoncé et l'explication")
+    search_parser.add_argument('--chapter', type=int, action='append')
+    search_parser.add_argument('--type', action='append')
+    search_parser.add_argument('--difficulty', action='append')
+    search_parser.add_argument('--tag', action='append')
+    search_parser.add_argument('--limit', type=int, default=20)
+
+    get_parser = commands.add_parser('get', help="affiche une question (JSON)")
+    get_parser.add_argument('id')
+
+    put_parser = commands.add_parser('put', help="ajoute ou remplace une question depuis un fichier JSON")
+    put_parser.add_argument('file', type=Path, help="fichier JSON d'une question ('-' : entrée standard)")
+    put_parser.add_argument('--chapter', type=int, help="chapitre d'une nouvelle question (défaut: d'après l'ID)")
+
+    args = parser.parse_args(argv)
+
+    print("🗃️  BASE SQLITE DE LA BANQUE")
+    print("=" * 50)
+
+    try:
+        conn = open_store(args.db, create=args.command == 'import')
+    except StoreError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    try:
+        if args.command == 'import':
+            data, file_hash = read_bank_file(args.bank)
+            with phase('write'):
+                count = import_bank(conn, data, file_hash)
+            print(f"✅ {count} questions importées dans {args.db}")
+
+        elif args.command == 'export':
+            count = export_to_file(conn, args.output, args.force)
+            print(f"✅ {count} questions exportées dans {args.output}")
+            print("💡 Fichiers dérivés: python3 scripts/bank_compiler.py")
+
+        elif args.command == 'search':
+            start = time.perf_counter()
+            results = find_questions(
+                conn, text=' '.join(args.text) or None, tag=args.tag, limit=args.limit,
+                chapter=args.chapter, type=args.type, difficulty=args.difficulty,
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            for _, chapter_id, q in results:
+                text = re.sub(r"\s+", ' ', q.get('question') or q.get('front') or '')
+                print(f"  • [{chapter_id}] {q.get('id')} ({q.get('type')}, {q.get('difficulty')}) {text[:90]}")
+            print(f"🔎 {len(results)} question(s) en {elapsed:.1f} ms")
+
+        elif args.command == 'get':
+            _, chapter_id, q = get_question(conn, args.id)
+            print(f"📖 Chapitre {chapter_id}")
+            print(json.dumps(q, ensure_ascii=False, indent=2))
+
+        elif args.command == 'put':
+            raw = sys.stdin.read() if str(args.file) == '-' else args.file.read_text(encoding='utf-8')
+            status, key = put_question(conn, json.loads(raw), args.chapter)
+            print(f"✅ Question {'mise à jour' if status == 'updated' else 'ajoutée'} (#{key})")
+            print("💡 Régénérer questions.json: python3 scripts/bank_store.py export")
+    except StoreError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
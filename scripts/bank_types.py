@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Normalisation des types de questions
+
+Certaines questions (hotspots, drag & drop générés à la main) n'ont pas de
+champ "type" : les clients devaient le deviner à chaque chargement
+(getQuestionType dans js/utils.js). Le compilateur de la banque écrit
+désormais un type explicite pour chaque question, déduit de sa structure :
+
+    marqueurs forts     hotspots, draggable_items/drop_zones, front+back,
+                        animation_type, pairs, sample_answer
+    forme de la réponse options + index (qcm), booléen (vrai_faux),
+                        nombre avec tolérance/unité (numerical)
+
+Une question dont la structure désigne plusieurs types, ou aucun, est
+ambiguë : la compilation est refusée tant qu'elle n'a pas de type explicite.
+"""
+
+QUESTION_TYPES = [
+    'qcm', 'vrai_faux', 'matching', 'numerical', 'interpretation',
+    'hotspot', 'drag_drop', 'flashcard', 'animation',
+]
+
+# Champs propres à un type : leur présence suffit à le désigner
+STRONG_MARKERS = {
+    'hotspot': lambda q: bool(q.get('hotspots')),
+    'drag_drop': lambda q: bool(q.get('draggable_items') or q.get('drop_zones') or q.get('draggables')),
+    'flashcard': lambda q: bool(q.get('front') and q.get('back')),
+    'animation': lambda q: bool(q.get('animation_type')),
+    'matching': lambda q: bool(q.get('pairs')),
+    'interpretation': lambda q: bool(q.get('sample_answer')),
+}
+
+
+class AmbiguousTypeError(ValueError):
+    """Questions dont le type ne peut pas être déduit sans ambiguïté"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        details = ', '.join(f"{q_id} ({'/'.join(candidates) or 'aucun type'})" for q_id, candidates in entries)
+        super().__init__(f"{len(entries)} question(s) sans type déductible: {details}")
+
+
+def answer_shape_types(question):
+    """Types compatibles avec la forme de la réponse (marqueurs faibles)"""
+    answer = question.get('correct_answer')
+    candidates = []
+    if isinstance(answer, bool):
+        candidates.append('vrai_faux')
+    elif isinstance(answer, int) and question.get('options'):
+        candidates.append('qcm')
+    if isinstance(answer, (int, float)) and not isinstance(answer, bool) \
+            and ('tolerance' in question or 'unit' in question):
+        candidates.append('numerical')
+    return candidates
+
+
+def type_candidates(question):
+    """Types compatibles avec la structure d'une question"""
+    strong = [name for name, marker in STRONG_MARKERS.items() if marker(question)]
+    return strong or answer_shape_types(question)
+
+
+def infer_type(question):
+    """Type déduit de la structure, ou None si ambigu"""
+    candidates = type_candidates(question)
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def normalize_types(data):
+    """
+    Écrit un champ "type" pour chaque question qui n'en a pas.
+    Retourne la liste des IDs complétés ; lève AmbiguousTypeError (sans
+    rien modifier) si au moins une question est ambiguë.
+    """
+    missing = []
+    ambiguous = []
+    for chapter in data['chapters']:
+        for q in chapter['questions']:
+            if q.get('type'):
+                continue
+            candidates = type_candidates(q)
+            if len(candidates) == 1:
+                missing.append((q, candidates[0]))
+            else:
+                ambiguous.append((q.get('id', 'NO_ID'), candidates))
+
+    if ambiguous:
+        raise AmbiguousTypeError(ambiguous)
+
+    for q, q_type in missing:
+        q['type'] = q_type
+    return [q.get('id') for q, _ in missing]
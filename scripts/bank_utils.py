@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Fonctions communes aux outils de la banque de questions
+(hash de contenu, signatures de fichiers, sérialisation, compteurs)
+"""
+
+import hashlib
+import json
+from collections import Counter
+from pathlib import Path
+
+from bank_types import infer_type
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_DIR / "data"
+BANK_FILE = DATA_DIR / "questions.json"
+CACHE_DIR = PROJECT_DIR / ".build-cache"
+
+
+def canonical_json(obj):
+    """Sérialisation stable utilisée pour le calcul des hash"""
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def content_hash(obj):
+    """Hash SHA-256 du contenu canonique d'un objet JSON"""
+    return hashlib.sha256(canonical_json(obj).encode('utf-8')).hexdigest()
+
+
+def bytes_hash(data):
+    """Hash SHA-256 d'un contenu binaire"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_signature(path):
+    """Signature rapide d'un fichier (taille, mtime) sans le lire"""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def project_path(path):
+    """Chemin relatif à la racine du projet (absolu s'il est en dehors)"""
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(PROJECT_DIR))
+    except ValueError:
+        return str(path)
+
+
+def serialize_bank(data):
+    """Sérialise la banque dans le format historique de questions.json"""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def serialize_min(data):
+    """Sérialise sans espaces (fichiers destinés au téléchargement)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def question_type(question):
+    """Type d'une question : son champ 'type', sinon celui que déduit
+    bank_types.infer_type ('unknown' si la structure est ambiguë)"""
+    return question.get('type') or infer_type(question) or 'unknown'
+
+
+def count_chapter(chapter):
+    """Compteurs par facette (difficulté, type, tag, section) d'un chapitre"""
+    questions = chapter['questions']
+    tags = Counter()
+    for q in questions:
+        tags.update(set(q.get('tags') or []))
+    return {
+        'total': len(questions),
+        'difficulty': dict(Counter(q.get('difficulty', 'unknown') for q in questions)),
+        'types': dict(Counter(question_type(q) for q in questions)),
+        'tags': dict(tags),
+        'sections': dict(Counter(str(q.get('section_ref', '')) for q in questions)),
+    }
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de passage à l'échelle des outils de la banque de questions
+
+Pour chaque taille de banque (10k, 100k, ... questions), une banque
+synthétique est générée (scripts/synthetic_bank.py) puis chaque outil est
+lancé dans un processus séparé, sur une copie de la banque :
+
+    integrate          compilation complète (bank_compiler, fichiers dérivés compris)
+    integrate_noop     recompilation sans changement
+    validate           validation parallèle, cache vide
+    validate_cached    revalidation d'un fichier inchangé (rapport en cache)
+    validate_stream    validation en flux du NDJSON
+    remove_generic     suppression des questions génériques
+
+Pour chaque mesure : temps réel, temps CPU, pic de mémoire résidente (RSS,
+processus de validation compris) et taille des fichiers produits. Les
+résultats sont écrits dans benchmarks/bank_<version>.json ; --compare
+affiche l'écart avec un fichier de résultats précédent.
+
+Usage :
+    python3 scripts/benchmark_bank.py --sizes 10000,100000
+    python3 scripts/benchmark_bank.py --compare benchmarks/bank_2.2.0-abc1234.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bank_utils import PROJECT_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = PROJECT_DIR / "benchmarks"
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [10_000, 100_000]
+
+# Écart relatif au-delà duquel --compare signale une régression
+REGRESSION_THRESHOLD = 0.10
+# Mesures trop courtes pour être comparées (bruit de démarrage du processus)
+MIN_COMPARED_WALL_S = 0.1
+
+
+# ----------------------------------------------------------------------
+# Outils mesurés (exécutés dans le processus enfant)
+# ----------------------------------------------------------------------
+
+def tree_size(directory):
+    return sum(p.stat().st_size for p in Path(directory).rglob('*') if p.is_file())
+
+
+def run_integrate(workdir):
+    from bank_compiler import BankCompiler
+    BankCompiler(workdir / "data" / "questions.json", workdir / "bank_state.json").compile()
+    return tree_size(workdir / "data")
+
+
+def run_validate(workdir, cached=False):
+    from validate_questions import validate_questions_parallel
+    cache_file = workdir / "validation_cache.json"
+    if not cached and cache_file.exists():
+        cache_file.unlink()
+    validate_questions_parallel(workdir / "data" / "questions.json", cache_file=cache_file)
+    return cache_file.stat().st_size
+
+
+def run_validate_stream(workdir):
+    from validate_questions import validate_questions_stream
+    errors_file = workdir / "errors.txt"
+    with open(errors_file, 'w', encoding='utf-8') as error_stream:
+        validate_questions_stream(workdir / "data" / "questions.ndjson", error_stream)
+    return errors_file.stat().st_size
+
+
+def run_remove_generic(workdir):
+    from remove_generic_questions import clean_questions
+    output = workdir / "questions.clean.json"
+    clean_questions(workdir / "data" / "questions.json", output)
+    return output.stat().st_size
+
+
+TOOLS = {
+    'integrate': run_integrate,
+    'integrate_noop': run_integrate,
+    'validate': run_validate,
+    'validate_cached': lambda workdir: run_validate(workdir, cached=True),
+    'validate_stream': run_validate_stream,
+    'remove_generic': run_remove_generic,
+}
+
+
+def peak_rss_mb():
+    """Pic de RSS du processus et de ses enfants (pool de validation)"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_child(tool, workdir):
+    """Exécute un outil et affiche ses mesures en JSON sur la sortie standard"""
+    stdout = sys.stdout
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_bytes = TOOLS[tool](Path(workdir))
+    wall = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += children.ru_utime + children.ru_stime
+    stdout.write(json.dumps({
+        'wall_s': round(wall, 4),
+        'cpu_s': round(cpu, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'output_bytes': output_bytes,
+    }) + '\n')
+
+
+# ----------------------------------------------------------------------
+# Orchestration (processus parent)
+# ----------------------------------------------------------------------
+
+def measure(tool, workdir):
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--run-tool', tool, str(workdir)],
+        capture_output=True, text=True, cwd=SCRIPT_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{tool} a échoué:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_size(size, seed, tmp_root):
+    from synthetic_bank import write_bank
+
+    size_dir = Path(tmp_root) / f"bank_{size}"
+    source = size_dir / "source.json"
+    size_dir.mkdir(parents=True)
+
+    start = time.perf_counter()
+    write_bank(source, size, seed)
+    print(f"\n📚 {size} questions ({source.stat().st_size / 1024 / 1024:.1f} MB, "
+          f"générées en {time.perf_counter() - start:.1f} s)")
+
+    results = {}
+    # Chaque famille d'outils travaille sur sa propre copie de la banque ;
+    # les outils d'une même famille s'enchaînent (cache, NDJSON produit...)
+    families = [
+        ['integrate', 'integrate_noop', 'validate_stream'],
+        ['validate', 'validate_cached'],
+        ['remove_generic'],
+    ]
+    for family in families:
+        workdir = size_dir / family[0]
+        (workdir / "data").mkdir(parents=True)
+        shutil.copyfile(source, workdir / "data" / "questions.json")
+        for tool in family:
+            results[tool] = measure(tool, workdir)
+            r = results[tool]
+            rss = f"{r['peak_rss_mb']:.0f} MB" if r['peak_rss_mb'] is not None else "n/d"
+            print(f"  ⏱️  {tool:<16} {r['wall_s']:>9.2f} s  CPU {r['cpu_s']:>8.2f} s  "
+                  f"RSS {rss:>8}  sortie {r['output_bytes'] / 1024 / 1024:>8.1f} MB")
+        shutil.rmtree(workdir)
+    return {'bank_bytes': source.stat().st_size, 'tools': results}
+
+
+def project_version():
+    with open(PROJECT_DIR / "package.json", 'r', encoding='utf-8') as f:
+        version = json.load(f)['version']
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return version
+    return f"{version}-{commit}"
+
+
+def compare(current, previous):
+    """Affiche l'écart de temps et de mémoire avec des résultats précédents"""
+    print(f"\n📊 Comparaison avec {previous['version']}")
+    regressions = 0
+    for size, entry in current['sizes'].items():
+        old_entry = previous['sizes'].get(size)
+        if old_entry is None:
+            continue
+        for tool, result in entry['tools'].items():
+            old = old_entry['tools'].get(tool)
+            if old is None or old['wall_s'] < MIN_COMPARED_WALL_S:
+                continue
+            for metric in ('wall_s', 'peak_rss_mb'):
+                if not old.get(metric) or result.get(metric) is None:
+                    continue
+                delta = result[metric] / old[metric] - 1
+                if abs(delta) < REGRESSION_THRESHOLD:
+                    continue
+                marker = "🔺" if delta > 0 else "🔻"
+                regressions += delta > 0
+                print(f"  {marker} {size:>8} {tool:<16} {metric}: {old[metric]} → {result[metric]} "
+                      f"({delta:+.0%})")
+    if not regressions:
+        print("  ✅ Aucune régression au-delà de "
+              f"{REGRESSION_THRESHOLD:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks des outils de la banque de questions")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="tailles de banque, séparées par des virgules (ex: 10000,100000,1000000)")
+    parser.add_argument('--seed', type=int, default=42, help="graine de la banque synthétique")
+    parser.add_argument('--output', type=Path, help="fichier de résultats (défaut: benchmarks/bank_<version>.json)")
+    parser.add_argument('--compare', type=Path, help="résultats précédents à comparer")
+    parser.add_argument('--run-tool', nargs=2, metavar=('TOOL', 'WORKDIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_tool:
+        run_child(*args.run_tool)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    version = project_version()
+
+    print("🏁 BENCHMARKS DES OUTILS DE LA BANQUE")
+    print("=" * 50)
+    print(f"Version {version}, Python {platform.python_version()}, {os.cpu_count()} CPU")
+
+    results = {
+        'version': version,
+        'results_version': RESULTS_VERSION,
+        'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'seed': args.seed,
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bank-bench-") as tmp_root:
+        for size in sizes:
+            results['sizes'][str(size)] = benchmark_size(size, args.seed, tmp_root)
+
+    output = args.output or RESULTS_DIR / f"bank_{version}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Résultats écrits dans {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Détection des questions dupliquées ou quasi-dupliquées (MinHash + LSH)
+
+Le texte de chaque question (énoncé ou recto, options, paires, zones,
+réponse attendue) est normalisé : minuscules, accents retirés, LaTeX ramené à ses commandes
+et symboles, ponctuation et espaces unifiés. Deux questions de même texte
+normalisé sont des doublons exacts ; les autres sont comparées par
+signatures MinHash regroupées en bandes (LSH) : seules les questions qui
+partagent au moins une bande sont comparées, ce qui garde un coût
+quasi linéaire en nombre de questions. Deux questions dont les réponses
+attendues diffèrent ne sont jamais regroupées, quelle que soit leur
+similarité.
+
+Le résultat est un rapport JSON (.build-cache/dedup_report.json) :
+    clusters    groupes de questions similaires, avec leur similarité estimée
+    merge_plan  pour chaque groupe, la question conservée et celles à retirer
+
+--apply retire de la banque les questions marquées « remove » du plan.
+
+Usage :
+    python3 scripts/dedup_questions.py [banque] [--threshold 0.8] [--apply]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+from bank_io import atomic_write_text, edit_bank
+from bank_ndjson import iter_questions
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, CACHE_DIR, question_type
+
+REPORT_FILE = CACHE_DIR / "dedup_report.json"
+
+# Signatures MinHash « à une permutation » : chaque shingle est haché une
+# seule fois et tombe dans l'un des NUM_BINS compartiments, dont on garde le
+# minimum (coût linéaire en nombre de shingles au lieu de NUM_BINS hachages).
+# Les compartiments sont groupés en BANDS bandes de ROWS lignes pour le LSH :
+# deux questions de similarité de Jaccard s deviennent candidates avec une
+# probabilité 1 - (1 - s^ROWS)^BANDS (≈ 0.998 pour s = 0.8, ≈ 0.27 pour s = 0.5).
+NUM_BINS = 120
+BANDS = 20
+ROWS = NUM_BINS // BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+HASH_BITS = 64
+EMPTY_BIN = 1 << HASH_BITS
+
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+LATEX_DELIMITERS = re.compile(r"\$+|\\[()\[\]]")
+LATEX_SIZING = re.compile(r"\\(left|right|big|Big|bigg|Bigg)\b|\\[,;:! ]")
+LATEX_COMMAND = re.compile(r"\\([a-zA-Z]+)")
+TOKEN = re.compile(r"\\[a-z]+|[a-z0-9]+|[^\sa-z0-9]")
+NON_WORD = re.compile(r"[\s{}]+")
+
+
+# ----------------------------------------------------------------------
+# Normalisation
+# ----------------------------------------------------------------------
+
+def strip_accents(text):
+    return COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text))
+
+
+def normalize_text(text):
+    """Texte comparable : minuscules, sans accents ni mise en forme LaTeX"""
+    text = strip_accents(str(text)).lower()
+    text = LATEX_DELIMITERS.sub(' ', text)
+    text = LATEX_SIZING.sub(' ', text)
+    text = LATEX_COMMAND.sub(lambda m: f" \\{m.group(1)} ", text)
+    return ' '.join(TOKEN.findall(NON_WORD.sub(' ', text)))
+
+
+def answer_key(question):
+    """
+    Réponse attendue, quel que soit le type : option correcte (par son
+    texte, les options étant mélangées), valeur, zone cliquable correcte
+    (libellé et position), associations élément → zone ou paires.
+    """
+    parts = []
+    options = question.get('options') or []
+    answer = question.get('correct_answer')
+    if isinstance(answer, int) and not isinstance(answer, bool) and 0 <= answer < len(options):
+        parts.append(f"reponse {options[answer]}")
+    elif 'correct_answer' in question:
+        parts.append(f"reponse {answer}")
+
+    if 'correct_hotspot' in question:
+        regions = {h.get('id'): h for h in question.get('hotspots') or []}
+        correct = question['correct_hotspot']
+        region = regions.get(correct)
+        if region:
+            parts.append(f"zone {region.get('label', correct)} {region.get('x')} {region.get('y')}")
+        else:
+            parts.append(f"zone {correct}")
+
+    if question.get('correct_matches'):
+        items = {i.get('id'): i.get('text', i.get('id')) for i in question.get('draggable_items') or []}
+        zones = {z.get('id'): z.get('label', z.get('id')) for z in question.get('drop_zones') or []}
+        parts.extend(sorted(
+            f"{items.get(item, item)} -> {zones.get(zone, zone)}"
+            for item, zone in question['correct_matches'].items()
+        ))
+
+    for pair in question.get('pairs') or []:
+        parts.append(f"{pair.get('left', '')} -> {pair.get('right', '')}")
+    return normalize_text(' '.join(sorted(str(p) for p in parts)))
+
+
+def question_text(question):
+    """Contenu d'une question pris en compte pour la comparaison"""
+    parts = [question.get('question') or question.get('front') or '']
+    # L'ordre des options et des zones n'a pas d'importance (elles sont
+    # mélangées ou placées sur l'image)
+    parts.extend(sorted(normalize_text(o) for o in question.get('options') or []))
+    parts.extend(sorted(normalize_text(h.get('label', '')) for h in question.get('hotspots') or []))
+    for item in question.get('draggable_items') or []:
+        parts.append(item.get('text', ''))
+    parts.extend(sorted(normalize_text(z.get('label', '')) for z in question.get('drop_zones') or []))
+    if question.get('back'):
+        parts.append(question['back'])
+    parts.append(answer_key(question))
+    return normalize_text(' '.join(str(p) for p in parts))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    tokens = text.split()
+    if len(tokens) <= size:
+        return {' '.join(tokens)}
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+# ----------------------------------------------------------------------
+# MinHash et LSH
+# ----------------------------------------------------------------------
+
+def shingle_hash(shingle):
+    digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=HASH_BITS // 8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def minhash(shingle_set):
+    """Signature MinHash (NUM_BINS entiers) d'un ensemble de shingles"""
+    signature = [EMPTY_BIN] * NUM_BINS
+    for shingle in shingle_set:
+        bin_index, value = divmod(shingle_hash(shingle), EMPTY_BIN // NUM_BINS)
+        if value < signature[bin_index]:
+            signature[bin_index] = value
+
+    # Densification : un compartiment vide reprend la valeur du premier
+    # compartiment non vide qui le suit, décalée de la distance parcourue
+    # (deux textes proches ont ainsi les mêmes compartiments remplis)
+    filled = [i for i, value in enumerate(signature) if value != EMPTY_BIN]
+    if not filled:
+        return signature
+    next_filled = filled[0] + NUM_BINS
+    for i in range(NUM_BINS - 1, -1, -1):
+        if signature[i] != EMPTY_BIN:
+            next_filled = i
+        else:
+            source = next_filled % NUM_BINS
+            signature[i] = signature[source] + (next_filled - i) * EMPTY_BIN
+    return signature
+
+
+def estimated_similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_BINS
+
+
+def lsh_candidates(signatures):
+    """Paires (i, j) partageant au moins une bande de signature"""
+    candidates = set()
+    for band in range(BANDS):
+        buckets = {}
+        start = band * ROWS
+        for index, signature in enumerate(signatures):
+            buckets.setdefault(tuple(signature[start:start + ROWS]), []).append(index)
+        for members in buckets.values():
+            if len(members) > 1:
+                for n, i in enumerate(members):
+                    for j in members[n + 1:]:
+                        candidates.add((i, j))
+    return candidates
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+# ----------------------------------------------------------------------
+# Détection
+# ----------------------------------------------------------------------
+
+def completeness(question):
+    """Score de préférence de la question conservée dans un groupe"""
+    return (
+        bool(question.get('type')),
+        len(question.get('explanation') or question.get('back') or ''),
+        len(question.get('tags') or []),
+    )
+
+
+def find_duplicates(entries, threshold=DEFAULT_THRESHOLD):
+    """
+    entries : liste de (chapter_id, question) dans l'ordre de la banque.
+    Retourne la liste des groupes, chacun sous la forme
+    {'members': [positions], 'exact': bool, 'similarity': float}.
+    """
+    with phase('transform'):
+        texts = [question_text(q) for _, q in entries]
+        answers = [answer_key(q) for _, q in entries]
+
+    # Doublons exacts : même texte normalisé
+    union = UnionFind(len(entries))
+    first_by_text = {}
+    for index, text in enumerate(texts):
+        if text in first_by_text:
+            union.union(first_by_text[text], index)
+        else:
+            first_by_text[text] = index
+
+    # Quasi-doublons : une seule signature par texte distinct
+    representatives = sorted(first_by_text.values())
+    with phase('transform'):
+        signatures = [minhash(shingles(texts[i])) for i in representatives]
+
+    similarities = {}
+    with phase('validate'):
+        for a, b in lsh_candidates(signatures):
+            # Même type et même réponse attendue requis : un vrai/faux et un
+            # QCM au même énoncé, ou deux hotspots sur la même image dont la
+            # zone correcte diffère, ne sont pas interchangeables
+            i, j = representatives[a], representatives[b]
+            if question_type(entries[i][1]) != question_type(entries[j][1]) or answers[i] != answers[j]:
+                continue
+            similarity = estimated_similarity(signatures[a], signatures[b])
+            if similarity >= threshold:
+                union.union(i, j)
+                similarities[(i, j)] = similarity
+
+    groups = {}
+    for index in range(len(entries)):
+        groups.setdefault(union.find(index), []).append(index)
+
+    clusters = []
+    for root, members in sorted(groups.items()):
+        if len(members) < 2:
+            continue
+        member_set = set(members)
+        pair_scores = [s for (i, j), s in similarities.items() if i in member_set]
+        clusters.append({
+            'members': members,
+            'exact': len({texts[i] for i in members}) == 1,
+            'similarity': round(min(pair_scores), 3) if pair_scores else 1.0,
+        })
+    return clusters
+
+
+def merge_plan(entries, clusters):
+    """Pour chaque groupe : question conservée (la plus complète, puis la première) et questions retirées"""
+    plan = []
+    for cluster in clusters:
+        members = cluster['members']
+        keep = max(members, key=lambda i: (completeness(entries[i][1]), -i))
+        plan.append({
+            'keep': entries[keep][1].get('id'),
+            'keep_chapter': entries[keep][0],
+            'remove': [
+                {'id': entries[i][1].get('id'), 'chapter_id': entries[i][0], 'position': i}
+                for i in members if i != keep
+            ],
+            'exact': cluster['exact'],
+            'similarity': cluster['similarity'],
+        })
+    return plan
+
+
+def build_report(entries, threshold=DEFAULT_THRESHOLD):
+    clusters = find_duplicates(entries, threshold)
+    return {
+        'threshold': threshold,
+        'total_questions': len(entries),
+        'clusters': [
+            {
+                'ids': [entries[i][1].get('id') for i in cluster['members']],
+                'chapters': [entries[i][0] for i in cluster['members']],
+                'exact': cluster['exact'],
+                'similarity': cluster['similarity'],
+            }
+            for cluster in clusters
+        ],
+        'merge_plan': merge_plan(entries, clusters),
+    }
+
+
+def apply_plan(bank_file, plan):
+    """Retire de la banque les questions marquées à retirer ; retourne leur nombre"""
+    positions = {entry['position'] for group in plan for entry in group['remove']}
+    removed = 0
+    with edit_bank(bank_file) as data:
+        position = 0
+        for chapter in data['chapters']:
+            kept = []
+            for q in chapter['questions']:
+                if position in positions:
+                    removed += 1
+                else:
+                    kept.append(q)
+                position += 1
+            chapter['questions'] = kept
+    return removed
+
+
+@instrumented("dedup_questions")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Détection des questions dupliquées (MinHash/LSH)")
+    parser.add_argument('file', nargs='?', type=Path, default=BANK_FILE,
+                        help="questions.json ou questions.ndjson")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"similarité minimale (Jaccard estimé, défaut: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--output', type=Path, default=REPORT_FILE, help="rapport JSON")
+    parser.add_argument('--apply', action='store_true',
+                        help="retire de la banque les doublons du plan de fusion")
+    args = parser.parse_args(argv)
+
+    print("🔎 DÉTECTION DES QUESTIONS DUPLIQUÉES")
+    print("=" * 50)
+
+    with phase('load'):
+        entries = list(iter_questions(args.file))
+    report = build_report(entries, args.threshold)
+
+    with phase('serialize'):
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+    atomic_write_text(args.output, text)
+
+    plan = report['merge_plan']
+    exact = sum(1 for group in plan if group['exact'])
+    redundant = sum(len(group['remove']) for group in plan)
+    print(f"📚 {len(entries)} questions analysées")
+    print(f"🧬 {len(plan)} groupes de doublons ({exact} exacts, {len(plan) - exact} quasi-doublons)")
+    print(f"🗑️  {redundant} questions redondantes")
+    for group in plan[:10]:
+        removed = ', '.join(entry['id'] for entry in group['remove'])
+        print(f"  • garder {group['keep']} ← {removed} (similarité {group['similarity']:.2f})")
+    if len(plan) > 10:
+        print(f"  ... et {len(plan) - 10} autres groupes")
+    print(f"📄 Rapport: {args.output}")
+
+    if args.apply and plan:
+        if args.file.suffix == '.ndjson':
+            print("❌ --apply nécessite la banque au format questions.json")
+            sys.exit(1)
+        removed = apply_plan(args.file, plan)
+        print(f"✅ {removed} doublons retirés de {args.file.name}")
+
+
+if __name__ == "__main__":
+    main()
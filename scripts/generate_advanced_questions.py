@@ -6,9 +6,13 @@ Script pour générer 100 questions des 3 nouveaux types :
 - Flashcard (recto-verso) - 34 questions
 """
 
-import json
 from pathlib import Path
 
+from bank_ids import IdAllocator, bank_keys, content_key
+from bank_io import edit_bank
+from bank_profile import instrumented
+from bank_utils import question_type
+
 def generate_hotspot_questions():
     """Génère 33 questions Hotspot"""
     questions = []
@@ -1508,6 +1512,7 @@ def generate_flashcard_questions():
     questions.extend(flashcards)
     return questions
 
+@instrumented("generate_advanced_questions")
 def main():
     """Fonction principale"""
     print("🎯 Génération de 100 questions avancées...")
@@ -1529,40 +1534,51 @@ def main():
     # Charge le JSON existant
     json_path = Path(__file__).parent.parent / "data" / "questions.json"
 
+    # Lecture, ajout et écriture atomique sous verrou : la banque n'est
+    # réécrite qu'une fois, à la sortie du bloc
     print(f"\n📖 Lecture du fichier existant...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Ajoute les nouvelles questions à chaque chapitre
-    print(f"\n📝 Ajout des questions aux chapitres...")
+    with edit_bank(json_path) as data:
+        # Ajoute les nouvelles questions à chaque chapitre
+        print(f"\n📝 Ajout des questions aux chapitres...")
 
-    # Répartition par chapitre
-    questions_by_chapter = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
+        # Répartition par chapitre
+        questions_by_chapter = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
 
-    for q in all_new_questions:
-        chapter_num = int(q['id'].split('-')[0].replace('ch', ''))
-        questions_by_chapter[chapter_num].append(q)
+        # Une question dont l'ID ou le contenu est déjà dans la banque est
+        # ignorée (relancer le script ne crée plus de doublons) ; seules les
+        # nouvelles questions reçoivent un ID de l'allocateur
+        allocator = IdAllocator.load(data)
+        existing_ids, existing_contents = bank_keys(data)
+        added = []
+        for q in all_new_questions:
+            if q['id'] in existing_ids or content_key(q) in existing_contents:
+                continue
+            chapter_num = int(q['id'].split('-')[0].replace('ch', ''))
+            q['id'] = allocator.claim(q['id'], chapter_num, question_type(q))
+            questions_by_chapter[chapter_num].append(q)
+            added.append(q)
+        allocator.save()
+        skipped = len(all_new_questions) - len(added)
+        if skipped:
+            print(f"  ⏭️  {skipped} question(s) déjà présente(s) dans la banque, ignorée(s)")
 
-    # Ajoute aux chapitres
-    for chapter in data['chapters']:
-        ch_id = chapter['chapter_id']
-        if ch_id in questions_by_chapter:
-            chapter['questions'].extend(questions_by_chapter[ch_id])
-            print(f"  📚 Chapitre {ch_id}: +{len(questions_by_chapter[ch_id])} questions")
+        # Ajoute aux chapitres
+        for chapter in data['chapters']:
+            ch_id = chapter['chapter_id']
+            if ch_id in questions_by_chapter:
+                chapter['questions'].extend(questions_by_chapter[ch_id])
+                print(f"  📚 Chapitre {ch_id}: +{len(questions_by_chapter[ch_id])} questions")
 
-    # Calcule le nouveau total
-    total_questions = sum(len(ch['questions']) for ch in data['chapters'])
-    data['course_info']['total_questions'] = total_questions
+        # Calcule le nouveau total
+        total_questions = sum(len(ch['questions']) for ch in data['chapters'])
+        data['course_info']['total_questions'] = total_questions
 
-    # Sauvegarde
-    print(f"\n💾 Sauvegarde du fichier...")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Sauvegarde du fichier...")
 
     print(f"\n✅ TERMINÉ!")
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print(f"📊 Total final: {total_questions} questions")
-    print(f"✨ +{len(all_new_questions)} nouvelles questions ajoutées")
+    print(f"✨ +{len(added)} nouvelles questions ajoutées")
     print(f"🎉 8 types de questions maintenant disponibles!")
 
     return True
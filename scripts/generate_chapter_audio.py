@@ -1,14 +1,37 @@
 #!/usr/bin/env python3
 """
 Script de génération des fichiers audio pour les chapitres
-Utilise edge-tts (Microsoft Edge TTS) pour une meilleure qualité
-et gTTS (Google TTS) en fallback
+
+Le moteur de synthèse est choisi parmi ceux de scripts/tts_backends.py :
+edge-tts (meilleure qualité) puis gTTS en fallback, espeak-ng hors ligne,
+ou un moteur factice pour les tests (--backend stub). Avec --backend auto,
+un chapitre dont la synthèse échoue (hors ligne, erreur du service) est
+réessayé avec le moteur installé suivant.
+
+Les chapitres sont synthétisés en parallèle (--concurrency). Un chapitre
+dont le texte, la voix et les réglages n'ont pas changé depuis la dernière
+génération n'est pas régénéré.
+
+Chaque audio est ensuite découpé en segments de quelques secondes, en débit
+standard et bas débit, avec une playlist (durée, crêtes de la forme d'onde) :
+voir scripts/audio_packaging.py. --no-package saute cette étape.
+
+Le lecteur (js/chapter-audio.js) ne lit que des MP3 : les moteurs qui
+produisent du WAV (espeak, stub) écrivent dans .build-cache/audio/chapters
+plutôt que dans assets/audio/chapters, sauf --output-dir explicite. Seuls
+les fichiers du dossier du site sont découpés en segments.
 """
 
+import argparse
 import asyncio
 import os
 import sys
 
+from audio_packaging import ffmpeg_available, package_audio
+from bank_profile import instrumented, phase
+from bank_utils import CACHE_DIR
+from tts_backends import BACKENDS, AudioCache, TTSError, audio_key, get_backends, synthesize_with_fallback
+
 # Textes des résumés de chapitres (voix féminine chaleureuse)
 CHAPTER_TEXTS = {
     1: """Bienvenue dans le premier chapitre sur les États Quantiques !
@@ -83,112 +106,170 @@ Ce chapitre vous ouvrira les portes de la spectroscopie et de l'optique quantiqu
 Félicitations pour avoir parcouru ce voyage fascinant dans le monde quantique !"""
 }
 
-# Dossier de sortie
+# Dossier de sortie (audios servis par le site)
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "audio", "chapters")
-
-
-async def generate_with_edge_tts():
-    """Génère les fichiers audio avec edge-tts (meilleure qualité)"""
+# Audios non MP3 (le lecteur ne les lit pas) : hors du dossier du site
+SCRATCH_DIR = os.path.join(CACHE_DIR, "audio", "chapters")
+
+# Synthèses simultanées au maximum (les services en ligne limitent le débit)
+DEFAULT_CONCURRENCY = 3
+
+
+def is_site_dir(directory):
+    return os.path.abspath(directory) == os.path.abspath(OUTPUT_DIR)
+
+
+def chapter_file(chapter_num, backend, output_dir=OUTPUT_DIR):
+    """Fichier audio d'un chapitre (un WAV n'est jamais écrit dans le dossier du site)"""
+    if backend.extension != 'mp3' and is_site_dir(output_dir):
+        output_dir = SCRATCH_DIR
+    return os.path.join(output_dir, f"chapter_{chapter_num}.{backend.extension}")
+
+
+async def generate_chapter(backends, cache, semaphore, chapter_num, text, force=False, output_dir=OUTPUT_DIR):
+    """
+    Synthétise un chapitre si son texte (ou le moteur préféré) a changé ;
+    en cas d'échec, les moteurs suivants de `backends` sont essayés.
+    Retourne son statut.
+    """
+    preferred = chapter_file(chapter_num, backends[0], output_dir)
+    if not force and cache.is_fresh(preferred, audio_key(text, backends[0])):
+        return chapter_num, 'cached', preferred
+
+    async with semaphore:
+        print(f"⏳ Génération du chapitre {chapter_num}...", flush=True)
+        try:
+            backend, output_file = await synthesize_with_fallback(
+                backends, text, lambda backend: chapter_file(chapter_num, backend, output_dir)
+            )
+        except TTSError as e:
+            print(f"❌ Chapitre {chapter_num}: {e}")
+            return chapter_num, 'failed', preferred
+
+    # Un fichier produit par un moteur de repli a sa propre clé : il sera
+    # régénéré avec le moteur préféré dès que celui-ci fonctionnera
+    cache.record(output_file, audio_key(text, backend))
+    size = os.path.getsize(output_file) / 1024  # KB
+    fallback = f", repli sur {backend.name}" if backend is not backends[0] else ""
+    print(f"✅ Chapitre {chapter_num} ({size:.1f} KB{fallback})")
+    return chapter_num, 'generated', output_file
+
+
+async def generate_chapters(backends, texts=CHAPTER_TEXTS, concurrency=DEFAULT_CONCURRENCY, force=False,
+                            output_dir=OUTPUT_DIR):
+    """Génère les chapitres en parallèle (au plus `concurrency` synthèses à la fois)"""
+    cache = AudioCache.load()
+    semaphore = asyncio.Semaphore(concurrency)
     try:
-        import edge_tts
-
-        # Voix françaises féminines disponibles avec edge-tts
-        # fr-FR-DeniseNeural est une voix féminine douce et chaleureuse
-        VOICE = "fr-FR-DeniseNeural"
-
-        print(f"🎙️ Utilisation de la voix: {VOICE}")
-        print(f"📁 Dossier de sortie: {OUTPUT_DIR}")
-        print("-" * 50)
-
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-        for chapter_num, text in CHAPTER_TEXTS.items():
-            output_file = os.path.join(OUTPUT_DIR, f"chapter_{chapter_num}.mp3")
-            print(f"⏳ Génération du chapitre {chapter_num}...", end=" ", flush=True)
-
-            communicate = edge_tts.Communicate(text, VOICE)
-            await communicate.save(output_file)
-
-            # Vérifier la taille du fichier
-            size = os.path.getsize(output_file) / 1024  # KB
-            print(f"✅ ({size:.1f} KB)")
-
-        print("-" * 50)
-        print("🎉 Tous les fichiers audio ont été générés avec succès !")
-        return True
-
-    except ImportError:
-        print("❌ edge-tts non disponible, utilisation de gTTS...")
-        return False
-    except Exception as e:
-        print(f"❌ Erreur edge-tts: {e}")
-        return False
-
+        results = await asyncio.gather(*(
+            generate_chapter(backends, cache, semaphore, chapter_num, text, force, output_dir)
+            for chapter_num, text in texts.items()
+        ))
+    finally:
+        # Les chapitres réussis restent en cache même si un autre a échoué
+        cache.save()
+    return results
+
+
+def packageable(output_file):
+    """Audio du dossier du site ; sans ffmpeg, seuls les MP3 peuvent être découpés (pas de réencodage)"""
+    return (is_site_dir(os.path.dirname(output_file)) and os.path.exists(output_file)
+            and (output_file.endswith('.mp3') or ffmpeg_available()))
+
+
+async def package_chapters(results, force=False):
+    """Découpe en segments les audios de chapitres du site ; retourne {chapitre: playlist ou None}"""
+    url_prefix = "assets/audio/chapters/"
+
+    async def package(chapter_num, output_file):
+        try:
+            return chapter_num, await asyncio.to_thread(package_audio, output_file, url_prefix, force)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"❌ Segments du chapitre {chapter_num}: {e}")
+            return chapter_num, False
+
+    packaged = await asyncio.gather(*(
+        package(chapter_num, output_file)
+        for chapter_num, status, output_file in results
+        if status != 'failed' and packageable(output_file)
+    ))
+    return dict(packaged)
+
+
+@instrumented("generate_chapter_audio")
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génération des fichiers audio des chapitres")
+    parser.add_argument('--backend', default='auto', choices=['auto', *BACKENDS],
+                        help="moteur TTS (défaut: auto = edge-tts, puis gTTS, puis espeak-ng)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"synthèses simultanées (défaut: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--force', action='store_true', help="régénère tous les chapitres")
+    parser.add_argument('--no-package', action='store_true',
+                        help="ne découpe pas les audios en segments (lecture progressive)")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help="dossier des audios (défaut: assets/audio/chapters, "
+                             "ou .build-cache/audio/chapters pour un moteur WAV)")
+    args = parser.parse_args(argv)
 
-def generate_with_gtts():
-    """Génère les fichiers audio avec gTTS (Google TTS) en fallback"""
-    try:
-        from gtts import gTTS
-
-        print("🎙️ Utilisation de Google TTS (gTTS)")
-        print(f"📁 Dossier de sortie: {OUTPUT_DIR}")
-        print("-" * 50)
-
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-        for chapter_num, text in CHAPTER_TEXTS.items():
-            output_file = os.path.join(OUTPUT_DIR, f"chapter_{chapter_num}.mp3")
-            print(f"⏳ Génération du chapitre {chapter_num}...", end=" ", flush=True)
-
-            tts = gTTS(text=text, lang='fr', slow=False)
-            tts.save(output_file)
-
-            # Vérifier la taille du fichier
-            size = os.path.getsize(output_file) / 1024  # KB
-            print(f"✅ ({size:.1f} KB)")
-
-        print("-" * 50)
-        print("🎉 Tous les fichiers audio ont été générés avec succès !")
-        return True
-
-    except ImportError:
-        print("❌ gTTS non disponible")
-        return False
-    except Exception as e:
-        print(f"❌ Erreur gTTS: {e}")
-        return False
-
-
-async def main():
     print("=" * 50)
     print("🔊 GÉNÉRATION DES FICHIERS AUDIO DES CHAPITRES")
     print("   Quantum Quiz - PHY321")
     print("=" * 50)
     print()
 
-    # Essayer d'abord edge-tts (meilleure qualité)
-    success = await generate_with_edge_tts()
-
-    # Si edge-tts échoue, utiliser gTTS
-    if not success:
-        success = generate_with_gtts()
-
-    if not success:
-        print("❌ Impossible de générer les fichiers audio.")
-        print("   Installez edge-tts ou gTTS: pip install edge-tts gTTS")
+    try:
+        backends = get_backends(args.backend)
+    except TTSError as e:
+        print(f"❌ {e}")
         sys.exit(1)
 
-    print()
-    print("📂 Fichiers générés dans:", OUTPUT_DIR)
+    settings = ', '.join(f"{k}={v}" for k, v in backends[0].settings().items())
+    print(f"🎙️ Moteur: {backends[0].name} ({settings})")
+    if len(backends) > 1:
+        print(f"🛟 Repli en cas d'échec: {', '.join(backend.name for backend in backends[1:])}")
+    output_dir = os.path.dirname(chapter_file(1, backends[0], args.output_dir))
+    print(f"📁 Dossier de sortie: {output_dir}")
+    print("-" * 50)
+
+    results = await generate_chapters(backends, concurrency=args.concurrency, force=args.force,
+                                      output_dir=args.output_dir)
+    statuses = [status for _, status, _ in results]
+
+    print("-" * 50)
+    print(f"🎉 {statuses.count('generated')} chapitre(s) généré(s), "
+          f"{statuses.count('cached')} inchangé(s), {statuses.count('failed')} échec(s)")
     print()
 
-    # Lister les fichiers générés
-    files = sorted(os.listdir(OUTPUT_DIR))
-    print("📋 Fichiers générés:")
-    for f in files:
-        filepath = os.path.join(OUTPUT_DIR, f)
-        size = os.path.getsize(filepath) / 1024
-        print(f"   - {f} ({size:.1f} KB)")
+    # Lister les fichiers des chapitres
+    print("📋 Fichiers des chapitres:")
+    for chapter_num, status, output_file in results:
+        if os.path.exists(output_file):
+            size = os.path.getsize(output_file) / 1024
+            print(f"   - {os.path.basename(output_file)} ({size:.1f} KB){' ✨' if status == 'generated' else ''}")
+
+    packaged = {}
+    if not args.no_package:
+        print()
+        if not ffmpeg_available():
+            print("⚠️  ffmpeg non installé - segments au débit d'origine uniquement (pas de bas débit)")
+        outside = [os.path.basename(output_file) for _, status, output_file in results
+                   if status != 'failed' and not is_site_dir(os.path.dirname(output_file))]
+        if outside:
+            print(f"ℹ️  {len(outside)} audio(s) hors du dossier du site, non découpé(s)")
+        with phase('transform'):
+            packaged = await package_chapters(results, force=args.force)
+        for chapter_num, playlist in sorted(packaged.items()):
+            if playlist:
+                renditions = ', '.join(f"{r['name']} {r['bitrate']} kb/s" for r in playlist['renditions'])
+                segments = len(playlist['renditions'][0]['segments'])
+                print(f"   🎚️ Chapitre {chapter_num}: {playlist['duration']:.1f} s, "
+                      f"{segments} segments ({renditions})")
+        done = sum(1 for playlist in packaged.values() if playlist)
+        fresh = sum(1 for playlist in packaged.values() if playlist is None)
+        print(f"📦 {done} chapitre(s) découpé(s), {fresh} déjà à jour")
+
+    if 'failed' in statuses or False in packaged.values():
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -4,10 +4,13 @@ Script de génération de questions pour Quantum Quiz PHY321
 Génère ~100 questions par chapitre (total ~600)
 """
 
-import json
 import random
 from pathlib import Path
 
+from bank_ids import IdAllocator
+from bank_io import edit_bank
+from bank_profile import instrumented
+
 # Templates de questions par chapitre
 CHAPTER_TEMPLATES = {
     1: {  # États Quantiques
@@ -222,8 +225,8 @@ CHAPTER_TEMPLATES = {
     }
 }
 
-def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
-    """Génère des questions pour un chapitre donné"""
+def generate_questions_for_chapter(chapter_num, allocator, target_count=100):
+    """Génère des questions pour un chapitre donné (IDs attribués par `allocator`)"""
     templates = CHAPTER_TEMPLATES.get(chapter_num, {})
     questions = []
 
@@ -239,7 +242,7 @@ def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
             q = random.choice(qcm_base).copy()
 
         questions.append({
-            "id": f"ch{chapter_num}-q{start_id + len(questions):03d}",
+            "id": allocator.allocate(chapter_num, "qcm"),
             "type": "qcm",
             "difficulty": difficulties[i % 3],
             "question": q['question'],
@@ -271,7 +274,7 @@ def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
             }
 
         questions.append({
-            "id": f"ch{chapter_num}-q{start_id + len(questions):03d}",
+            "id": allocator.allocate(chapter_num, "vrai_faux"),
             "type": "vrai_faux",
             "difficulty": difficulties[i % 3],
             "question": q['question'],
@@ -300,7 +303,7 @@ def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
             }
 
         questions.append({
-            "id": f"ch{chapter_num}-q{start_id + len(questions):03d}",
+            "id": allocator.allocate(chapter_num, "numerical"),
             "type": "numerical",
             "difficulty": "medium",
             "question": q['question'],
@@ -324,7 +327,7 @@ def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
         }
 
         questions.append({
-            "id": f"ch{chapter_num}-q{start_id + len(questions):03d}",
+            "id": allocator.allocate(chapter_num, "qcm"),
             "type": "qcm",
             "difficulty": random.choice(difficulties),
             "question": q['question'],
@@ -342,58 +345,51 @@ def generate_questions_for_chapter(chapter_num, start_id, target_count=100):
 
     return questions[:target_count]
 
+@instrumented("generate_questions")
 def main():
     print("🚀 Génération de questions pour Quantum Quiz PHY321")
     print("=" * 60)
 
-    # Charger le fichier existant
+    # Charger le fichier existant ; il est réécrit atomiquement, sous verrou,
+    # à la sortie du bloc (une interruption laisse la version précédente intacte)
     json_path = Path("data/questions.json")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Backup
-    backup_path = Path("data/questions_backup.json")
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"✅ Backup créé: {backup_path}")
-
-    # Compter les questions existantes
-    existing_counts = {}
-    for chapter in data['chapters']:
-        ch_num = chapter['chapter_number']
-        existing_counts[ch_num] = len(chapter['questions'])
-        print(f"📊 Chapitre {ch_num}: {existing_counts[ch_num]} questions existantes")
-
-    print("\n🔄 Génération de nouvelles questions...")
+    with edit_bank(json_path) as data:
+        # Compter les questions existantes
+        existing_counts = {}
+        for chapter in data['chapters']:
+            ch_num = chapter['chapter_number']
+            existing_counts[ch_num] = len(chapter['questions'])
+            print(f"📊 Chapitre {ch_num}: {existing_counts[ch_num]} questions existantes")
 
-    # Générer et ajouter les questions
-    total_generated = 0
-    for chapter in data['chapters']:
-        ch_num = int(chapter['chapter_number'])
-        existing_count = len(chapter['questions'])
-        target_total = 100
-        to_generate = max(0, target_total - existing_count)
+        print("\n🔄 Génération de nouvelles questions...")
 
-        if to_generate > 0:
-            print(f"\n📝 Chapitre {ch_num}: génération de {to_generate} questions...")
-            new_questions = generate_questions_for_chapter(
-                ch_num,
-                existing_count + 1,
-                to_generate
-            )
-            chapter['questions'].extend(new_questions)
-            total_generated += len(new_questions)
-            print(f"   ✓ {len(new_questions)} questions générées")
-        else:
-            print(f"\n✓ Chapitre {ch_num}: déjà complet ({existing_count} questions)")
+        # Générer et ajouter les questions ; les IDs viennent des compteurs
+        # persistés (un ID déjà utilisé n'est jamais réattribué)
+        allocator = IdAllocator.load(data)
+        total_generated = 0
+        for chapter in data['chapters']:
+            ch_num = int(chapter['chapter_number'])
+            existing_count = len(chapter['questions'])
+            target_total = 100
+            to_generate = max(0, target_total - existing_count)
 
-    # Mettre à jour les métadonnées
-    total_questions = sum(len(ch['questions']) for ch in data['chapters'])
-    data['course_info']['total_questions'] = total_questions
+            if to_generate > 0:
+                print(f"\n📝 Chapitre {ch_num}: génération de {to_generate} questions...")
+                new_questions = generate_questions_for_chapter(
+                    ch_num,
+                    allocator,
+                    to_generate
+                )
+                chapter['questions'].extend(new_questions)
+                total_generated += len(new_questions)
+                print(f"   ✓ {len(new_questions)} questions générées")
+            else:
+                print(f"\n✓ Chapitre {ch_num}: déjà complet ({existing_count} questions)")
 
-    # Sauvegarder
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        # Mettre à jour les métadonnées
+        total_questions = sum(len(ch['questions']) for ch in data['chapters'])
+        data['course_info']['total_questions'] = total_questions
+        allocator.save()
 
     print("\n" + "=" * 60)
     print("✅ GÉNÉRATION TERMINÉE")
@@ -405,7 +401,6 @@ def main():
         count = len(chapter['questions'])
         print(f"   Chapitre {ch_num}: {count} questions")
     print(f"\n💾 Fichier sauvegardé: {json_path}")
-    print(f"🔒 Backup disponible: {backup_path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Dimensions des images lues dans leur en-tête, sans décoder les pixels
+
+    PNG     chunk IHDR (24 premiers octets)
+    JPEG    premier segment SOFn
+    WebP    en-tête VP8 / VP8L / VP8X
+    SVG     viewBox de l'élément racine (sinon width/height)
+
+Quelques centaines d'octets suffisent par image : probe_images() lit toutes
+les images d'une liste en parallèle (threads, le travail est surtout de
+l'attente disque).
+"""
+
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Octets lus au maximum pour trouver l'élément <svg> (commentaires, DOCTYPE...)
+SVG_HEAD_BYTES = 64 * 1024
+# Taille des blocs lus pour parcourir les segments JPEG
+JPEG_CHUNK = 4096
+PROBE_WORKERS = 16
+
+SVG_ROOT_PATTERN = re.compile(rb"<svg\b[^>]*>", re.IGNORECASE | re.DOTALL)
+SVG_ATTRIBUTE_PATTERN = r"""\b{}\s*=\s*["']([^"']*)["']"""
+SVG_LENGTH_PATTERN = re.compile(r"^\s*([0-9.]+)\s*(px)?\s*$")
+
+# Marqueurs SOFn (C4 = DHT, C8 = JPG, CC = DAC ne sont pas des SOF)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ImageProbeError(ValueError):
+    """En-tête d'image absent, tronqué ou d'un format non reconnu"""
+
+
+def probe_png(f):
+    header = f.read(24)
+    if len(header) < 24 or header[12:16] != b'IHDR':
+        raise ImageProbeError("en-tête PNG tronqué")
+    return struct.unpack('>II', header[16:24])
+
+
+def probe_jpeg(f):
+    f.seek(2)
+    data = b''
+    pos = 0
+    while True:
+        # Lit de quoi décoder l'en-tête de segment courant (marqueur + longueur + SOF)
+        while len(data) - pos < 9:
+            chunk = f.read(JPEG_CHUNK)
+            if not chunk:
+                raise ImageProbeError("segment SOF introuvable")
+            data = data[pos:] + chunk
+            pos = 0
+        if data[pos] != 0xFF:
+            raise ImageProbeError("marqueur JPEG invalide")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # octet de remplissage
+            pos += 1
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # marqueurs sans longueur
+            pos += 2
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        skip = pos + 2 + length - len(data)
+        if skip > 0:
+            # Segment plus long que le tampon (ex: miniature EXIF) : saut direct
+            f.seek(skip, 1)
+            data, pos = b'', 0
+        else:
+            pos += 2 + length
+
+
+def probe_webp(f):
+    header = f.read(30)
+    if len(header) < 30:
+        raise ImageProbeError("en-tête WebP tronqué")
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    raise ImageProbeError(f"bloc WebP inconnu {chunk!r}")
+
+
+def svg_length(value):
+    match = SVG_LENGTH_PATTERN.match(value or '')
+    return float(match.group(1)) if match else None
+
+
+def probe_svg(f):
+    head = f.read(SVG_HEAD_BYTES)
+    match = SVG_ROOT_PATTERN.search(head)
+    if match is None:
+        raise ImageProbeError("élément <svg> introuvable")
+    tag = match.group(0).decode('utf-8', 'replace')
+
+    def attribute(name):
+        found = re.search(SVG_ATTRIBUTE_PATTERN.format(name), tag)
+        return found.group(1) if found else None
+
+    view_box = attribute('viewBox')
+    if view_box:
+        values = [float(v) for v in re.split(r"[\s,]+", view_box.strip())]
+        if len(values) == 4:
+            return values[2], values[3]
+    width, height = svg_length(attribute('width')), svg_length(attribute('height'))
+    if width is None or height is None:
+        raise ImageProbeError("SVG sans viewBox ni width/height en pixels")
+    return width, height
+
+
+def probe_image(path):
+    """(largeur, hauteur) d'une image, lue dans son en-tête ; lève ImageProbeError"""
+    with open(path, 'rb') as f:
+        magic = f.read(16)
+        f.seek(0)
+        if magic.startswith(b'\x89PNG\r\n\x1a\n'):
+            size = probe_png(f)
+        elif magic.startswith(b'\xff\xd8'):
+            size = probe_jpeg(f)
+        elif magic.startswith(b'RIFF') and magic[8:12] == b'WEBP':
+            size = probe_webp(f)
+        elif Path(path).suffix.lower() == '.svg' or b'<' in magic:
+            size = probe_svg(f)
+        else:
+            raise ImageProbeError("format d'image non reconnu")
+    # Les dimensions entières restent des int (viewBox="0 0 600 400" -> 600, 400)
+    return tuple(int(v) if float(v).is_integer() else v for v in size)
+
+
+def _probe_or_error(path):
+    try:
+        return probe_image(path)
+    except (OSError, ImageProbeError, struct.error) as e:
+        return e
+
+
+def probe_images(paths, workers=PROBE_WORKERS):
+    """
+    Sonde toutes les images en parallèle.
+    Retourne {chemin: (largeur, hauteur)} et {chemin: exception} pour les échecs.
+    """
+    paths = list(dict.fromkeys(paths))
+    sizes = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, result in zip(paths, pool.map(_probe_or_error, paths)):
+            if isinstance(result, Exception):
+                errors[path] = result
+            else:
+                sizes[path] = result
+    return sizes, errors
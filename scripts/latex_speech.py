@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Conversion du texte des questions (HTML + LaTeX) en français prononçable
+
+    \\frac{h}{p}              ->  h sur p
+    |\\psi\\rangle, \\ket{\\psi}  ->  ket psi
+    \\langle a|b \\rangle      ->  produit scalaire de a et b
+    \\hat{H}^\\dagger          ->  H chapeau dague
+    E = mc^2                 ->  E égale m c au carré
+    \\begin{pmatrix}0&1\\\\1&0\\end{pmatrix}  ->  matrice 0, 1; 1, 0
+
+Les balises HTML sont retirées, les fragments TeX ($...$, \\(...\\)...) sont
+lus symbole par symbole ; une commande inconnue est ignorée (ses arguments
+sont lus). Les noms d'environnements (\\begin{...}) ne sont pas lus : une
+matrice est annoncée, ses cellules séparées par des virgules et ses lignes
+par des points-virgules.
+"""
+
+import html
+import re
+
+from prerender_math import expand_macros, fragments
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+SPACE_PATTERN = re.compile(r"\s+")
+TOKEN_PATTERN = re.compile(r"\\[A-Za-z]+|\\.|\d+(?:[.,]\d+)?|[{}^_]|\s+|.")
+
+# Notation de Dirac, réécrite en commandes avant la lecture
+DIRAC_REWRITES = [
+    (re.compile(r"\\left|\\right|\\middle|\\big[lr]?|\\Big[lr]?"), ''),
+    (re.compile(r"\\langle([^|]*?)\|([^|]*?)\|([^|]*?)\\rangle"), r" \\speechelement{\1}{\2}{\3} "),
+    (re.compile(r"\\langle([^|{}]*?)\|([^|{}]*?)\\rangle"), r" \\speechbraket{\1}{\2} "),
+    (re.compile(r"\|([^|{}]*?)\\rangle"), r" \\speechket{\1} "),
+    (re.compile(r"\\langle([^|{}]*?)\|"), r" \\speechbra{\1} "),
+    (re.compile(r"\\langle(.*?)\\rangle"), r" \\speechmean{\1} "),
+    (re.compile(r"\|([^|]+?)\|"), r" \\speechabs{\1} "),
+]
+
+# Commandes à arguments : nom -> (nombre d'arguments, gabarit)
+ARGUMENT_COMMANDS = {
+    'frac': (2, "{0} sur {1}"),
+    'dfrac': (2, "{0} sur {1}"),
+    'tfrac': (2, "{0} sur {1}"),
+    'sqrt': (1, "racine de {0}"),
+    'hat': (1, "{0} chapeau"),
+    'vec': (1, "vecteur {0}"),
+    'bar': (1, "{0} barre"),
+    'overline': (1, "{0} barre"),
+    'dot': (1, "{0} point"),
+    'ddot': (1, "{0} point point"),
+    'tilde': (1, "{0} tilde"),
+    'speechket': (1, "ket {0}"),
+    'speechbra': (1, "bra {0}"),
+    'speechbraket': (2, "produit scalaire de {0} et {1}"),
+    'speechelement': (3, "élément de matrice de {1} entre {0} et {2}"),
+    'speechmean': (1, "valeur moyenne de {0}"),
+    'speechabs': (1, "module de {0}"),
+}
+
+# Environnements annoncés par \begin (les autres sont lus sans annonce),
+# et nombre d'arguments supplémentaires à ignorer (\begin{array}{cc})
+MATRIX_ENVIRONMENTS = {'matrix', 'pmatrix', 'bmatrix', 'Bmatrix', 'vmatrix', 'Vmatrix', 'smallmatrix'}
+ENVIRONMENT_ARGUMENTS = {'array': 1}
+
+# Commandes dont seul l'argument est lu
+TRANSPARENT_COMMANDS = {'text', 'mathrm', 'mathbf', 'mathit', 'mathcal', 'mathbb', 'operatorname', 'boldsymbol'}
+
+SYMBOLS = {
+    'alpha': 'alpha', 'beta': 'bêta', 'gamma': 'gamma', 'Gamma': 'grand gamma', 'delta': 'delta',
+    'Delta': 'delta', 'epsilon': 'epsilon', 'varepsilon': 'epsilon', 'zeta': 'zêta', 'eta': 'êta',
+    'theta': 'thêta', 'Theta': 'grand thêta', 'kappa': 'kappa', 'lambda': 'lambda', 'Lambda': 'grand lambda',
+    'mu': 'mu', 'nu': 'nu', 'xi': 'ksi', 'pi': 'pi', 'Pi': 'grand pi', 'rho': 'rhô', 'sigma': 'sigma',
+    'Sigma': 'grand sigma', 'tau': 'tau', 'phi': 'phi', 'varphi': 'phi', 'Phi': 'grand phi', 'chi': 'khi',
+    'psi': 'psi', 'Psi': 'grand psi', 'omega': 'oméga', 'Omega': 'grand oméga',
+    'hbar': 'h barre', 'infty': "l'infini", 'partial': 'd rond', 'nabla': 'nabla',
+    'times': 'fois', 'cdot': 'fois', 'pm': 'plus ou moins', 'mp': 'moins ou plus',
+    'leq': 'inférieur ou égal à', 'le': 'inférieur ou égal à', 'geq': 'supérieur ou égal à',
+    'ge': 'supérieur ou égal à', 'neq': 'différent de', 'approx': 'environ égal à', 'sim': 'de l\'ordre de',
+    'equiv': 'équivalent à', 'propto': 'proportionnel à', 'to': 'tend vers', 'rightarrow': 'donne',
+    'Rightarrow': 'implique', 'leftrightarrow': 'équivaut à', 'in': 'appartient à',
+    'int': 'intégrale de', 'oint': 'intégrale de', 'sum': 'somme de', 'prod': 'produit de',
+    'otimes': 'produit tensoriel', 'oplus': 'somme directe', 'dagger': 'dague', 'ast': 'étoile',
+    'exp': 'exponentielle', 'ln': 'logarithme de', 'log': 'logarithme de', 'sin': 'sinus',
+    'cos': 'cosinus', 'tan': 'tangente', 'det': 'déterminant de', 'Tr': 'trace de', 'min': 'minimum',
+    'max': 'maximum', 'lim': 'limite', 'cdots': 'etc', 'ldots': 'etc', 'dots': 'etc',
+    'langle': '', 'rangle': '', 'quad': '', 'qquad': '', ',': '', ';': '', '!': '', ' ': '',
+    # \\ : fin de ligne d'une matrice ou d'un environnement aligné
+    '\\': ';',
+}
+
+OPERATORS = {
+    '=': 'égale', '+': 'plus', '-': 'moins', '/': 'sur', '<': 'inférieur à', '>': 'supérieur à',
+    '*': 'étoile', "'": 'prime', '!': 'factorielle', '&': ',',
+}
+
+POWERS = {'2': 'au carré', '3': 'au cube', '-1': 'inverse', 'dague': 'dague', 'étoile': 'étoile',
+          'prime': 'prime', 'T': 'transposée'}
+
+
+class _Reader:
+    def __init__(self, tex):
+        self.tokens = [t for t in TOKEN_PATTERN.findall(tex) if not t.isspace()]
+        self.pos = 0
+
+    def next(self):
+        token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        self.pos += 1
+        return token
+
+    def argument(self):
+        """Argument d'une commande : groupe {…} ou un seul jeton"""
+        token = self.next()
+        if token is None:
+            return ''
+        if token == '{':
+            return self.sequence(stop='}')
+        return self.sequence_of([token])
+
+    def raw_argument(self):
+        """Texte brut d'un groupe {…} (nom d'environnement), sans le lire"""
+        if self.pos >= len(self.tokens) or self.tokens[self.pos] != '{':
+            return ''
+        self.pos += 1
+        raw = []
+        while True:
+            token = self.next()
+            if token in ('}', None):
+                return ''.join(raw)
+            raw.append(token)
+
+    def sequence_of(self, tokens):
+        sub = _Reader('')
+        sub.tokens = tokens
+        return sub.sequence()
+
+    def sequence(self, stop=None):
+        words = []
+        while True:
+            token = self.next()
+            if token is None or token == stop:
+                return ' '.join(w for w in words if w)
+            words.append(self.word(token))
+
+    def word(self, token):
+        if token == '{':
+            return self.sequence(stop='}')
+        if token == '}':
+            return ''
+        if token == '^':
+            exponent = self.argument()
+            return POWERS.get(exponent, f"puissance {exponent}")
+        if token == '_':
+            return self.argument()
+        if token.startswith('\\'):
+            name = token[1:]
+            if name in ('begin', 'end'):
+                environment = self.raw_argument()
+                is_matrix = environment.rstrip('*') in MATRIX_ENVIRONMENTS
+                if name == 'end':
+                    # Pause après la dernière cellule
+                    return ',' if is_matrix else ''
+                for _ in range(ENVIRONMENT_ARGUMENTS.get(environment, 0)):
+                    self.raw_argument()
+                return 'matrice' if is_matrix else ''
+            if name in ARGUMENT_COMMANDS:
+                arity, template = ARGUMENT_COMMANDS[name]
+                if name == 'sqrt' and self.pos < len(self.tokens) and self.tokens[self.pos] == '[':
+                    # \sqrt[n]{x} : l'indice est ignoré
+                    while self.next() not in (']', None):
+                        pass
+                return template.format(*(self.argument() for _ in range(arity)))
+            if name in TRANSPARENT_COMMANDS:
+                return self.argument()
+            return SYMBOLS.get(name, '')
+        if token[0].isdigit():
+            return token.replace('.', ',')
+        return OPERATORS.get(token, token if token.isalnum() else '')
+
+
+def tex_to_speech(tex):
+    """Lecture en français d'un fragment TeX (sans délimiteurs)"""
+    tex = expand_macros(tex)
+    for pattern, replacement in DIRAC_REWRITES:
+        tex = pattern.sub(replacement, tex)
+    spoken = SPACE_PATTERN.sub(' ', _Reader(tex).sequence()).strip()
+    return re.sub(r"\s+([,;])", r"\1", spoken).rstrip(',;')
+
+
+def text_to_speech(text):
+    """Texte d'un champ de question (HTML + TeX) prêt pour la synthèse vocale"""
+    out = []
+    pos = 0
+    for start, end, tex, _ in fragments(text):
+        out.append(text[pos:start])
+        out.append(f" {tex_to_speech(tex)} ")
+        pos = end
+    out.append(text[pos:])
+    spoken = html.unescape(TAG_PATTERN.sub(' ', ''.join(out)))
+    spoken = SPACE_PATTERN.sub(' ', spoken)
+    spoken = re.sub(r"\s+([,.)])", r"\1", re.sub(r"\(\s+", "(", spoken))
+    return spoken.strip()
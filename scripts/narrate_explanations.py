@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Narration des explications des questions (lecture à voix haute)
+
+Chaque explication est convertie en français prononçable (HTML retiré,
+LaTeX lu : scripts/latex_speech.py) puis synthétisée avec un moteur de
+scripts/tts_backends.py. Les fichiers sont nommés d'après le hash du texte
+prononcé, du moteur et de ses réglages :
+
+    assets/audio/explanations/<hash>.<ext>        un fichier par texte distinct
+    assets/audio/explanations/manifest.json       question -> fichier audio
+
+Le site (js/results.js, révision des réponses) ne lit que des MP3 : les
+moteurs qui produisent du WAV (espeak, stub) écrivent fichiers et
+manifeste dans .build-cache/audio/explanations, sauf --output-dir
+explicite. Un fichier WAV d'un moteur de repli n'est jamais écrit dans le
+dossier du site, ni publié dans son manifeste.
+
+Deux explications identiques partagent le même fichier. Un fichier présent
+est complet (écriture atomique) : une exécution interrompue reprend là où
+elle s'était arrêtée, et une nouvelle exécution ne synthétise que les
+explications modifiées. Avec --backend auto, un texte dont la synthèse
+échoue est réessayé avec le moteur installé suivant (son fichier porte
+alors le hash de ce moteur, et sera refait avec le moteur préféré).
+
+Usage :
+    python3 scripts/narrate_explanations.py [--backend auto|edge|gtts|espeak|stub]
+                                            [--concurrency N] [--output-dir DIR] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from bank_io import atomic_write_text, load_bank
+from bank_profile import instrumented, phase
+from bank_utils import CACHE_DIR, PROJECT_DIR
+from latex_speech import text_to_speech
+from tts_backends import BACKENDS, TTSError, audio_key, get_backends, synthesize_with_fallback
+
+# Dossier de sortie (audios servis par le site)
+OUTPUT_DIR = PROJECT_DIR / "assets" / "audio" / "explanations"
+# Audios non MP3 (le site ne les lit pas) : hors du dossier du site
+SCRATCH_DIR = CACHE_DIR / "audio" / "explanations"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+DEFAULT_CONCURRENCY = 4
+# Fréquence d'affichage de la progression (en fichiers)
+PROGRESS_EVERY = 25
+
+
+def narration_jobs(data):
+    """
+    Textes à synthétiser, dédupliqués : {texte prononcé: [IDs]}.
+    Un ID dupliqué n'est compté que pour sa première question (comme côté client).
+    """
+    jobs = defaultdict(list)
+    seen = set()
+    for chapter in data['chapters']:
+        for q in chapter['questions']:
+            explanation = q.get('explanation')
+            if not explanation or not q.get('id') or q['id'] in seen:
+                continue
+            seen.add(q['id'])
+            speech = text_to_speech(explanation)
+            if speech:
+                jobs[speech].append(q['id'])
+    return dict(jobs)
+
+
+def is_site_dir(directory):
+    return Path(directory).resolve() == OUTPUT_DIR.resolve()
+
+
+def output_dir_for(backend, output_dir=None):
+    """Dossier des fichiers et du manifeste : celui du site, sauf pour un moteur sans MP3"""
+    if output_dir is not None:
+        return Path(output_dir)
+    return OUTPUT_DIR if backend.extension == 'mp3' else SCRATCH_DIR
+
+
+def audio_path(speech, backend, output_dir=OUTPUT_DIR):
+    """Fichier audio d'un texte (un WAV n'est jamais écrit dans le dossier du site)"""
+    if backend.extension != 'mp3' and is_site_dir(output_dir):
+        output_dir = SCRATCH_DIR
+    return Path(output_dir) / f"{audio_key(speech, backend)[:20]}.{backend.extension}"
+
+
+async def narrate(backends, jobs, concurrency=DEFAULT_CONCURRENCY, output_dir=OUTPUT_DIR):
+    """
+    Synthétise les textes dont le fichier (moteur préféré) n'existe pas
+    encore. Retourne ({texte: fichier}, générés, repli, échecs).
+    """
+    files = {}
+    pending = []
+    for speech in jobs:
+        path = audio_path(speech, backends[0], output_dir)
+        if path.exists():
+            files[speech] = path
+        else:
+            pending.append(speech)
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+    fallbacks = 0
+    failed = []
+
+    async def run(speech):
+        nonlocal done, fallbacks
+        async with semaphore:
+            try:
+                backend, path = await synthesize_with_fallback(
+                    backends, speech, lambda backend: audio_path(speech, backend, output_dir)
+                )
+            except TTSError as e:
+                failed.append((speech, e))
+                return
+        files[speech] = path
+        done += 1
+        if backend is not backends[0]:
+            fallbacks += 1
+        if done % PROGRESS_EVERY == 0 or done == len(pending):
+            print(f"  ⏳ {done}/{len(pending)} fichiers synthétisés", flush=True)
+
+    print(f"🎙️ {len(jobs)} textes distincts, {len(jobs) - len(pending)} déjà synthétisés, "
+          f"{len(pending)} à synthétiser")
+    await asyncio.gather(*(run(speech) for speech in pending))
+    return files, done, fallbacks, failed
+
+
+def manifest_url(path):
+    """URL depuis la racine du site, ou nom du fichier (voisin du manifeste) hors du projet"""
+    try:
+        return path.resolve().relative_to(PROJECT_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.name
+
+
+def build_manifest(backend, jobs, files, output_dir=OUTPUT_DIR):
+    """Manifeste des fichiers du dossier de sortie (les fichiers de repli écrits ailleurs n'y figurent pas)"""
+    questions = {}
+    for speech, path in files.items():
+        if path.parent.resolve() != Path(output_dir).resolve():
+            continue
+        for q_id in jobs[speech]:
+            questions[q_id] = {
+                'url': manifest_url(path),
+                'bytes': path.stat().st_size,
+                'chars': len(speech),
+            }
+    return {
+        'version': MANIFEST_VERSION,
+        'backend': backend.name,
+        'settings': backend.settings(),
+        'files': len({entry['url'] for entry in questions.values()}),
+        'questions': dict(sorted(questions.items())),
+    }
+
+
+def remove_stale_audio(files, output_dir=OUTPUT_DIR):
+    """Supprime les fichiers qui ne correspondent plus à aucune explication"""
+    expected = set(files.values())
+    removed = 0
+    for path in Path(output_dir).iterdir():
+        if path.name != MANIFEST_NAME and path.is_file() and path not in expected:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+@instrumented("narrate_explanations")
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Narration des explications des questions")
+    parser.add_argument('--backend', default='auto', choices=['auto', *BACKENDS],
+                        help="moteur TTS (défaut: auto = edge-tts, puis gTTS, puis espeak-ng)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"synthèses simultanées (défaut: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--output-dir', type=Path,
+                        help="dossier des fichiers et du manifeste (défaut: assets/audio/explanations, "
+                             "ou .build-cache/audio/explanations pour un moteur sans MP3)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="prépare les textes sans synthétiser (affiche quelques exemples)")
+    args = parser.parse_args(argv)
+
+    print("🔊 NARRATION DES EXPLICATIONS")
+    print("=" * 50)
+
+    try:
+        backends = [] if args.dry_run else get_backends(args.backend)
+    except TTSError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    data = load_bank()
+    with phase('transform'):
+        jobs = narration_jobs(data)
+    total_ids = sum(len(ids) for ids in jobs.values())
+    print(f"📚 {total_ids} explications, {len(jobs)} textes distincts après déduplication")
+
+    if args.dry_run:
+        for speech, ids in list(jobs.items())[:5]:
+            print(f"\n  🗣️  {ids[0]}: {speech[:300]}")
+        return
+
+    output_dir = output_dir_for(backends[0], args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files, generated, fallbacks, failed = await narrate(backends, jobs, args.concurrency, output_dir)
+    for speech, error in failed[:10]:
+        print(f"  ❌ {', '.join(jobs[speech])}: {error}")
+    if fallbacks:
+        print(f"  🛟 {fallbacks} fichier(s) synthétisé(s) par un moteur de repli")
+
+    manifest = build_manifest(backends[0], jobs, files, output_dir)
+    with phase('serialize'):
+        text = json.dumps(manifest, ensure_ascii=False, indent=2)
+    manifest_file = output_dir / MANIFEST_NAME
+    atomic_write_text(manifest_file, text)
+    # Les fichiers d'un autre moteur ou d'explications modifiées ne sont retirés
+    # qu'après une exécution complète (une reprise pourrait encore en avoir besoin)
+    removed = 0 if failed else remove_stale_audio(files, output_dir)
+
+    unpublished = sum(1 for path in set(files.values()) if path.parent.resolve() != output_dir.resolve())
+    print(f"✅ {generated} fichier(s) synthétisé(s), {len(failed)} échec(s), {removed} obsolète(s) supprimé(s)")
+    if unpublished:
+        print(f"  ⚠️  {unpublished} fichier(s) WAV de repli dans {SCRATCH_DIR}, absents du manifeste")
+    print(f"📄 Manifeste: {manifest_file} ({len(manifest['questions'])} questions)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Optimisation des figures de assets/images (WebP et AVIF multi-largeurs)
+
+Chaque figure PNG/JPEG est réencodée en WebP et en AVIF à plusieurs
+largeurs (sans jamais agrandir l'original) dans un pool de processus :
+
+    assets/images/optimized/<nom>-<largeur>.<format>
+    assets/images/optimized/manifest.json    variantes par image source
+                                              (hash, dimensions, srcset,
+                                              aperçu basse qualité)
+
+Une image dont le hash source et les réglages d'encodage n'ont pas changé
+n'est pas réencodée. Chaque image reçoit aussi un aperçu (LQIP) : sa
+couleur dominante et une miniature WebP floue de quelques dizaines de
+pixels en data URI (~100-200 octets), affichées tant que l'image complète
+n'est pas arrivée.
+
+data/questions.json n'est pas modifié : les variantes ne vivent que dans
+le manifeste. Le compilateur (bank_compiler.py) les ajoute aux fichiers
+publiés (questions.min.json, fragments...) avec attach_image_fields() :
+les questions dont image_url pointe vers une image optimisée y reçoivent
+image_variants, utilisable tel quel dans un élément <picture> (voir
+createResponsiveImage dans js/utils.js), et image_placeholder. image_url
+reste l'image d'origine, servie aux navigateurs sans WebP.
+
+Usage :
+    python3 scripts/optimize_images.py [--force] [--workers N]
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bank_io import atomic_write_bytes, atomic_write_text
+from bank_profile import instrumented, phase
+from bank_utils import PROJECT_DIR, bytes_hash, content_hash
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+IMAGES_DIR = PROJECT_DIR / "assets" / "images"
+OPTIMIZED_DIR = IMAGES_DIR / "optimized"
+MANIFEST_FILE = OPTIMIZED_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+SOURCE_SUFFIXES = {'.png', '.jpg', '.jpeg'}
+
+# Largeurs des variantes (la largeur d'origine remplace celles qui la dépassent)
+WIDTHS = [320, 640, 960, 1280]
+
+# Format -> (type MIME, options d'encodage Pillow). Ordre = préférence du navigateur.
+FORMATS = {
+    'avif': ('image/avif', {'quality': 55, 'speed': 6}),
+    'webp': ('image/webp', {'quality': 80, 'method': 6}),
+}
+
+# Aperçu : plus grand côté de la miniature, qualité WebP, taille de l'échantillon
+# utilisé pour la couleur dominante
+PLACEHOLDER_SIZE = 24
+PLACEHOLDER_QUALITY = 30
+DOMINANT_SAMPLE = 64
+DOMINANT_COLORS = 5
+
+
+def available_formats():
+    """Formats pris en charge par le Pillow installé (AVIF : Pillow >= 11.2)"""
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def target_widths(width):
+    return sorted({w for w in WIDTHS if w < width} | {min(width, WIDTHS[-1])})
+
+
+def encoding_settings(formats):
+    """Réglages qui, s'ils changent, imposent de réencoder toutes les images"""
+    return content_hash({
+        'widths': WIDTHS,
+        'formats': {fmt: FORMATS[fmt][1] for fmt in formats},
+        'placeholder': [PLACEHOLDER_SIZE, PLACEHOLDER_QUALITY, DOMINANT_SAMPLE, DOMINANT_COLORS],
+        'pillow': Image.__version__,
+    })
+
+
+def project_url(path):
+    return Path(path).resolve().relative_to(PROJECT_DIR).as_posix()
+
+
+def variant_path(source, width, fmt):
+    relative = Path(source).resolve().relative_to(IMAGES_DIR)
+    return OPTIMIZED_DIR / relative.parent / f"{relative.stem}-{width}.{fmt}"
+
+
+def flatten(im):
+    """Image RVB ; la transparence est rendue sur fond blanc (fond des pages de quiz)"""
+    if im.mode != 'RGBA':
+        return im.convert('RGB')
+    background = Image.new('RGBA', im.size, (255, 255, 255, 255))
+    background.alpha_composite(im)
+    return background.convert('RGB')
+
+
+def dominant_color(im):
+    """Couleur la plus fréquente après quantification en quelques couleurs (#rrggbb)"""
+    sample = flatten(im).resize((DOMINANT_SAMPLE, DOMINANT_SAMPLE), Image.BILINEAR)
+    palette_image = sample.quantize(colors=DOMINANT_COLORS)
+    _, index = max(palette_image.getcolors())
+    r, g, b = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def placeholder(im):
+    """Aperçu basse qualité : {'color': '#rrggbb', 'thumbnail': data URI WebP}"""
+    thumbnail = flatten(im)
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.LANCZOS)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return {
+        'color': dominant_color(im),
+        'thumbnail': "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode('ascii'),
+    }
+
+
+def encode_image(job):
+    """
+    Encode toutes les variantes d'une image (exécuté dans un processus du pool).
+    Retourne l'entrée du manifeste de l'image.
+    """
+    source, digest, formats = job
+    with Image.open(source) as im:
+        im.load()
+        width, height = im.size
+        has_alpha = im.mode in ('RGBA', 'LA', 'PA') or 'transparency' in im.info
+        im = im.convert('RGBA' if has_alpha else 'RGB')
+
+        variants = []
+        for target in target_widths(width):
+            resized = im if target == width else im.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS)
+            for fmt in formats:
+                buffer = io.BytesIO()
+                resized.save(buffer, fmt.upper(), **FORMATS[fmt][1])
+                path = variant_path(source, target, fmt)
+                atomic_write_bytes(path, buffer.getvalue())
+                variants.append({
+                    'format': fmt,
+                    'width': target,
+                    'url': project_url(path),
+                    'bytes': buffer.tell(),
+                })
+        preview = placeholder(im)
+
+    return {
+        'sha256': digest,
+        'width': width,
+        'height': height,
+        'bytes': Path(source).stat().st_size,
+        'variants': variants,
+        'placeholder': preview,
+    }
+
+
+def srcset_sources(entry):
+    """Éléments <source> d'une image : [{type, srcset}] dans l'ordre de préférence"""
+    sources = []
+    for fmt, (mime, _) in FORMATS.items():
+        candidates = [v for v in entry['variants'] if v['format'] == fmt]
+        if candidates:
+            srcset = ', '.join(f"{v['url']} {v['width']}w" for v in candidates)
+            sources.append({'type': mime, 'srcset': srcset})
+    return sources
+
+
+def load_manifest(path=MANIFEST_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def image_manifest_for(bank_file):
+    """Manifeste des images du projet d'une banque (<projet>/data/questions.json)"""
+    return Path(bank_file).resolve().parent.parent / MANIFEST_FILE.relative_to(PROJECT_DIR)
+
+
+def up_to_date(entry, digest):
+    return (entry is not None and entry['sha256'] == digest
+            and all((PROJECT_DIR / v['url']).exists() for v in entry['variants']))
+
+
+def optimize_images(images_dir=IMAGES_DIR, force=False, workers=None):
+    """
+    Encode les images nouvelles ou modifiées et réécrit le manifeste.
+    Retourne (manifeste, liste des images réencodées).
+    """
+    formats = available_formats()
+    settings = encoding_settings(formats)
+    previous = load_manifest()
+    known = previous['images'] if previous and previous.get('settings') == settings and not force else {}
+
+    images = {}
+    jobs = []
+    with phase('load'):
+        for source in sorted(Path(images_dir).rglob('*')):
+            if source.suffix.lower() not in SOURCE_SUFFIXES or OPTIMIZED_DIR in source.parents:
+                continue
+            url = project_url(source)
+            digest = bytes_hash(source.read_bytes())
+            if up_to_date(known.get(url), digest):
+                images[url] = known[url]
+            else:
+                jobs.append((url, (str(source), digest, formats)))
+
+    with phase('transform'):
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) < 2:
+            results = map(encode_image, (job for _, job in jobs))
+            images.update(zip((url for url, _ in jobs), results))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(encode_image, (job for _, job in jobs))
+                images.update(zip((url for url, _ in jobs), results))
+
+    for url in images:
+        images[url]['sources'] = srcset_sources(images[url])
+
+    # Supprime les variantes qui ne correspondent plus à aucune image
+    expected = {v['url'] for entry in images.values() for v in entry['variants']}
+    for stale in OPTIMIZED_DIR.rglob('*'):
+        if stale.is_file() and stale != MANIFEST_FILE and project_url(stale) not in expected:
+            stale.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'settings': settings,
+        'formats': formats,
+        'widths': WIDTHS,
+        'images': dict(sorted(images.items())),
+    }
+    atomic_write_text(MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest, [url for url, _ in jobs]
+
+
+def image_variants(entry):
+    """Champ image_variants d'une question (dimensions d'origine + sources <picture>)"""
+    return {
+        'width': entry['width'],
+        'height': entry['height'],
+        'sources': entry['sources'],
+    }
+
+
+def image_fields(entry):
+    """Champs dérivés ajoutés à côté de image_url"""
+    return {
+        'image_variants': image_variants(entry),
+        'image_placeholder': entry['placeholder'],
+    }
+
+
+def attach_image_fields(chapters, manifest):
+    """
+    Chapitres où les questions à image optimisée reçoivent image_variants et
+    image_placeholder (champs dérivés, jamais écrits dans questions.json).
+    Les chapitres et questions d'origine ne sont pas modifiés.
+    """
+    images = manifest['images'] if manifest else {}
+    attached = []
+    for chapter in chapters:
+        questions = []
+        for q in chapter['questions']:
+            entry = images.get((q.get('image_url') or '').removeprefix('./'))
+            if entry is not None:
+                q = {**q, **image_fields(entry)}
+            questions.append(q)
+        attached.append({**chapter, 'questions': questions})
+    return attached
+
+
+@instrumented("optimize_images")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimisation des images (WebP/AVIF multi-largeurs)")
+    parser.add_argument('--force', action='store_true', help="réencode toutes les images")
+    parser.add_argument('--workers', type=int, default=None, help="processus d'encodage (défaut: nombre de CPU)")
+    args = parser.parse_args(argv)
+
+    print("🖼️  OPTIMISATION DES IMAGES")
+    print("=" * 50)
+
+    if Image is None:
+        print("⚠️  Pillow non installé - images non optimisées (pip install Pillow)")
+        return
+
+    manifest, encoded = optimize_images(force=args.force, workers=args.workers)
+    if 'avif' not in manifest['formats']:
+        print("⚠️  AVIF non pris en charge par ce Pillow - variantes WebP uniquement")
+
+    source_bytes = sum(entry['bytes'] for entry in manifest['images'].values())
+    for url in encoded:
+        entry = manifest['images'][url]
+        best = min((v for v in entry['variants'] if v['width'] == entry['variants'][-1]['width']),
+                   key=lambda v: v['bytes'])
+        print(f"  🔄 {url} ({entry['bytes'] / 1024:.0f} KB → {best['format']} {best['bytes'] / 1024:.0f} KB)")
+    print(f"📦 {len(manifest['images'])} images, {len(encoded)} réencodée(s), "
+          f"{len(manifest['images']) - len(encoded)} inchangée(s) ({source_bytes / 1024 / 1024:.1f} MB sources)")
+
+    print(f"✅ Manifeste: {MANIFEST_FILE}")
+    print("💡 Fichiers publiés (image_variants): python3 scripts/bank_compiler.py")
+
+
+if __name__ == "__main__":
+    main()
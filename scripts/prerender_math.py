@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Pré-rendu des formules LaTeX de la banque en MathML
+
+Le rendu MathJax de chaque question est l'étape la plus lente d'un quiz sur
+les téléphones d'entrée de gamme. Cette étape de compilation extrait tous
+les fragments TeX ($...$, $$...$$, \\(...\\), \\[...\\]) des champs affichés
+et rend chaque fragment distinct une seule fois (latex2mathml, hors ligne).
+
+    .build-cache/formula_cache.json   cache adressé par contenu (à côté de
+                                      l'état du compilateur) :
+                                      sha256(mode, TeX) -> MathML (null si échec)
+    data/math/chapter_<id>.json       variantes pré-rendues des questions
+                                      du chapitre, alignées par position
+    data/math/manifest.json           liste des fichiers (url versionnée)
+
+Une recompilation ne rend que les formules absentes du cache. Un fragment
+que le moteur ne sait pas rendre reste en TeX : MathJax s'en charge côté
+client (renderMath ne l'appelle plus que s'il reste du TeX à l'écran).
+
+Les macros de js/mathjax-config.js (\\ket, \\bra, \\braket, \\ketbra) sont
+développées avant le rendu.
+"""
+
+import hashlib
+import json
+import re
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from bank_io import atomic_write_text
+from bank_profile import instrumented, phase
+from bank_shards import DEFERRED_FIELDS, shard_name, shard_url
+from bank_utils import BANK_FILE, CACHE_DIR, bytes_hash, serialize_min
+
+try:
+    from latex2mathml.converter import convert as latex_to_mathml
+    RENDERER = f"latex2mathml-{package_version('latex2mathml')}"
+except ImportError:
+    latex_to_mathml = None
+    RENDERER = None
+
+FORMULA_CACHE_NAME = "formula_cache.json"
+FORMULA_CACHE_FILE = CACHE_DIR / FORMULA_CACHE_NAME
+CACHE_VERSION = 1
+MATH_DIRNAME = "math"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Champs affichés en HTML par le client (question-renderer, results, flashcards)
+TEXT_FIELDS = ['context', 'question', 'formula', 'explanation', 'hint', 'front', 'back']
+LIST_FIELDS = ['options']
+
+# Même ordre de recherche que MathJax : $$ et \[ (bloc) avant $ et \( (en ligne)
+MATH_PATTERN = re.compile(
+    r"\$\$(.+?)\$\$|\\\[(.+?)\\\]|\\\((.+?)\\\)|(?<!\\)\$(.+?)(?<!\\)\$",
+    re.DOTALL,
+)
+
+# Macros de js/mathjax-config.js : nom -> (nombre d'arguments, gabarit)
+MACROS = {
+    'ket': (1, r"\left| {0} \right\rangle"),
+    'bra': (1, r"\left\langle {0} \right|"),
+    'braket': (2, r"\left\langle {0} \middle| {1} \right\rangle"),
+    'ketbra': (2, r"\left| {0} \right\rangle\left\langle {1} \right|"),
+}
+MACRO_PATTERN = re.compile(r"\\(" + '|'.join(sorted(MACROS, key=len, reverse=True)) + r")(?![A-Za-z])")
+
+
+def braced_argument(tex, start):
+    """Argument {…} (accolades équilibrées) commençant à `start` ; retourne (contenu, fin) ou None"""
+    while start < len(tex) and tex[start] == ' ':
+        start += 1
+    if start >= len(tex):
+        return None
+    if tex[start] != '{':
+        # Argument d'un seul caractère (\ket0)
+        return tex[start], start + 1
+    depth = 0
+    for i in range(start, len(tex)):
+        if tex[i] == '{' and tex[i - 1] != '\\':
+            depth += 1
+        elif tex[i] == '}' and tex[i - 1] != '\\':
+            depth -= 1
+            if depth == 0:
+                return tex[start + 1:i], i + 1
+    return None
+
+
+def expand_macros(tex):
+    """Développe les macros de notation de Dirac (arguments imbriqués compris)"""
+    out = []
+    pos = 0
+    while True:
+        match = MACRO_PATTERN.search(tex, pos)
+        if match is None:
+            out.append(tex[pos:])
+            return ''.join(out)
+        arity, template = MACROS[match.group(1)]
+        args = []
+        end = match.end()
+        for _ in range(arity):
+            parsed = braced_argument(tex, end)
+            if parsed is None:
+                break
+            args.append(expand_macros(parsed[0]))
+            end = parsed[1]
+        out.append(tex[pos:match.start()])
+        if len(args) == arity:
+            out.append(template.format(*args))
+        else:
+            # Macro incomplète : laissée telle quelle (MathJax signalera l'erreur)
+            out.append(tex[match.start():end])
+        pos = end
+
+
+def formula_key(tex, display):
+    mode = 'block' if display else 'inline'
+    return hashlib.sha256(f"{mode}\0{tex}".encode('utf-8')).hexdigest()
+
+
+def fragments(text):
+    """Fragments TeX d'un champ : [(début, fin, TeX, display)]"""
+    found = []
+    for match in MATH_PATTERN.finditer(text):
+        block, bracket, paren, inline = match.groups()
+        tex = next(g for g in (block, bracket, paren, inline) if g is not None)
+        found.append((match.start(), match.end(), tex, block is not None or bracket is not None))
+    return found
+
+
+class FormulaCache:
+    """Cache persistant des formules rendues, adressé par le hash du TeX"""
+
+    def __init__(self, path=FORMULA_CACHE_FILE, renderer=RENDERER):
+        self.path = Path(path)
+        self.renderer = renderer
+        self.entries = {}
+        self.rendered = 0
+        self.failed = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=FORMULA_CACHE_FILE, renderer=RENDERER):
+        cache = cls(path, renderer)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cache
+        # Un changement de moteur (ou de version) invalide tout le cache
+        if stored.get('version') == CACHE_VERSION and stored.get('renderer') == renderer:
+            cache.entries = stored.get('formulas', {})
+        return cache
+
+    def render(self, tex, display):
+        """MathML d'un fragment (None si le moteur échoue) ; rendu une seule fois"""
+        key = formula_key(tex, display)
+        if key in self.entries:
+            return self.entries[key]
+        try:
+            mathml = latex_to_mathml(expand_macros(tex.strip()), display='block' if display else 'inline')
+        except Exception:  # le moteur lève des exceptions variées sur du TeX non supporté
+            mathml = None
+            self.failed += 1
+        self.entries[key] = mathml
+        self.rendered += 1
+        self.dirty = True
+        return mathml
+
+    def render_text(self, text):
+        """Texte avec ses fragments remplacés par leur MathML, ou None s'il n'y a pas de TeX"""
+        found = fragments(text)
+        if not found:
+            return None
+        out = []
+        pos = 0
+        for start, end, tex, display in found:
+            mathml = self.render(tex, display)
+            out.append(text[pos:start])
+            out.append(mathml if mathml is not None else text[start:end])
+            pos = end
+        out.append(text[pos:])
+        return ''.join(out)
+
+    def save(self):
+        if not self.dirty:
+            return
+        atomic_write_text(self.path, json.dumps({
+            'version': CACHE_VERSION,
+            'renderer': self.renderer,
+            'formulas': self.entries,
+        }, ensure_ascii=False, separators=(',', ':')))
+        self.dirty = False
+
+
+def prerender_question(question, cache):
+    """Champs pré-rendus d'une question ({champ: html}), ou None si elle n'a pas de TeX"""
+    rendered = {}
+    for field in TEXT_FIELDS:
+        if field in DEFERRED_FIELDS:
+            # Rendu avec le champ lui-même, à part (bank_explanations.py)
+            continue
+        value = question.get(field)
+        if isinstance(value, str):
+            html = cache.render_text(value)
+            if html is not None:
+                rendered[field] = html
+    for field in LIST_FIELDS:
+        values = question.get(field)
+        if isinstance(values, list) and all(isinstance(v, str) for v in values):
+            htmls = [cache.render_text(v) for v in values]
+            if any(html is not None for html in htmls):
+                rendered[field] = [html if html is not None else v for html, v in zip(htmls, values)]
+    return rendered or None
+
+
+def prerender_chapter(chapter, cache):
+    """
+    Variantes pré-rendues d'un chapitre. Les entrées sont alignées sur la
+    position des questions (les IDs ne sont pas garantis uniques) ; l'ID
+    est répété pour que le client vérifie l'alignement.
+    """
+    return {
+        'chapter_id': chapter['chapter_id'],
+        'renderer': cache.renderer,
+        'ids': [q.get('id') for q in chapter['questions']],
+        'fields': [prerender_question(q, cache) for q in chapter['questions']],
+    }
+
+
+def math_dir_for(bank_file):
+    return Path(bank_file).parent / MATH_DIRNAME
+
+
+def formula_cache_for(compiler):
+    """Cache des formules d'une compilation : à côté de son fichier d'état"""
+    return compiler.state_file.parent / FORMULA_CACHE_NAME
+
+
+def write_math(data, bank_file=BANK_FILE, changed_chapters=None, write_text=None, cache=None,
+               cache_file=FORMULA_CACHE_FILE, remove=None):
+    """
+    Écrit les variantes pré-rendues des chapitres modifiés et leur manifeste.
+    Sans moteur de rendu, supprime le manifeste et les variantes (le client
+    garde MathJax).
+    Retourne la liste des fichiers écrits.
+    """
+    write_text = write_text or atomic_write_text
+    remove = remove or (lambda path: path.unlink(missing_ok=True))
+    out_dir = math_dir_for(bank_file)
+    manifest_path = out_dir / MANIFEST_NAME
+    if latex_to_mathml is None:
+        print("⚠️  latex2mathml non installé - formules laissées à MathJax (pip install latex2mathml)")
+        for stale in [manifest_path, *out_dir.glob("chapter_*.json")]:
+            if stale.exists():
+                remove(stale)
+        return []
+
+    cache = cache or FormulaCache.load(cache_file)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    changed = None if changed_chapters is None else set(changed_chapters)
+
+    written = []
+    entries = []
+    for chapter in data['chapters']:
+        chapter_id = chapter['chapter_id']
+        path = out_dir / shard_name(chapter_id)
+        if changed is None or chapter_id in changed or not path.exists():
+            with phase('transform'):
+                text = serialize_min(prerender_chapter(chapter, cache))
+            write_text(path, text)
+            written.append(path)
+            payload = text.encode('utf-8')
+        else:
+            payload = path.read_bytes()
+        entries.append({
+            'chapter_id': chapter_id,
+            'url': shard_url(bank_file, path, bytes_hash(payload)),
+            'bytes': len(payload),
+        })
+
+    expected = {shard_name(chapter['chapter_id']) for chapter in data['chapters']}
+    for stale in out_dir.glob("chapter_*.json"):
+        if stale.name not in expected:
+            remove(stale)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'renderer': cache.renderer,
+        'format': 'mathml',
+        'chapters': entries,
+    }
+    write_text(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    written.append(manifest_path)
+    cache.save()
+    return written
+
+
+def emit_math(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : formules pré-rendues par chapitre"""
+    return write_math(data, compiler.bank_file, changed_chapters, compiler.write_text,
+                      cache_file=formula_cache_for(compiler), remove=compiler.remove)
+
+
+@instrumented("prerender_math")
+def main():
+    print("🧮 PRÉ-RENDU DES FORMULES LATEX")
+    print("=" * 50)
+
+    with phase('load'), open(BANK_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    cache = FormulaCache.load()
+    known = len(cache.entries)
+    with phase('serialize'):
+        written = write_math(data, cache=cache)
+    if not written:
+        return
+
+    print(f"  📦 Formules en cache: {known}")
+    print(f"  ✨ Formules rendues: {cache.rendered} (échecs laissés à MathJax: {cache.failed})")
+    print(f"✅ {len(written)} fichier(s) écrit(s) dans {math_dir_for(BANK_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
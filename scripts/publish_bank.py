@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Publication de la banque de questions sous forme d'artefacts immuables
+
+Écrit dans data/release/ :
+    questions.<hash>.json       banque minifiée, nommée d'après le hash de son contenu
+    questions.<hash>.json.gz    version gzip précompressée
+    questions.<hash>.json.br    version brotli précompressée (si le module brotli est installé)
+    current.json                pointeur (quelques centaines d'octets) vers la version courante
+
+Les clients revalident uniquement current.json ; le fichier haché peut être
+mis en cache indéfiniment. Republier une banque identique ne réécrit rien.
+"""
+
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+
+from bank_io import atomic_write_bytes
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, bytes_hash, serialize_min
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RELEASE_DIRNAME = "release"
+POINTER_NAME = "current.json"
+POINTER_VERSION = 1
+
+# Nombre de versions conservées (les clients ayant un ancien pointeur en cache
+# peuvent encore télécharger la version précédente)
+KEEP_RELEASES = 3
+
+
+def release_dir_for(bank_file):
+    return Path(bank_file).parent / RELEASE_DIRNAME
+
+
+def site_path(bank_file, path):
+    """Chemin relatif à la racine du site (parent de data/)"""
+    site_root = Path(bank_file).resolve().parent.parent
+    return Path(path).resolve().relative_to(site_root).as_posix()
+
+
+def read_pointer(release_dir):
+    try:
+        with open(release_dir / POINTER_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def publish(data, bank_file=BANK_FILE, write_bytes=None):
+    """
+    Publie la banque et retourne la liste des fichiers écrits
+    (vide si la version courante est déjà publiée).
+    """
+    write_bytes = write_bytes or atomic_write_bytes
+    release_dir = release_dir_for(bank_file)
+    release_dir.mkdir(parents=True, exist_ok=True)
+
+    with phase('serialize'):
+        payload = serialize_min(data).encode('utf-8')
+    digest = bytes_hash(payload)
+    name = f"questions.{digest[:12]}.json"
+    path = release_dir / name
+
+    pointer = read_pointer(release_dir)
+    if pointer and pointer.get('sha256') == digest and path.exists():
+        return []
+
+    written = []
+    if not path.exists():
+        write_bytes(path, payload)
+        written.append(path)
+
+    # Les compressions sont déterministes (gzip avec mtime=0) : on peut
+    # toujours les recalculer pour connaître leur taille
+    with phase('serialize'):
+        compressed = {'gzip': ('.gz', gzip.compress(payload, compresslevel=9, mtime=0))}
+        if brotli is not None:
+            compressed['br'] = ('.br', brotli.compress(payload, quality=11))
+
+    encodings = {}
+    for encoding, (suffix, blob) in compressed.items():
+        encoded_path = path.with_name(name + suffix)
+        if not encoded_path.exists():
+            write_bytes(encoded_path, blob)
+            written.append(encoded_path)
+        encodings[encoding] = {'file': site_path(bank_file, encoded_path), 'bytes': len(blob)}
+
+    pointer = {
+        'version': POINTER_VERSION,
+        'file': site_path(bank_file, path),
+        'sha256': digest,
+        'bytes': len(payload),
+        'encodings': encodings,
+        'total_questions': data.get('metadata', {}).get('total_questions'),
+        'published': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    pointer_path = release_dir / POINTER_NAME
+    write_bytes(pointer_path, json.dumps(pointer, ensure_ascii=False, indent=2).encode('utf-8'))
+    written.append(pointer_path)
+
+    prune_releases(release_dir, keep={name})
+    return written
+
+
+def prune_releases(release_dir, keep):
+    """Supprime les anciennes versions au-delà de KEEP_RELEASES"""
+    releases = sorted(release_dir.glob("questions.*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    kept = set(keep)
+    for path in releases:
+        if path.name in kept:
+            continue
+        if len(kept) < KEEP_RELEASES:
+            kept.add(path.name)
+            continue
+        for stale in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+            if stale.exists():
+                stale.unlink()
+
+
+def emit_release(compiler, data, changed_chapters):
+    """Fichier dérivé du compilateur : artefacts de publication"""
+    return publish(data, compiler.bank_file, compiler.write_bytes)
+
+
+@instrumented("publish_bank")
+def main():
+    print("📦 PUBLICATION DE LA BANQUE DE QUESTIONS")
+    print("=" * 50)
+
+    with phase('load'), open(BANK_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if brotli is None:
+        print("⚠️  Module brotli non disponible, pas de version .br (pip install brotli)")
+
+    written = publish(data)
+    if not written:
+        print("✨ Version courante déjà publiée")
+    for path in written:
+        print(f"  📄 {path.name} ({path.stat().st_size / 1024:.1f} KB)")
+
+    pointer = read_pointer(release_dir_for(BANK_FILE))
+    print(f"✅ Version publiée: {pointer['file']}")
+
+
+if __name__ == "__main__":
+    main()
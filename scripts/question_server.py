@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Service de questions (asyncio, local, sans dépendance)
+
+Le service charge data/questions.json une fois, l'indexe en mémoire (par
+ID, chapitre, type et difficulté : voir bank_facets.py) et ne renvoie au
+client que les questions d'un quiz au lieu de toute la banque :
+
+    GET /api/health                                 version de la banque, nombre de questions
+    GET /api/chapters                               en-têtes et compteurs des chapitres
+    GET /api/questions?chapter=3&difficulty=medium&type=qcm,numerical&count=10
+                      [&exclude=ID,...] [&seed=N]   tirage aléatoire (IDs exclus en dernier recours)
+    GET /api/questions?ids=ch1-q001,ch2-q014       questions demandées, dans l'ordre
+
+Chaque question est sérialisée une seule fois au chargement (avec son
+chapter_id) : une réponse n'est qu'un assemblage de fragments JSON. Les
+réponses portent un ETag (304 si le client a déjà la même), sauf les
+tirages sans graine, et sont compressées en gzip. La banque est rechargée
+dès que le fichier change (écriture atomique de bank_io : jamais de
+fichier à moitié écrit) ; en cas d'erreur l'ancienne version reste servie.
+
+Usage :
+    python3 scripts/question_server.py [--host 127.0.0.1] [--port 8001] [--bank data/questions.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from async_http import HTTPError, Response, bytes_response, error_response, json_response, serve
+from bank_facets import build_facets, select
+from bank_profile import instrumented
+from bank_utils import BANK_FILE, bytes_hash, file_signature
+
+DEFAULT_PORT = 8001
+API_PREFIX = "/api/"
+
+DEFAULT_COUNT = 10
+MAX_COUNT = 100
+MAX_IDS = 200
+
+# Intervalle de vérification du fichier de la banque (secondes)
+RELOAD_INTERVAL = 1.0
+
+# Les pages peuvent être servies depuis une autre origine (ex: port 8000)
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
+FILTERS = ('chapter', 'difficulty', 'type')
+
+
+class QuestionIndex:
+    """Banque indexée en mémoire (une instance par version du fichier)"""
+
+    def __init__(self, data, version):
+        self.version = version
+        self.facets = build_facets(data)
+        self.fragments = []
+        self.positions = {}
+        position = 0
+        for chapter in data['chapters']:
+            for q in chapter['questions']:
+                record = {'chapter_id': chapter['chapter_id']}
+                record.update(q)
+                self.fragments.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                # Un ID dupliqué désigne sa première occurrence (comme côté client)
+                self.positions.setdefault(q.get('id'), position)
+                position += 1
+
+        self.chapters = [
+            {
+                **{key: value for key, value in chapter.items() if key != 'questions'},
+                'total': len(chapter['questions']),
+            }
+            for chapter in data['chapters']
+        ]
+        self.course_info = data.get('course_info', {})
+
+    @classmethod
+    def load(cls, path):
+        payload = Path(path).read_bytes()
+        return cls(json.loads(payload), bytes_hash(payload)[:16])
+
+    def select(self, **filters):
+        """Positions des questions (premières occurrences de chaque ID) satisfaisant les filtres"""
+        positions = select(self.facets, **filters)
+        ids = self.facets['ids']
+        return [p for p in positions if self.positions.get(ids[p]) == p]
+
+    def draw(self, positions, count, exclude=(), rng=random):
+        """Tirage de `count` positions ; les IDs exclus (déjà vus) ne complètent qu'en dernier recours"""
+        ids = self.facets['ids']
+        excluded = set(exclude)
+        fresh = [p for p in positions if ids[p] not in excluded]
+        seen = [p for p in positions if ids[p] in excluded]
+        drawn = rng.sample(fresh, min(count, len(fresh)))
+        if len(drawn) < count:
+            drawn += rng.sample(seen, min(count - len(drawn), len(seen)))
+        return drawn
+
+    def payload(self, positions, **fields):
+        """Réponse JSON assemblée à partir des fragments pré-sérialisés"""
+        head = json.dumps({'version': self.version, **fields}, ensure_ascii=False, separators=(',', ':'))
+        questions = ','.join(self.fragments[p] for p in positions)
+        return f'{head[:-1]},"questions":[{questions}]}}'.encode('utf-8')
+
+
+class QuestionService:
+    def __init__(self, bank_file=BANK_FILE):
+        self.bank_file = Path(bank_file)
+        self.signature = file_signature(self.bank_file)
+        self.index = QuestionIndex.load(self.bank_file)
+
+    async def watch(self, interval=RELOAD_INTERVAL):
+        """Recharge la banque quand le fichier change (chargement dans un thread)"""
+        while True:
+            await asyncio.sleep(interval)
+            signature = file_signature(self.bank_file)
+            if signature is None or signature == self.signature:
+                continue
+            self.signature = signature
+            try:
+                index = await asyncio.to_thread(QuestionIndex.load, self.bank_file)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  Rechargement impossible, ancienne version conservée: {e}")
+                continue
+            if index.version != self.index.version:
+                self.index = index
+                print(f"🔄 Banque rechargée (version {index.version}, {len(index.fragments)} questions)")
+
+    async def handle(self, request):
+        if request.method == 'OPTIONS':
+            return self.preflight()
+        route = {
+            'health': self.health,
+            'chapters': self.chapters,
+            'questions': self.questions,
+        }.get(request.path.removeprefix(API_PREFIX))
+        if not request.path.startswith(API_PREFIX) or route is None:
+            return error_response(404)
+        try:
+            response = route(request, self.index)
+        except HTTPError as e:
+            response = error_response(e.status, e.message)
+        response.headers.update(CORS_HEADERS)
+        return response
+
+    def preflight(self):
+        return Response(204, headers={
+            **CORS_HEADERS,
+            'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
+            'Access-Control-Allow-Headers': 'If-None-Match',
+        })
+
+    def health(self, request, index):
+        return json_response(request, {
+            'status': 'ok',
+            'version': index.version,
+            'questions': len(index.fragments),
+        }, cache_control='no-store')
+
+    def chapters(self, request, index):
+        return json_response(request, {
+            'version': index.version,
+            'course_info': index.course_info,
+            'chapters': index.chapters,
+            'counts': index.facets['counts'],
+        })
+
+    def questions(self, request, index):
+        ids = request.list_param('ids')
+        if ids:
+            if len(ids) > MAX_IDS:
+                raise HTTPError(400, f"au plus {MAX_IDS} IDs par requête")
+            found = [index.positions[q_id] for q_id in ids if q_id in index.positions]
+            missing = [q_id for q_id in ids if q_id not in index.positions]
+            payload = index.payload(found, missing=missing)
+            return bytes_response(request, payload, 'application/json; charset=utf-8')
+
+        count = int_param(request, 'count', DEFAULT_COUNT)
+        if not 1 <= count <= MAX_COUNT:
+            raise HTTPError(400, f"count doit être compris entre 1 et {MAX_COUNT}")
+        filters = {name: request.list_param(name) or None for name in FILTERS}
+        positions = index.select(**filters)
+        seed = request.param('seed')
+        rng = random.Random(f"{index.version}:{seed}") if seed is not None else random
+        drawn = index.draw(positions, count, request.list_param('exclude'), rng)
+        payload = index.payload(drawn, total=len(positions))
+        # Sans graine, chaque tirage est différent : rien à mettre en cache
+        return bytes_response(request, payload, 'application/json; charset=utf-8',
+                              cache_control='no-cache' if seed is not None else 'no-store')
+
+
+def int_param(request, name, default):
+    try:
+        return int(request.param(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} doit être un entier") from None
+
+
+@instrumented("question_server")
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service de questions (API JSON locale)")
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute (0.0.0.0 : tout le réseau local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--bank', type=Path, default=BANK_FILE)
+    args = parser.parse_args(argv)
+
+    print("🛰️  SERVICE DE QUESTIONS")
+    print("=" * 50)
+
+    service = QuestionService(args.bank)
+    print(f"📚 {len(service.index.fragments)} questions chargées (version {service.index.version})")
+    server = await serve(service.handle, args.host, args.port)
+    print(f"✅ http://{args.host}:{args.port}{API_PREFIX}questions?chapter=1&count=10")
+
+    watcher = asyncio.create_task(service.watch())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Service arrêté")
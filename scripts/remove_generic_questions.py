@@ -3,10 +3,12 @@
 Script pour supprimer les questions génériques/placeholder du fichier questions.json
 """
 
-import json
 import sys
 from pathlib import Path
 
+from bank_io import edit_bank
+from bank_profile import instrumented
+
 # Patterns à rechercher pour identifier les questions génériques
 GENERIC_PATTERNS = [
     "à compléter par le professeur",
@@ -35,10 +37,33 @@ def clean_questions(input_file, output_file=None):
 
     print(f"📖 Lecture du fichier: {input_file}")
 
-    # Charge le fichier JSON
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Charge le fichier JSON ; il est réécrit atomiquement, sous verrou,
+    # à la sortie du bloc
+    with edit_bank(input_file, output_file) as data:
+        total_removed, stats_by_chapter = remove_generic(data)
+        print(f"\n💾 Sauvegarde dans: {output_file}")
+
+    # Affiche le résumé
+    print(f"\n✅ NETTOYAGE TERMINÉ")
+    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print(f"🗑️  Questions génériques supprimées: {total_removed}")
+
+    # Calcule le total final
+    total_questions = sum(len(ch['questions']) for ch in data['chapters'])
+    print(f"📊 Total final: {total_questions} questions")
+    print(f"")
 
+    # Affiche le détail par chapitre
+    if stats_by_chapter:
+        print("📋 Détail par chapitre:")
+        for ch_id in sorted(stats_by_chapter.keys()):
+            info = stats_by_chapter[ch_id]
+            print(f"  • Ch{ch_id} ({info['title']}): {info['remaining']} questions (-{info['removed']})")
+
+    return total_removed, stats_by_chapter
+
+def remove_generic(data):
+    """Retire les questions génériques de chaque chapitre (en place)"""
     total_removed = 0
     stats_by_chapter = {}
 
@@ -68,31 +93,10 @@ def clean_questions(input_file, output_file=None):
 
             print(f"  📚 Chapitre {chapter_id}: {removed_count} questions supprimées ({len(cleaned_questions)} restantes)")
 
-    # Sauvegarde le fichier nettoyé
-    print(f"\n💾 Sauvegarde dans: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    # Affiche le résumé
-    print(f"\n✅ NETTOYAGE TERMINÉ")
-    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-    print(f"🗑️  Questions génériques supprimées: {total_removed}")
-
-    # Calcule le total final
-    total_questions = sum(len(ch['questions']) for ch in data['chapters'])
-    print(f"📊 Total final: {total_questions} questions")
-    print(f"")
-
-    # Affiche le détail par chapitre
-    if stats_by_chapter:
-        print("📋 Détail par chapitre:")
-        for ch_id in sorted(stats_by_chapter.keys()):
-            info = stats_by_chapter[ch_id]
-            print(f"  • Ch{ch_id} ({info['title']}): {info['remaining']} questions (-{info['removed']})")
-
     return total_removed, stats_by_chapter
 
-if __name__ == "__main__":
+@instrumented("remove_generic_questions")
+def main():
     # Chemin vers le fichier questions.json
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
@@ -115,3 +119,6 @@ if __name__ == "__main__":
         print(f"\n✨ {removed} questions génériques ont été supprimées avec succès!")
 
     print()
+
+if __name__ == "__main__":
+    main()
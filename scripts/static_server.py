@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Serveur statique du site (remplace `python3 -m http.server`)
+
+Prévu pour une salle de classe : un portable sert l'application à toute
+une promotion sur le réseau local. Par rapport à http.server :
+
+    - asyncio : les connexions sont traitées en parallèle (keep-alive),
+      les lectures de fichiers passent par un thread ;
+    - fichiers précompressés : questions.json.br / .gz servis à la place
+      de questions.json si le navigateur les accepte ; les autres fichiers
+      texte sont compressés en gzip à la volée (une fois, gardés en cache) ;
+    - ETag fort (hash du contenu) et 304 Not Modified ; les fichiers dont
+      le nom contient leur hash (data/release/questions.<hash>.json) ou
+      demandés avec ?v=<hash> correct sont mis en cache « immutable » ;
+    - requêtes Range (reprise et déplacement dans les MP3 des chapitres) ;
+    - cache LRU en mémoire des fichiers les plus demandés.
+
+Les fichiers et dossiers cachés (.git, .build-cache...) ne sont jamais servis.
+Avec --api, le service de questions (question_server.py) répond sous /api/
+sur la même origine que les pages.
+
+Usage :
+    python3 scripts/static_server.py [--host 0.0.0.0] [--port 8000] [--api]
+"""
+
+import argparse
+import asyncio
+import gzip
+import mimetypes
+import os
+import re
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+
+from async_http import Response, error_response, etag_matches, serve
+from bank_profile import instrumented
+from bank_utils import PROJECT_DIR, bytes_hash, file_signature
+
+DEFAULT_PORT = 8000
+
+# Cache LRU : taille totale et taille maximale d'un fichier gardé en mémoire
+# (les fichiers plus gros sont envoyés directement depuis le disque)
+CACHE_BYTES = 64 * 1024 * 1024
+CACHE_ENTRY_BYTES = 2 * 1024 * 1024
+
+# Encodages précompressés, par ordre de préférence : (encodage, suffixe)
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml',
+                      'application/manifest+json', 'application/xml', 'application/vnd.msgpack')
+GZIP_LEVEL = 6
+GZIP_MIN_BYTES = 1024
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Nom de fichier versionné par son hash : questions.3f2a9c81b0d4.json
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,64}\.[A-Za-z0-9]+(?:\.(?:gz|br))?$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+for extension, content_type in {
+    '.js': 'application/javascript', '.mjs': 'application/javascript', '.json': 'application/json',
+    '.webmanifest': 'application/manifest+json', '.webp': 'image/webp', '.avif': 'image/avif',
+    '.svg': 'image/svg+xml', '.mp3': 'audio/mpeg', '.wav': 'audio/wav', '.ndjson': 'application/x-ndjson',
+    '.msgpack': 'application/vnd.msgpack',
+}.items():
+    mimetypes.add_type(content_type, extension)
+
+
+class CachedFile:
+    __slots__ = ('signature', 'data', 'etag', 'digest', 'gzipped')
+
+    def __init__(self, signature, data):
+        self.signature = signature
+        self.data = data
+        self.digest = bytes_hash(data)
+        self.etag = f'"{self.digest[:32]}"'
+        self.gzipped = None
+
+
+class FileCache:
+    """Contenu des petits fichiers, du moins récemment utilisé au plus récent"""
+
+    def __init__(self, max_bytes=CACHE_BYTES, max_entry=CACHE_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry = max_entry
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, path, signature):
+        entry = self.entries.get(path)
+        if entry is None or entry.signature != signature:
+            return None
+        self.entries.move_to_end(path)
+        return entry
+
+    def put(self, path, entry):
+        self.discard(path)
+        self.entries[path] = entry
+        self.size += len(entry.data)
+        while self.size > self.max_bytes and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted.data) + len(evicted.gzipped or b'')
+
+    def add_gzip(self, entry, gzipped):
+        entry.gzipped = gzipped
+        self.size += len(gzipped)
+
+    def discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.size -= len(entry.data) + len(entry.gzipped or b'')
+
+    async def load(self, path, signature):
+        """Contenu d'un fichier (lu dans un thread s'il n'est pas en cache)"""
+        entry = self.get(path, signature)
+        if entry is None:
+            entry = await asyncio.to_thread(lambda: CachedFile(signature, Path(path).read_bytes()))
+            self.put(path, entry)
+        return entry
+
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_range(header, size):
+    """
+    Intervalle d'un en-tête Range à une seule plage : (début, fin incluse).
+    None si l'en-tête est ignoré (plages multiples, syntaxe inconnue) ;
+    ValueError si la plage est hors du fichier (416).
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+class StaticSite:
+    def __init__(self, root=PROJECT_DIR, cache=None, api=None):
+        self.root = Path(root).resolve()
+        self.cache = cache or FileCache()
+        self.api = api
+
+    def resolve(self, url_path):
+        """Fichier correspondant à un chemin d'URL ; None s'il n'existe pas ou n'est pas servi"""
+        parts = [part for part in url_path.split('/') if part]
+        if any(part.startswith('.') for part in parts):
+            return None
+        path = self.root.joinpath(*parts)
+        try:
+            path = path.resolve()
+            path.relative_to(self.root)
+        except (ValueError, OSError):
+            return None
+        if path.is_dir():
+            path = path / 'index.html'
+        return path if path.is_file() else None
+
+    async def handle(self, request):
+        if self.api is not None and request.path.startswith('/api/'):
+            return await self.api.handle(request)
+        if request.method == 'OPTIONS':
+            return error_response(405)
+
+        path = self.resolve(request.path)
+        if path is None:
+            return error_response(404)
+        if path.name == 'index.html' and not request.path.endswith(('/', 'index.html')):
+            # Dossier demandé sans « / » final : les liens relatifs de sa page en ont besoin
+            return Response(301, headers={'Location': request.path + '/'})
+
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        compressible = is_compressible(content_type)
+        headers = {
+            'Content-Type': content_type,
+            'Accept-Ranges': 'bytes',
+        }
+        if compressible:
+            headers['Vary'] = 'Accept-Encoding'
+
+        ranged = 'range' in request.headers
+        if not ranged:
+            precompressed = self.precompressed(request, path)
+            if precompressed is not None:
+                encoding, sibling = precompressed
+                headers['Content-Encoding'] = encoding
+                headers['Vary'] = 'Accept-Encoding'
+                return await self.file_response(request, sibling, headers, cache_name=path.name)
+
+        return await self.file_response(request, path, headers, compress=compressible and not ranged)
+
+    def precompressed(self, request, path):
+        accepted = request.headers.get('accept-encoding', '')
+        for encoding, suffix in PRECOMPRESSED:
+            sibling = path.with_name(path.name + suffix)
+            if encoding in accepted and sibling.is_file():
+                return encoding, sibling
+        return None
+
+    def cache_control(self, request, name, digest):
+        if HASHED_NAME.search(name):
+            return IMMUTABLE
+        version = request.param('v')
+        if version and digest and len(version) >= 8 and digest.startswith(version):
+            return IMMUTABLE
+        return REVALIDATE
+
+    async def file_response(self, request, path, headers, compress=False, cache_name=None):
+        signature = file_signature(path)
+        if signature is None:
+            return error_response(404)
+        size, mtime_ns = signature
+        headers['Last-Modified'] = formatdate(mtime_ns / 1e9, usegmt=True)
+
+        entry = None
+        if size <= self.cache.max_entry:
+            entry = await self.cache.load(str(path), signature)
+            etag = entry.etag
+        else:
+            # Gros fichier : envoyé depuis le disque, validé par taille et date
+            etag = f'"{size:x}-{mtime_ns:x}"'
+        headers['ETag'] = etag
+        headers['Cache-Control'] = self.cache_control(request, cache_name or path.name, entry and entry.digest)
+
+        if etag_matches(request, etag):
+            return Response(304, headers={k: v for k, v in headers.items() if k != 'Content-Type'})
+
+        # Range (ignoré si If-Range désigne une autre version du fichier)
+        byte_range = None
+        if 'range' in request.headers and request.headers.get('if-range', etag) == etag:
+            try:
+                byte_range = parse_range(request.headers['range'], size)
+            except ValueError:
+                return Response(416, headers={'Content-Range': f"bytes */{size}", **headers})
+        if byte_range is not None:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+            if entry is not None:
+                return Response(206, entry.data[start:end + 1], headers)
+            return Response(206, headers=headers, file_path=path, offset=start, length=end - start + 1)
+
+        if compress and entry is not None and size >= GZIP_MIN_BYTES \
+                and 'gzip' in request.headers.get('accept-encoding', ''):
+            if entry.gzipped is None:
+                self.cache.add_gzip(entry, await asyncio.to_thread(
+                    gzip.compress, entry.data, GZIP_LEVEL, mtime=0))
+            headers['Content-Encoding'] = 'gzip'
+            # Représentation différente : ETag différent
+            headers['ETag'] = etag[:-1] + '-gz"'
+            return Response(200, entry.gzipped, headers)
+
+        if entry is not None:
+            return Response(200, entry.data, headers)
+        return Response(200, headers=headers, file_path=path, offset=0, length=size)
+
+
+@instrumented("static_server")
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur statique du site (réseau local)")
+    parser.add_argument('--host', default='0.0.0.0', help="adresse d'écoute (défaut: tout le réseau local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--root', type=Path, default=PROJECT_DIR, help="dossier servi (défaut: racine du projet)")
+    parser.add_argument('--api', action='store_true', help="sert aussi le service de questions sous /api/")
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // (1024 * 1024),
+                        help="taille du cache mémoire en Mo")
+    args = parser.parse_args(argv)
+
+    print("🌐 SERVEUR DU SITE")
+    print("=" * 50)
+
+    api = None
+    tasks = []
+    if args.api:
+        from question_server import QuestionService
+        api = QuestionService()
+        tasks.append(asyncio.create_task(api.watch()))
+        print(f"🛰️  Service de questions sous /api/ ({len(api.index.fragments)} questions)")
+
+    site = StaticSite(args.root, FileCache(args.cache_mb * 1024 * 1024), api)
+    server = await serve(site.handle, args.host, args.port)
+    print(f"📁 {site.root}")
+    print(f"✅ http://{'localhost' if args.host == '0.0.0.0' else args.host}:{args.port}/ "
+          f"(pid {os.getpid()}, Ctrl+C pour arrêter)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Serveur arrêté")
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Générateur de banques de questions synthétiques (pour les benchmarks)
+
+Produit une banque au format data/questions.json (ou NDJSON) de taille
+arbitraire, reproductible à partir d'une graine. Les neuf types de questions
+sont représentés, avec des formules LaTeX et des explications dont les
+longueurs suivent celles de la vraie banque. Une petite proportion de
+questions génériques (« à compléter par le professeur ») et d'IDs dupliqués
+donne du travail à remove_generic_questions.py et validate_questions.py.
+
+La banque est écrite au fil de l'eau : générer un million de questions ne
+demande pas de tout garder en mémoire.
+
+Usage :
+    python3 scripts/synthetic_bank.py 100000 --seed 42 -o /tmp/bank.json
+"""
+
+import argparse
+import json
+import random
+from collections import Counter
+from pathlib import Path
+
+from bank_ndjson import question_line
+from bank_profile import instrumented
+
+CHAPTER_COUNT = 6
+
+# Répartition des types, proche de celle de data/questions.json
+TYPE_WEIGHTS = {
+    'qcm': 60,
+    'vrai_faux': 10,
+    'hotspot': 10,
+    'drag_drop': 6,
+    'flashcard': 5,
+    'numerical': 4,
+    'interpretation': 2,
+    'matching': 2,
+    'animation': 1,
+}
+
+DIFFICULTY_WEIGHTS = {'easy': 35, 'medium': 40, 'hard': 25}
+
+# Les questions hotspot de la vraie banque n'ont souvent pas de champ 'type'
+UNTYPED_HOTSPOT_RATE = 0.5
+GENERIC_RATE = 0.01
+DUPLICATE_ID_RATE = 0.001
+
+FORMULAS = [
+    r"$\ket{\psi} = \alpha\ket{0} + \beta\ket{1}$",
+    r"$|\alpha|^2 + |\beta|^2 = 1$",
+    r"$\hat{H}\ket{\psi} = E\ket{\psi}$",
+    r"$i\hbar\frac{\partial}{\partial t}\ket{\psi(t)} = \hat{H}\ket{\psi(t)}$",
+    r"$[\hat{x}, \hat{p}] = i\hbar$",
+    r"$\Delta x \, \Delta p \geq \frac{\hbar}{2}$",
+    r"$E_n = \hbar\omega\left(n + \frac{1}{2}\right)$",
+    r"$\hat{a}^\dagger\ket{n} = \sqrt{n+1}\ket{n+1}$",
+    r"$\sigma_x = \begin{pmatrix} 0 & 1 \\ 1 & 0 \end{pmatrix}$",
+    r"$\ket{\Phi^+} = \frac{1}{\sqrt{2}}(\ket{00} + \ket{11})$",
+    r"$\lambda = \frac{h}{p}$",
+    r"$P(a_n) = |\braket{a_n|\psi}|^2$",
+    r"$\psi(x) = \frac{1}{\sqrt{2\pi\hbar}}\int \phi(p) e^{ipx/\hbar} dp$",
+    r"$\rho = \sum_i p_i \ket{\psi_i}\bra{\psi_i}$",
+]
+
+WORDS = (
+    "état superposition mesure opérateur hermitien valeur propre vecteur "
+    "amplitude probabilité qubit spin photon intrication base orthonormée "
+    "évolution unitaire hamiltonien énergie fonction d'onde paquet impulsion "
+    "position incertitude commutateur observable projection normalisation "
+    "oscillateur harmonique niveau quantique interférence fentes décohérence"
+).split()
+
+TAGS = [
+    "superposition", "mesure", "opérateurs", "intrication", "Bell", "spin",
+    "Stern-Gerlach", "Schrödinger", "calcul", "probabilité", "fondements",
+    "oscillateur", "Fourier", "incertitude", "postulats", "histoire",
+]
+
+IMAGES = [
+    "assets/images/BlochSph.png",
+    "assets/images/ch1/young-experiment.svg",
+    "assets/images/ch2/stern-gerlach.svg",
+    "assets/images/ch4/bell-states.svg",
+    "assets/images/ch6/harmonic-levels.svg",
+]
+
+ANIMATIONS = [
+    "young_interference", "bloch_sphere", "stern_gerlach", "rabi_oscillations",
+    "wave_packet", "tunneling", "harmonic_oscillator",
+]
+
+
+class SyntheticBank:
+    """Générateur déterministe : même graine, même banque"""
+
+    def __init__(self, count, seed=42, chapters=CHAPTER_COUNT):
+        self.count = count
+        self.seed = seed
+        self.chapters = chapters
+        self.rng = random.Random(seed)
+        self.issued_ids = []
+
+    # ------------------------------------------------------------------
+    # Texte
+    # ------------------------------------------------------------------
+
+    def sentence(self, min_words=6, max_words=16):
+        words = self.rng.choices(WORDS, k=self.rng.randint(min_words, max_words))
+        return words[0].capitalize() + ' ' + ' '.join(words[1:]) + '.'
+
+    def text(self, length):
+        """Texte d'environ `length` caractères, avec des formules LaTeX"""
+        parts = []
+        size = 0
+        while size < length:
+            part = self.rng.choice(FORMULAS) if self.rng.random() < 0.25 else self.sentence()
+            parts.append(part)
+            size += len(part) + 1
+        return ' '.join(parts)
+
+    def explanation_length(self):
+        # Quantiles de la vraie banque : 10 % ~80, médiane ~190, 90 % ~450 caractères
+        return int(min(900, max(40, self.rng.lognormvariate(5.25, 0.6))))
+
+    # ------------------------------------------------------------------
+    # Questions
+    # ------------------------------------------------------------------
+
+    def base(self, chapter_id, index, q_type, prefix):
+        q_id = f"ch{chapter_id}-{prefix}{index:06d}"
+        if self.issued_ids and self.rng.random() < DUPLICATE_ID_RATE:
+            q_id = self.rng.choice(self.issued_ids)
+        elif len(self.issued_ids) < 1000:
+            self.issued_ids.append(q_id)
+
+        question = {
+            'id': q_id,
+            'type': q_type,
+            'difficulty': self.rng.choices(list(DIFFICULTY_WEIGHTS), weights=list(DIFFICULTY_WEIGHTS.values()))[0],
+            'question': self.text(self.rng.randint(45, 140)),
+        }
+        if self.rng.random() < GENERIC_RATE:
+            question['question'] = f"Question {index} à compléter par le professeur"
+        return question
+
+    def finish(self, question, chapter_id):
+        question['explanation'] = self.text(self.explanation_length())
+        question['section_ref'] = f"{chapter_id}.{self.rng.randint(1, 3)}.{self.rng.randint(1, 4)}"
+        question['tags'] = self.rng.sample(TAGS, self.rng.randint(1, 4))
+        question['time_estimate'] = self.rng.choice([30, 45, 60, 90, 120])
+        question['points'] = self.rng.choice([1, 1, 1, 2])
+        if self.rng.random() < 0.3:
+            question['formula'] = self.rng.choice(FORMULAS)
+        return question
+
+    def make_question(self, chapter_id, index):
+        q_type = self.rng.choices(list(TYPE_WEIGHTS), weights=list(TYPE_WEIGHTS.values()))[0]
+        return getattr(self, f"make_{q_type}")(chapter_id, index)
+
+    def make_qcm(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'qcm', 'q')
+        q['options'] = [self.text(self.rng.randint(15, 60)) for _ in range(4)]
+        q['correct_answer'] = self.rng.randrange(4)
+        return self.finish(q, chapter_id)
+
+    def make_vrai_faux(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'vrai_faux', 'q')
+        q['correct_answer'] = self.rng.random() < 0.5
+        return self.finish(q, chapter_id)
+
+    def make_matching(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'matching', 'q')
+        q['pairs'] = [{'left': self.sentence(2, 5), 'right': self.rng.choice(FORMULAS)} for _ in range(4)]
+        q['distractors'] = [self.sentence(2, 4) for _ in range(2)]
+        return self.finish(q, chapter_id)
+
+    def make_numerical(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'numerical', 'q')
+        q['correct_answer'] = round(self.rng.uniform(0, 100), 2)
+        q['tolerance'] = self.rng.choice([0.01, 0.1, 0.5])
+        q['unit'] = self.rng.choice(['%', 'eV', 'nm', ''])
+        return self.finish(q, chapter_id)
+
+    def make_interpretation(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'interpretation', 'q')
+        q['sample_answer'] = self.text(self.rng.randint(200, 600))
+        q['key_points'] = [self.sentence(3, 8) for _ in range(3)]
+        return self.finish(q, chapter_id)
+
+    def make_hotspot(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'hotspot', 'h')
+        if self.rng.random() < UNTYPED_HOTSPOT_RATE:
+            del q['type']
+        width, height = self.rng.choice([(600, 300), (800, 600), (500, 500)])
+        q['image_url'] = self.rng.choice(IMAGES)
+        q['image_alt'] = self.sentence(3, 6)
+        q['hotspots'] = [
+            {'id': f"zone{n}", 'label': self.sentence(1, 3),
+             'x': self.rng.randint(40, width - 40), 'y': self.rng.randint(40, height - 40),
+             'radius': self.rng.choice([30, 40, 50])}
+            for n in range(3)
+        ]
+        q['correct_hotspot'] = self.rng.choice(q['hotspots'])['id']
+        q = self.finish(q, chapter_id)
+        q['image_dimensions'] = {'width': width, 'height': height}
+        return q
+
+    def make_drag_drop(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'drag_drop', 'dd')
+        q['draggable_items'] = [{'id': f"item{n}", 'text': self.sentence(2, 5)} for n in range(4)]
+        q['drop_zones'] = [{'id': f"zone{n}", 'label': self.sentence(1, 3)} for n in range(4)]
+        q['correct_matches'] = {f"item{n}": f"zone{n}" for n in range(4)}
+        return self.finish(q, chapter_id)
+
+    def make_flashcard(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'flashcard', 'fc')
+        # Les flashcards ont front/back à la place de question/explanation
+        q['front'] = q.pop('question')
+        q['back'] = self.text(self.explanation_length())
+        q['hint'] = self.sentence(2, 5)
+        q['section_ref'] = f"{chapter_id}.{self.rng.randint(1, 3)}"
+        q['tags'] = self.rng.sample(TAGS, self.rng.randint(1, 3)) + ['flashcard']
+        q['time_estimate'] = 60
+        return q
+
+    def make_animation(self, chapter_id, index):
+        q = self.base(chapter_id, index, 'animation', 'anim')
+        q['animation_type'] = self.rng.choice(ANIMATIONS)
+        q['animation_description'] = self.text(self.rng.randint(80, 200))
+        q['animation_params'] = {
+            'param': {'label': "Paramètre :", 'min': 0, 'max': 100,
+                      'default': 50, 'step': 5, 'unit': " px"}
+        }
+        q['options'] = [self.sentence(4, 10) for _ in range(4)]
+        q['correct_answer'] = self.rng.randrange(4)
+        return self.finish(q, chapter_id)
+
+    # ------------------------------------------------------------------
+    # Banque
+    # ------------------------------------------------------------------
+
+    def chapter_sizes(self):
+        base, extra = divmod(self.count, self.chapters)
+        return [base + (1 if i < extra else 0) for i in range(self.chapters)]
+
+    def chapter_header(self, chapter_id):
+        return {
+            'chapter_id': chapter_id,
+            'chapter_number': str(chapter_id),
+            'chapter_title': f"Chapitre synthétique {chapter_id}",
+            'chapter_description': self.sentence(),
+            'section_reference': f"Sections {chapter_id}.1-{chapter_id}.3",
+            'key_concepts': self.rng.sample(WORDS, 5),
+        }
+
+    def iter_chapters(self):
+        """Itère sur (en-tête de chapitre, générateur de questions)"""
+        for chapter_id, size in enumerate(self.chapter_sizes(), 1):
+            header = self.chapter_header(chapter_id)
+            yield header, (self.make_question(chapter_id, i) for i in range(1, size + 1))
+
+    def course_info(self):
+        return {
+            'title': "Banque synthétique",
+            'course_code': "BENCH",
+            'total_questions': self.count,
+            'total_chapters': self.chapters,
+        }
+
+
+def write_bank(path, count, seed=42, chapters=CHAPTER_COUNT):
+    """
+    Écrit une banque synthétique au format questions.json (ou NDJSON si
+    le fichier se termine par .ndjson) et retourne ses compteurs par type.
+    """
+    path = Path(path)
+    bank = SyntheticBank(count, seed, chapters)
+    types = Counter()
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.suffix == '.ndjson':
+            for header, questions in bank.iter_chapters():
+                for q in questions:
+                    types[q.get('type', 'hotspot')] += 1
+                    f.write(question_line(header['chapter_id'], q) + '\n')
+            return dict(types)
+
+        f.write('{"course_info": ')
+        f.write(json.dumps(bank.course_info(), ensure_ascii=False))
+        f.write(', "chapters": [')
+        for n, (header, questions) in enumerate(bank.iter_chapters()):
+            if n:
+                f.write(', ')
+            f.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "questions": [')
+            for i, q in enumerate(questions):
+                types[q.get('type', 'hotspot')] += 1
+                f.write((', ' if i else '') + json.dumps(q, ensure_ascii=False))
+            f.write(']}')
+        metadata = {'total_questions': count, 'generator': 'synthetic_bank.py', 'seed': seed}
+        f.write('], "metadata": ' + json.dumps(metadata, ensure_ascii=False) + '}')
+    return dict(types)
+
+
+@instrumented("synthetic_bank")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère une banque de questions synthétique")
+    parser.add_argument('count', type=int, help="nombre de questions")
+    parser.add_argument('--seed', type=int, default=42, help="graine du générateur (défaut: 42)")
+    parser.add_argument('--chapters', type=int, default=CHAPTER_COUNT, help="nombre de chapitres")
+    parser.add_argument('-o', '--output', type=Path, default=Path("synthetic_questions.json"),
+                        help="fichier de sortie (.json ou .ndjson)")
+    args = parser.parse_args(argv)
+
+    print("🧪 GÉNÉRATION D'UNE BANQUE SYNTHÉTIQUE")
+    print("=" * 50)
+
+    types = write_bank(args.output, args.count, args.seed, args.chapters)
+    for q_type, count in sorted(types.items(), key=lambda item: -item[1]):
+        print(f"  • {q_type}: {count}")
+    print(f"✅ {args.count} questions écrites dans {args.output} "
+          f"({args.output.stat().st_size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Moteurs de synthèse vocale (TTS) des outils audio
+
+Chaque moteur expose la même interface :
+
+    backend.name          identifiant (clé de cache, option --backend)
+    backend.extension     format du fichier produit ('mp3', 'wav')
+    backend.settings()    réglages qui influencent le son (voix, débit...) ;
+                          ils entrent dans la clé du cache audio
+    await backend.synthesize(text, path)
+
+Moteurs disponibles :
+
+    edge     edge-tts (voix neuronales Microsoft, réseau requis)
+    gtts     gTTS (Google, réseau requis)
+    espeak   espeak-ng en local (hors ligne, WAV)
+    stub     silence WAV de durée proportionnelle au texte (tests, hors ligne)
+
+Les moteurs synchrones sont exécutés dans un thread pour ne pas bloquer la
+boucle asyncio. Avec --backend auto, tous les moteurs installés sont gardés
+dans l'ordre de AUTO_ORDER : si la synthèse échoue (hors ligne, erreur du
+service), synthesize_with_fallback() réessaie avec le moteur suivant.
+
+AudioCache retient, pour chaque fichier produit, le hash du texte, du moteur
+et de ses réglages (.build-cache/audio_cache.json) : un fichier dont la clé
+n'a pas changé n'est pas resynthétisé.
+"""
+
+import abc
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import wave
+from pathlib import Path
+
+from bank_io import atomic_write_text
+from bank_utils import CACHE_DIR, content_hash, file_signature, project_path
+
+try:
+    import edge_tts
+except ImportError:
+    edge_tts = None
+
+try:
+    from gtts import gTTS
+except ImportError:
+    gTTS = None
+
+ESPEAK_COMMANDS = ('espeak-ng', 'espeak')
+
+AUDIO_CACHE_FILE = CACHE_DIR / "audio_cache.json"
+AUDIO_CACHE_VERSION = 1
+
+
+class TTSError(RuntimeError):
+    """Échec de synthèse d'un texte"""
+
+
+class TTSBackend(abc.ABC):
+    name = None
+    extension = 'mp3'
+
+    def settings(self):
+        return {}
+
+    def cache_identity(self):
+        """Ce qui, avec le texte, détermine le fichier produit"""
+        return {'backend': self.name, 'settings': self.settings()}
+
+    @classmethod
+    def available(cls):
+        return True
+
+    @abc.abstractmethod
+    async def synthesize(self, text, path):
+        """Écrit dans `path` l'audio de `text`"""
+
+
+class EdgeTTSBackend(TTSBackend):
+    name = 'edge'
+
+    # fr-FR-DeniseNeural est une voix féminine douce et chaleureuse
+    def __init__(self, voice="fr-FR-DeniseNeural", rate="+0%"):
+        self.voice = voice
+        self.rate = rate
+
+    def settings(self):
+        return {'voice': self.voice, 'rate': self.rate}
+
+    @classmethod
+    def available(cls):
+        return edge_tts is not None
+
+    async def synthesize(self, text, path):
+        communicate = edge_tts.Communicate(text, self.voice, rate=self.rate)
+        await communicate.save(str(path))
+
+
+class GTTSBackend(TTSBackend):
+    name = 'gtts'
+
+    def __init__(self, lang='fr', slow=False):
+        self.lang = lang
+        self.slow = slow
+
+    def settings(self):
+        return {'lang': self.lang, 'slow': self.slow}
+
+    @classmethod
+    def available(cls):
+        return gTTS is not None
+
+    async def synthesize(self, text, path):
+        tts = gTTS(text=text, lang=self.lang, slow=self.slow)
+        await asyncio.to_thread(tts.save, str(path))
+
+
+class EspeakBackend(TTSBackend):
+    name = 'espeak'
+    extension = 'wav'
+
+    def __init__(self, voice='fr', speed=150):
+        self.voice = voice
+        self.speed = speed
+        self.command = next((c for c in ESPEAK_COMMANDS if shutil.which(c)), None)
+
+    def settings(self):
+        return {'voice': self.voice, 'speed': self.speed}
+
+    @classmethod
+    def available(cls):
+        return any(shutil.which(c) for c in ESPEAK_COMMANDS)
+
+    async def synthesize(self, text, path):
+        process = await asyncio.create_subprocess_exec(
+            self.command, '-v', self.voice, '-s', str(self.speed), '-w', str(path), '--stdin',
+            stdin=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate(text.encode('utf-8'))
+        if process.returncode != 0:
+            raise TTSError(f"{self.command}: {stderr.decode('utf-8', 'replace').strip()}")
+
+
+class StubBackend(TTSBackend):
+    """Moteur factice : silence de durée proportionnelle au texte (tests hors ligne)"""
+    name = 'stub'
+    extension = 'wav'
+
+    SAMPLE_RATE = 8000
+    CHARS_PER_SECOND = 15
+
+    def settings(self):
+        return {'sample_rate': self.SAMPLE_RATE, 'chars_per_second': self.CHARS_PER_SECOND}
+
+    async def synthesize(self, text, path):
+        frames = max(1, len(text) * self.SAMPLE_RATE // self.CHARS_PER_SECOND)
+        with wave.open(str(path), 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(1)
+            f.setframerate(self.SAMPLE_RATE)
+            f.writeframes(b'\x80' * frames)
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (EdgeTTSBackend, GTTSBackend, EspeakBackend, StubBackend)
+}
+
+# Ordre de préférence de --backend auto (le moteur factice n'est jamais choisi seul)
+AUTO_ORDER = ['edge', 'gtts', 'espeak']
+
+
+def get_backends(name='auto'):
+    """
+    Moteurs à essayer, dans l'ordre : le moteur demandé, ou pour 'auto'
+    tous les moteurs installés de AUTO_ORDER (le premier est le préféré)
+    """
+    if name == 'auto':
+        backends = [BACKENDS[candidate]() for candidate in AUTO_ORDER if BACKENDS[candidate].available()]
+        if not backends:
+            raise TTSError("aucun moteur TTS installé (pip install edge-tts gTTS, ou espeak-ng)")
+        return backends
+    if name not in BACKENDS:
+        raise TTSError(f"moteur TTS inconnu: {name} (choix: {', '.join(BACKENDS)})")
+    if not BACKENDS[name].available():
+        raise TTSError(f"moteur TTS {name} non installé")
+    return [BACKENDS[name]()]
+
+
+async def synthesize_to(backend, text, path):
+    """
+    Synthétise `text` dans `path` de façon atomique : le fichier final
+    n'apparaît qu'une fois la synthèse terminée (jamais de MP3 tronqué).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=path.suffix)
+    os.close(fd)
+    try:
+        await backend.synthesize(text, tmp_name)
+        if os.path.getsize(tmp_name) == 0:
+            raise TTSError(f"{backend.name}: fichier vide")
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+async def synthesize_with_fallback(backends, text, path_for):
+    """
+    Synthétise `text` avec le premier moteur de `backends` qui réussit ;
+    path_for(moteur) donne le fichier à écrire (son extension dépend du
+    moteur). Retourne (moteur, chemin) ; TTSError si tous ont échoué.
+    """
+    errors = []
+    for backend in backends:
+        path = path_for(backend)
+        try:
+            await synthesize_to(backend, text, path)
+        except Exception as e:
+            errors.append(f"{backend.name}: {e}")
+            continue
+        return backend, path
+    raise TTSError('; '.join(errors))
+
+
+def audio_key(text, backend):
+    """Clé de contenu d'un fichier audio : texte + moteur + réglages"""
+    return content_hash({'text': text, **backend.cache_identity()})
+
+
+class AudioCache:
+    """Clés des fichiers audio déjà produits, par chemin"""
+
+    def __init__(self, path=AUDIO_CACHE_FILE):
+        self.path = Path(path)
+        self.files = {}
+
+    @classmethod
+    def load(cls, path=AUDIO_CACHE_FILE):
+        cache = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cache
+        if stored.get('version') == AUDIO_CACHE_VERSION:
+            cache.files = stored.get('files', {})
+        return cache
+
+    def is_fresh(self, path, key):
+        """Le fichier existe, n'a pas été touché depuis sa synthèse et a la même clé"""
+        entry = self.files.get(project_path(path))
+        return entry is not None and entry['key'] == key and file_signature(path) == entry['signature']
+
+    def record(self, path, key):
+        self.files[project_path(path)] = {'key': key, 'signature': file_signature(path)}
+
+    def save(self):
+        atomic_write_text(self.path, json.dumps(
+            {'version': AUDIO_CACHE_VERSION, 'files': self.files}, ensure_ascii=False, indent=2
+        ))
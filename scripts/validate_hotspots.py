@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Vérification de la géométrie des questions à image (hotspots)
+
+Les dimensions réelles de chaque image référencée sont lues dans son
+en-tête (scripts/image_probe.py, sans décoder les pixels), toutes les
+images en parallèle. Pour chaque question :
+
+    erreur          image manquante ou illisible ; hotspot qui sort de
+                    l'image ; image_dimensions différente de l'image réelle
+    avertissement   hotspots qui se chevauchent (un clic peut tomber sur
+                    deux zones) ; image_dimensions absente
+
+Avec --fix, image_dimensions absente est complétée d'après l'image. Une
+image_dimensions différente de l'image réelle est corrigée, et les
+hotspots (exprimés dans le repère déclaré) sont remis à l'échelle dans
+le même rapport, pour rester sur les mêmes éléments de la figure.
+
+Usage :
+    python3 scripts/validate_hotspots.py [--fix]
+"""
+
+import argparse
+import math
+import sys
+
+from bank_io import edit_bank, load_bank
+from bank_profile import instrumented, phase
+from bank_utils import BANK_FILE, PROJECT_DIR
+from image_probe import probe_images
+
+MAX_MESSAGES = 50
+
+
+def image_path(image_url):
+    return PROJECT_DIR / image_url.removeprefix('./')
+
+
+def check_hotspots(question, size):
+    """Erreurs et avertissements de géométrie d'une question, pour une image de taille `size`"""
+    errors = []
+    warnings = []
+    q_id = question.get('id', 'NO_ID')
+    width, height = size
+
+    dims = question.get('image_dimensions')
+    if not dims:
+        warnings.append(f"{q_id}: image_dimensions absente (image {width}x{height})")
+    elif (dims.get('width'), dims.get('height')) != (width, height):
+        errors.append(f"{q_id}: image_dimensions {dims.get('width')}x{dims.get('height')} "
+                      f"≠ image réelle {width}x{height}")
+
+    hotspots = question.get('hotspots') or []
+    for h in hotspots:
+        x, y, r = h.get('x', 0), h.get('y', 0), h.get('radius', 0)
+        if x - r < 0 or y - r < 0 or x + r > width or y + r > height:
+            errors.append(f"{q_id}: hotspot '{h.get('id')}' ({x}, {y}, r={r}) "
+                          f"hors de l'image {width}x{height}")
+
+    for i, a in enumerate(hotspots):
+        for b in hotspots[i + 1:]:
+            distance = math.hypot(a.get('x', 0) - b.get('x', 0), a.get('y', 0) - b.get('y', 0))
+            if distance < a.get('radius', 0) + b.get('radius', 0):
+                warnings.append(f"{q_id}: hotspots '{a.get('id')}' et '{b.get('id')}' se chevauchent")
+    return errors, warnings
+
+
+def image_questions(data):
+    return [
+        q for chapter in data['chapters'] for q in chapter['questions']
+        if q.get('image_url') and (q.get('hotspots') or q.get('image_dimensions'))
+    ]
+
+
+def validate_hotspots(data):
+    """Retourne (erreurs, avertissements, {image_url: (largeur, hauteur)})"""
+    questions = image_questions(data)
+    urls = {q['image_url'] for q in questions}
+    sizes, failures = probe_images([image_path(url) for url in urls])
+
+    errors = []
+    warnings = []
+    for q in questions:
+        path = image_path(q['image_url'])
+        if path in failures:
+            errors.append(f"{q.get('id', 'NO_ID')}: image {q['image_url']} illisible ({failures[path]})")
+            continue
+        q_errors, q_warnings = check_hotspots(q, sizes[path])
+        errors.extend(q_errors)
+        warnings.extend(q_warnings)
+    return errors, warnings, {url: sizes[image_path(url)] for url in urls if image_path(url) in sizes}
+
+
+def rescale_hotspots(question, size):
+    """Passe les hotspots du repère image_dimensions à une image de taille `size`"""
+    dims = question['image_dimensions']
+    scale_x = size[0] / dims['width']
+    scale_y = size[1] / dims['height']
+    # Rayon : le plus petit rapport, pour que la zone reste dans la figure
+    scale_r = min(scale_x, scale_y)
+    for h in question.get('hotspots') or []:
+        for key, scale in (('x', scale_x), ('y', scale_y), ('radius', scale_r)):
+            if key in h:
+                h[key] = round(h[key] * scale)
+
+
+def fill_image_dimensions(data, sizes):
+    """
+    Complète / corrige image_dimensions d'après les tailles sondées, en
+    remettant les hotspots à l'échelle quand les dimensions changent ;
+    retourne les IDs modifiés
+    """
+    fixed = []
+    for q in image_questions(data):
+        size = sizes.get(q['image_url'])
+        if size is None:
+            continue
+        dims = {'width': size[0], 'height': size[1]}
+        current = q.get('image_dimensions')
+        if current == dims:
+            continue
+        if current and current.get('width') and current.get('height'):
+            rescale_hotspots(q, size)
+        q['image_dimensions'] = dims
+        fixed.append(q.get('id'))
+    return fixed
+
+
+def print_messages(icon, messages):
+    for message in messages[:MAX_MESSAGES]:
+        print(f"  {icon} {message}")
+    if len(messages) > MAX_MESSAGES:
+        print(f"  ... et {len(messages) - MAX_MESSAGES} autres")
+
+
+@instrumented("validate_hotspots")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vérification des images et hotspots")
+    parser.add_argument('--fix', action='store_true',
+                        help="complète / corrige image_dimensions d'après les images "
+                             "(hotspots remis à l'échelle)")
+    args = parser.parse_args(argv)
+
+    print("🎯 VÉRIFICATION DES IMAGES ET HOTSPOTS")
+    print("=" * 50)
+
+    if args.fix:
+        with edit_bank(BANK_FILE) as data:
+            with phase('validate'):
+                _, _, sizes = validate_hotspots(data)
+            fixed = fill_image_dimensions(data, sizes)
+        print(f"📐 image_dimensions complétée ou corrigée pour {len(fixed)} question(s)")
+
+    data = load_bank()
+    with phase('validate'):
+        errors, warnings, sizes = validate_hotspots(data)
+
+    print(f"🖼️  {len(sizes)} image(s) sondée(s), {len(image_questions(data))} question(s) vérifiée(s)")
+    print_messages('❌', errors)
+    print_messages('⚠️ ', warnings)
+    print(f"{'❌' if errors else '✅'} {len(errors)} erreur(s), {len(warnings)} avertissement(s)")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,35 @@
 Script de validation de qualité pour toutes les questions
 """
 
+import argparse
+import hashlib
 import json
+import os
+import pickle
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
 
-# Types de questions valides
-VALID_TYPES = ['qcm', 'vrai_faux', 'matching', 'numerical', 'interpretation']
+from bank_io import atomic_write_text
+from bank_ndjson import iter_questions
+from bank_profile import instrumented, phase
+from bank_types import QUESTION_TYPES
+from bank_utils import CACHE_DIR, bytes_hash
+
+# Cache de validation : résultats par hash de contenu de question (seules
+# les questions nouvelles ou modifiées sont revalidées) et rapport complet
+# indexé par le hash du fichier (un fichier inchangé n'est même pas relu) ;
+# RULES_HASH l'invalide dès que les règles (ce fichier) changent
+VALIDATION_CACHE_FILE = CACHE_DIR / "validation_cache.json"
+RULES_HASH = bytes_hash(Path(__file__).read_bytes())
+
+# En dessous de ce nombre de questions à valider, démarrer le pool coûte
+# plus que de les valider sur place (voir validate_pending)
+PARALLEL_THRESHOLD = 10_000
+
+# Types de questions valides (les neuf types affichés par l'application)
+VALID_TYPES = QUESTION_TYPES
 
 # Niveaux de difficulté valides
 VALID_DIFFICULTIES = ['easy', 'medium', 'hard']
@@ -17,13 +39,124 @@ VALID_DIFFICULTIES = ['easy', 'medium', 'hard']
 # Champs requis pour tous les types
 REQUIRED_FIELDS = ['id', 'type', 'question', 'difficulty']
 
+# Nombre de messages affichés dans le rapport (et conservés en mode flux)
+REPORT_LIMIT = 20
+
+
+class IdBloomFilter:
+    """
+    Filtre de Bloom de taille fixe pour la détection des IDs dupliqués en
+    mode flux : add() retourne True si l'ID a *peut-être* déjà été vu.
+    Les candidats sont confirmés par une seconde lecture du fichier.
+    """
+
+    def __init__(self, size_bits=1 << 23, hash_count=7):
+        self.size = size_bits
+        self.hash_count = hash_count
+        self.bits = bytearray(size_bits // 8)
+
+    def add(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        seen = True
+        for i in range(self.hash_count):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                seen = False
+                self.bits[byte] |= mask
+        return seen
+
+
 class QuestionValidator:
-    def __init__(self):
+    def __init__(self, error_stream=None, check_ids=True):
+        """
+        error_stream : si fourni (mode flux), chaque erreur ou avertissement
+        y est écrit dès qu'il est trouvé ; seuls les REPORT_LIMIT premiers
+        sont gardés en mémoire et les IDs passent par un filtre de Bloom.
+        check_ids : désactive la détection des doublons (validation par
+        morceaux, la passe globale étant faite à part).
+        """
+        self.check_ids = check_ids
         self.errors = []
         self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
+        self.error_stream = error_stream
         self.stats = defaultdict(int)
         self.duplicate_ids = set()
         self.all_ids = set()
+        self.id_filter = IdBloomFilter() if error_stream is not None else None
+        self.duplicate_candidates = set()
+
+    def error(self, message):
+        self.error_count += 1
+        if self.error_stream is not None:
+            self.error_stream.write(f"ERREUR {message}\n")
+            if len(self.errors) >= REPORT_LIMIT:
+                return
+        self.errors.append(message)
+
+    def warn(self, message):
+        self.warning_count += 1
+        if self.error_stream is not None:
+            self.error_stream.write(f"AVERTISSEMENT {message}\n")
+            if len(self.warnings) >= REPORT_LIMIT:
+                return
+        self.warnings.append(message)
+
+    def summary(self):
+        """État du rapport (sérialisable en JSON), pour le cache de validation"""
+        return {
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'error_count': self.error_count,
+            'warning_count': self.warning_count,
+            'stats': dict(self.stats),
+            'duplicate_ids': sorted(self.duplicate_ids),
+        }
+
+    @classmethod
+    def from_summary(cls, summary):
+        validator = cls()
+        validator.errors = summary['errors']
+        validator.warnings = summary['warnings']
+        validator.error_count = summary['error_count']
+        validator.warning_count = summary['warning_count']
+        validator.stats.update(summary['stats'])
+        validator.duplicate_ids = set(summary['duplicate_ids'])
+        return validator
+
+    def check_duplicate(self, q_id):
+        """Détection des IDs dupliqués (exacte, ou par filtre de Bloom en mode flux)"""
+        if not self.check_ids:
+            return
+        if self.id_filter is not None:
+            if self.id_filter.add(q_id):
+                self.duplicate_candidates.add(q_id)
+            return
+
+        if q_id in self.all_ids:
+            self.duplicate_ids.add(q_id)
+            self.error(f"[{q_id}] ID dupliqué!")
+        else:
+            self.all_ids.add(q_id)
+
+    def confirm_duplicates(self, questions):
+        """Mode flux : recompte exactement les IDs candidats sur une seconde lecture"""
+        if not self.duplicate_candidates:
+            return
+        occurrences = defaultdict(int)
+        for _, question in questions:
+            q_id = question.get('id', 'NO_ID')
+            if q_id in self.duplicate_candidates:
+                occurrences[q_id] += 1
+        for q_id in sorted(self.duplicate_candidates):
+            for _ in range(occurrences[q_id] - 1):
+                self.duplicate_ids.add(q_id)
+                self.error(f"[{q_id}] ID dupliqué!")
+        self.duplicate_candidates.clear()
 
     def validate_structure(self, question, chapter_id):
         """Valide la structure de base de la question"""
@@ -32,27 +165,23 @@ class QuestionValidator:
         # Vérifie les champs requis
         for field in REQUIRED_FIELDS:
             if field not in question:
-                self.errors.append(f"[{q_id}] Champ manquant: {field}")
+                self.error(f"[{q_id}] Champ manquant: {field}")
                 return False
 
         # Vérifie le type
         if question['type'] not in VALID_TYPES:
-            self.errors.append(f"[{q_id}] Type invalide: {question['type']}")
+            self.error(f"[{q_id}] Type invalide: {question['type']}")
 
         # Vérifie la difficulté
         if question['difficulty'] not in VALID_DIFFICULTIES:
-            self.errors.append(f"[{q_id}] Difficulté invalide: {question['difficulty']}")
+            self.error(f"[{q_id}] Difficulté invalide: {question['difficulty']}")
 
         # Vérifie que la question n'est pas vide
         if len(question['question'].strip()) < 10:
-            self.warnings.append(f"[{q_id}] Question trop courte: '{question['question']}'")
+            self.warn(f"[{q_id}] Question trop courte: '{question['question']}'")
 
         # Vérifie les IDs dupliqués
-        if q_id in self.all_ids:
-            self.duplicate_ids.add(q_id)
-            self.errors.append(f"[{q_id}] ID dupliqué!")
-        else:
-            self.all_ids.add(q_id)
+        self.check_duplicate(q_id)
 
         return True
 
@@ -61,72 +190,72 @@ class QuestionValidator:
         q_id = question.get('id', 'NO_ID')
 
         if 'options' not in question:
-            self.errors.append(f"[{q_id}] QCM sans options")
+            self.error(f"[{q_id}] QCM sans options")
             return
 
         if 'correct_answer' not in question:
-            self.errors.append(f"[{q_id}] QCM sans correct_answer")
+            self.error(f"[{q_id}] QCM sans correct_answer")
             return
 
         options = question['options']
         if len(options) < 2:
-            self.errors.append(f"[{q_id}] QCM avec moins de 2 options")
+            self.error(f"[{q_id}] QCM avec moins de 2 options")
 
         # Vérifie que la réponse correcte est un index valide
         correct = question['correct_answer']
         if not isinstance(correct, int):
-            self.errors.append(f"[{q_id}] correct_answer doit être un entier (index), pas '{type(correct).__name__}'")
+            self.error(f"[{q_id}] correct_answer doit être un entier (index), pas '{type(correct).__name__}'")
         elif correct < 0 or correct >= len(options):
-            self.errors.append(f"[{q_id}] correct_answer index {correct} invalide (options: {len(options)})")
+            self.error(f"[{q_id}] correct_answer index {correct} invalide (options: {len(options)})")
 
     def validate_vrai_faux(self, question):
         """Valide une question Vrai/Faux"""
         q_id = question.get('id', 'NO_ID')
 
         if 'correct_answer' not in question:
-            self.errors.append(f"[{q_id}] Vrai/Faux sans correct_answer")
+            self.error(f"[{q_id}] Vrai/Faux sans correct_answer")
             return
 
         if not isinstance(question['correct_answer'], bool):
-            self.errors.append(f"[{q_id}] Vrai/Faux: correct_answer doit être boolean")
+            self.error(f"[{q_id}] Vrai/Faux: correct_answer doit être boolean")
 
     def validate_matching(self, question):
         """Valide une question de correspondance"""
         q_id = question.get('id', 'NO_ID')
 
         if 'pairs' not in question:
-            self.errors.append(f"[{q_id}] Matching sans pairs")
+            self.error(f"[{q_id}] Matching sans pairs")
             return
 
         pairs = question['pairs']
         if len(pairs) < 2:
-            self.errors.append(f"[{q_id}] Matching avec moins de 2 paires")
+            self.error(f"[{q_id}] Matching avec moins de 2 paires")
 
         # Vérifie la structure des paires
         for i, pair in enumerate(pairs):
             if 'left' not in pair or 'right' not in pair:
-                self.errors.append(f"[{q_id}] Paire {i} incomplète (manque left ou right)")
+                self.error(f"[{q_id}] Paire {i} incomplète (manque left ou right)")
 
     def validate_numerical(self, question):
         """Valide une question numérique"""
         q_id = question.get('id', 'NO_ID')
 
         if 'correct_answer' not in question:
-            self.errors.append(f"[{q_id}] Numerical sans correct_answer")
+            self.error(f"[{q_id}] Numerical sans correct_answer")
             return
 
         if not isinstance(question['correct_answer'], (int, float)):
-            self.errors.append(f"[{q_id}] Numerical: correct_answer doit être un nombre")
+            self.error(f"[{q_id}] Numerical: correct_answer doit être un nombre")
 
         if 'tolerance' in question and not isinstance(question['tolerance'], (int, float)):
-            self.errors.append(f"[{q_id}] Numerical: tolerance doit être un nombre")
+            self.error(f"[{q_id}] Numerical: tolerance doit être un nombre")
 
     def validate_interpretation(self, question):
         """Valide une question d'interprétation"""
         q_id = question.get('id', 'NO_ID')
 
         if 'key_points' not in question:
-            self.warnings.append(f"[{q_id}] Interpretation sans key_points")
+            self.warn(f"[{q_id}] Interpretation sans key_points")
 
     def validate_content(self, question):
         """Valide le contenu spécifique selon le type"""
@@ -149,15 +278,15 @@ class QuestionValidator:
 
         # Vérifie la présence d'une explication
         if 'explanation' not in question or not question['explanation']:
-            self.warnings.append(f"[{q_id}] Pas d'explication")
+            self.warn(f"[{q_id}] Pas d'explication")
 
         # Vérifie la référence à la section du cours
         if 'section_ref' not in question or not question['section_ref']:
-            self.warnings.append(f"[{q_id}] Pas de référence de section")
+            self.warn(f"[{q_id}] Pas de référence de section")
 
         # Vérifie les tags
         if 'tags' not in question or not question['tags'] or len(question['tags']) == 0:
-            self.warnings.append(f"[{q_id}] Pas de tags associés")
+            self.warn(f"[{q_id}] Pas de tags associés")
 
     def validate_question(self, question, chapter_id):
         """Valide complètement une question"""
@@ -193,24 +322,24 @@ class QuestionValidator:
                 print(f"  {emoji} {diff.capitalize()}: {count}")
 
         # Erreurs
-        if self.errors:
-            print(f"\n❌ ERREURS CRITIQUES ({len(self.errors)}):")
+        if self.error_count:
+            print(f"\n❌ ERREURS CRITIQUES ({self.error_count}):")
             print("━" * 70)
-            for error in self.errors[:20]:  # Limite à 20 pour lisibilité
+            for error in self.errors[:REPORT_LIMIT]:  # Limite à 20 pour lisibilité
                 print(f"  {error}")
-            if len(self.errors) > 20:
-                print(f"  ... et {len(self.errors) - 20} autres erreurs")
+            if self.error_count > REPORT_LIMIT:
+                print(f"  ... et {self.error_count - REPORT_LIMIT} autres erreurs")
         else:
             print(f"\n✅ Aucune erreur critique")
 
         # Avertissements
-        if self.warnings:
-            print(f"\n⚠️  AVERTISSEMENTS ({len(self.warnings)}):")
+        if self.warning_count:
+            print(f"\n⚠️  AVERTISSEMENTS ({self.warning_count}):")
             print("━" * 70)
-            for warning in self.warnings[:20]:
+            for warning in self.warnings[:REPORT_LIMIT]:
                 print(f"  {warning}")
-            if len(self.warnings) > 20:
-                print(f"  ... et {len(self.warnings) - 20} autres avertissements")
+            if self.warning_count > REPORT_LIMIT:
+                print(f"  ... et {self.warning_count - REPORT_LIMIT} autres avertissements")
         else:
             print(f"\n✅ Aucun avertissement")
 
@@ -224,43 +353,187 @@ class QuestionValidator:
         print("\n" + "=" * 70)
 
         # Verdict final
-        if not self.errors:
+        if not self.error_count:
             print("✨ VALIDATION RÉUSSIE - Toutes les questions sont valides!")
         else:
-            print(f"⚠️  VALIDATION ÉCHOUÉE - {len(self.errors)} erreurs à corriger")
+            print(f"⚠️  VALIDATION ÉCHOUÉE - {self.error_count} erreurs à corriger")
 
         print("=" * 70 + "\n")
 
-        return len(self.errors) == 0
+        return self.error_count == 0
 
-def validate_questions_file(file_path):
-    """Valide toutes les questions du fichier"""
-    print(f"📖 Lecture du fichier: {file_path}")
+def validate_questions_stream(file_path, error_stream):
+    """
+    Valide question par question (mode flux, mémoire bornée).
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    Conçu pour le format NDJSON (data/questions.ndjson) : seule la question
+    courante est en mémoire et chaque erreur est écrite dans error_stream
+    dès qu'elle est trouvée. Les IDs dupliqués sont détectés par un filtre
+    de Bloom puis confirmés par une seconde lecture du fichier.
+    """
+    print(f"📖 Lecture en flux du fichier: {file_path}")
 
-    validator = QuestionValidator()
+    validator = QuestionValidator(error_stream=error_stream)
 
     print(f"🔍 Validation en cours...")
-    for chapter in data['chapters']:
-        chapter_id = chapter['chapter_id']
-        chapter_title = chapter['chapter_title']
-
-        print(f"  📚 Chapitre {chapter_id}: {chapter_title} ({len(chapter['questions'])} questions)")
-
-        for question in chapter['questions']:
+    with phase('validate'):
+        current_chapter = None
+        for chapter_id, question in iter_questions(file_path):
+            if chapter_id != current_chapter:
+                current_chapter = chapter_id
+                print(f"  📚 Chapitre {chapter_id}")
             validator.validate_question(question, chapter_id)
 
-    success = validator.print_report()
-
-    return success
+        validator.confirm_duplicates(iter_questions(file_path))
+    error_stream.flush()
+
+    return validator.print_report()
+
+def validate_chunk(entries):
+    """
+    Valide un morceau de questions dans un processus du pool.
+
+    entries : liste de (chapter_id, question). Retourne, dans l'ordre, les
+    erreurs, avertissements et statistiques de chaque question, sans
+    détection des doublons (faite ensuite sur l'ensemble de la banque).
+    """
+    results = []
+    for chapter_id, question in entries:
+        validator = QuestionValidator(check_ids=False)
+        validator.validate_question(question, chapter_id)
+        results.append((validator.errors, validator.warnings, dict(validator.stats)))
+    return results
+
+def question_key(question):
+    """
+    Clé de cache d'une question : hash de sa sérialisation pickle, deux fois
+    moins chère à calculer qu'un JSON canonique (content_hash). Deux contenus
+    égaux peuvent rarement avoir deux clés (simple revalidation), jamais
+    l'inverse.
+    """
+    return hashlib.blake2b(pickle.dumps(question, protocol=5), digest_size=16).hexdigest()
+
+# Questions à valider, transmises une seule fois à chaque processus du pool
+# (héritées sans copie avec fork) ; les tâches ne portent que des positions
+_pool_entries = None
+
+def _init_pool(entries):
+    global _pool_entries
+    _pool_entries = entries
+
+def validate_range(bounds):
+    start, stop = bounds
+    return validate_chunk(_pool_entries[start:stop])
+
+def validate_pending(entries, workers):
+    """
+    Valide les questions (chapter_id, question) et retourne leurs résultats
+    dans l'ordre, sur place ou, au-delà de PARALLEL_THRESHOLD questions,
+    dans un pool de processus. Mesures sur 20 000 questions synthétiques :
+    environ 24 µs pour valider une question, 9 µs pour rapatrier son
+    résultat et 30 ms pour démarrer un processus ; le pool est rentable
+    au-delà d'environ 10 000 questions avec 4 processus (18 000 avec 2).
+    """
+    if workers == 1 or len(entries) < PARALLEL_THRESHOLD:
+        return validate_chunk(entries)
+
+    chunk_size = max(1, -(-len(entries) // (workers * 4)))
+    bounds = [(i, min(i + chunk_size, len(entries))) for i in range(0, len(entries), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool, initargs=(entries,)) as pool:
+        for chunk_results in pool.map(validate_range, bounds):
+            results.extend(chunk_results)
+    return results
+
+def load_validation_cache(cache_file):
+    """Cache de validation ({'file', 'report', 'results'}), vide si absent ou périmé"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if cache.get('rules') != RULES_HASH:
+        return {}
+    return cache
+
+def validate_questions_parallel(file_path, workers=None, cache_file=VALIDATION_CACHE_FILE):
+    """
+    Valide toutes les questions avec un cache par hash de contenu : seules
+    les questions nouvelles ou modifiées depuis la dernière validation sont
+    revalidées (dans un pool de processus s'il y en a beaucoup), puis une
+    passe globale agrège les résultats et détecte les IDs dupliqués. Un
+    fichier inchangé n'est même pas relu (rapport en cache).
+    cache_file=None désactive le cache.
+    """
+    print(f"📖 Lecture du fichier: {file_path}")
 
-if __name__ == "__main__":
+    with phase('load'):
+        file_hash = bytes_hash(Path(file_path).read_bytes())
+        cache = load_validation_cache(cache_file) if cache_file else {}
+    if cache.get('file') == file_hash and cache.get('report'):
+        print("♻️  Fichier inchangé depuis la dernière validation (rapport en cache)")
+        return QuestionValidator.from_summary(cache['report']).print_report()
+
+    with phase('load'):
+        entries = list(iter_questions(file_path))
+    with phase('transform'):
+        keys = [question_key(question) for _, question in entries]
+
+    results = cache.get('results', {})
+    pending = {}
+    for key, entry in zip(keys, entries):
+        if key not in results:
+            pending.setdefault(key, entry)
+    cached = sum(1 for key in keys if key in results)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"🔍 Validation en cours... ({cached} en cache, {len(pending)} à valider)")
+    with phase('validate'):
+        results.update(zip(pending, validate_pending(list(pending.values()), workers)))
+
+        # Passe globale : agrégation dans l'ordre de la banque et doublons d'IDs
+        validator = QuestionValidator()
+        for key, (_, question) in zip(keys, entries):
+            errors, warnings, stats = results[key]
+            for error in errors:
+                validator.error(error)
+            for warning in warnings:
+                validator.warn(warning)
+            for stat, value in stats.items():
+                validator.stats[stat] += value
+            if stats.get('total'):
+                validator.check_duplicate(question.get('id', 'NO_ID'))
+
+    if cache_file:
+        # Seuls les résultats des questions actuelles sont conservés
+        atomic_write_text(cache_file, json.dumps({
+            'rules': RULES_HASH,
+            'file': file_hash,
+            'report': validator.summary(),
+            'results': {key: results[key] for key in dict.fromkeys(keys)},
+        }, ensure_ascii=False, separators=(',', ':')))
+
+    return validator.print_report()
+
+@instrumented("validate_questions")
+def main():
     # Chemin vers le fichier questions.json
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
-    questions_file = project_dir / "data" / "questions.json"
+
+    parser = argparse.ArgumentParser(description="Validation de la qualité des questions")
+    parser.add_argument('file', nargs='?', type=Path, default=project_dir / "data" / "questions.json",
+                        help="questions.json ou questions.ndjson")
+    parser.add_argument('--stream', action='store_true',
+                        help="validation en flux, question par question (mémoire bornée)")
+    parser.add_argument('--errors-out', type=Path,
+                        help="fichier où écrire les erreurs au fil de l'eau (mode flux)")
+    parser.add_argument('--workers', type=int,
+                        help="nombre de processus de validation (défaut: nombre de CPU)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore le cache de validation (résultats par question, rapport)")
+    args = parser.parse_args()
+    questions_file = args.file
 
     if not questions_file.exists():
         print(f"❌ Erreur: Fichier non trouvé: {questions_file}")
@@ -270,6 +543,20 @@ if __name__ == "__main__":
     print("=" * 70)
     print()
 
-    success = validate_questions_file(questions_file)
+    if args.stream or args.errors_out or questions_file.suffix == '.ndjson':
+        if args.errors_out:
+            with open(args.errors_out, 'w', encoding='utf-8') as error_stream:
+                success = validate_questions_stream(questions_file, error_stream)
+        else:
+            success = validate_questions_stream(questions_file, sys.stderr)
+    else:
+        success = validate_questions_parallel(
+            questions_file,
+            workers=args.workers,
+            cache_file=None if args.no_cache else VALIDATION_CACHE_FILE
+        )
 
     sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
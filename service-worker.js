@@ -4,8 +4,8 @@
  * Version: 2.3.0
  */
 
-const CACHE_NAME = 'quantum-quiz-v3.6';
-const CACHE_VERSION = '3.6.0';
+const CACHE_NAME = 'quantum-quiz-v3.8';
+const CACHE_VERSION = '3.8.0';
 
 // Fichiers essentiels à mettre en cache lors de l'installation
 const CORE_ASSETS = [
@@ -206,8 +206,24 @@ self.addEventListener('fetch', (event) => {
         (async () => {
             const cache = await caches.open(CACHE_NAME);
 
-            // Pour les fichiers JSON (questions), utiliser Cache First
-            if (url.pathname.endsWith('.json')) {
+            // Pointeur de version de la banque : toujours revalidé (Network First)
+            if (url.pathname.endsWith('/data/release/current.json')) {
+                try {
+                    const networkResponse = await fetch(request, { cache: 'no-cache' });
+                    if (networkResponse && networkResponse.status === 200) {
+                        cache.put(request, networkResponse.clone());
+                    }
+                    return networkResponse;
+                } catch (err) {
+                    const cachedResponse = await cache.match(request);
+                    if (cachedResponse) {
+                        return cachedResponse;
+                    }
+                }
+            }
+
+            // Pour les fichiers JSON (questions) et la banque binaire, utiliser Cache First
+            if (url.pathname.endsWith('.json') || url.pathname.endsWith('.msgpack')) {
                 const cachedResponse = await cache.match(request);
                 if (cachedResponse) {
                     // Mettre à jour en arrière-plan
@@ -248,7 +264,7 @@ self.addEventListener('fetch', (event) => {
                 const networkResponse = await fetch(request);
                 if (networkResponse && networkResponse.status === 200) {
                     // Mettre en cache les ressources statiques
-                    if (url.pathname.match(/\.(js|css|png|jpg|jpeg|svg|webp|woff2?)$/)) {
+                    if (url.pathname.match(/\.(js|css|png|jpg|jpeg|svg|webp|woff2?|msgpack)$/)) {
                         cache.put(request, networkResponse.clone());
                     }
                 }
@@ -91,7 +91,7 @@ if [ "$MODE_CHOICE" = "1" ]; then
     echo -e "${YELLOW}ℹ Mode local: Les données sont stockées uniquement sur votre appareil${NC}"
     echo ""
 
-    python3 -m http.server $PORT
+    python3 scripts/static_server.py --port $PORT
 
 # =============================================================================
 # MODE COMPLET
@@ -136,7 +136,7 @@ elif [ "$MODE_CHOICE" = "2" ]; then
 
     # Démarrer le serveur HTTP pour le frontend
     echo -e "${GREEN}✓ Serveur HTTP frontend démarrant...${NC}"
-    python3 -m http.server 8000 &
+    python3 scripts/static_server.py --port 8000 &
     FRONTEND_PID=$!
 
     echo ""
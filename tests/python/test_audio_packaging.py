@@ -0,0 +1,34 @@
+"""
+Tests de l'analyse des trames MP3 (scripts/audio_packaging.py)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from audio_packaging import MPEG2_BITRATES, mp3_bitrate, mp3_frames  # noqa: E402
+
+
+def frame(bitrate):
+    """Trame MPEG-2 Layer III mono à 24 kHz, sans CRC, données nulles"""
+    header = (0x7FF << 21) | (2 << 19) | (1 << 17) | (1 << 16)
+    header |= MPEG2_BITRATES.index(bitrate) << 12 | (1 << 10) | (3 << 6)
+    return header.to_bytes(4, 'big') + bytes(72000 * bitrate // 24000 - 4)
+
+
+class Mp3BitrateTest(unittest.TestCase):
+    def test_constant_bitrate_is_read_from_the_headers(self):
+        frames = mp3_frames(frame(32) * 50)
+        self.assertEqual(len(frames), 50)
+        self.assertEqual(mp3_bitrate(frames), 32)
+
+    def test_variable_bitrate_is_averaged_over_the_duration(self):
+        frames = mp3_frames(frame(32) * 30 + frame(64) * 30)
+        self.assertEqual(mp3_bitrate(frames), 48)
+
+
+if __name__ == '__main__':
+    unittest.main()
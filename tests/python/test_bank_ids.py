@@ -0,0 +1,80 @@
+"""
+Tests de l'attribution des IDs (scripts/bank_ids.py)
+"""
+
+import copy
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from bank_ids import IdAllocator, bank_keys, content_key, find_id_collisions, repair_ids  # noqa: E402
+
+FIXTURE = ROOT / "tests" / "fixtures" / "mini-bank.json"
+
+
+def load_fixture():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class IdAllocatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.counters_file = Path(self.tmp.name) / "id_counters.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_allocate_continues_after_bank_ids(self):
+        allocator = IdAllocator.load(load_fixture(), self.counters_file)
+        self.assertEqual(allocator.allocate(1, 'qcm'), 'ch1-q016')
+        self.assertEqual(allocator.allocate(1, 'hotspot'), 'ch1-h005')
+        self.assertEqual(allocator.allocate(7, 'qcm'), 'ch7-q001')
+
+    def test_claim_keeps_free_ids_only(self):
+        allocator = IdAllocator.load(load_fixture(), self.counters_file)
+        self.assertEqual(allocator.claim('ch1-q500', 1, 'qcm'), 'ch1-q500')
+        self.assertEqual(allocator.claim('ch1-q001', 1, 'qcm'), 'ch1-q501')
+
+    def test_counters_persist(self):
+        allocator = IdAllocator.load(None, self.counters_file)
+        allocator.allocate(2, 'flashcard')
+        allocator.allocate(2, 'flashcard')
+        allocator.save()
+        reloaded = IdAllocator.load(None, self.counters_file)
+        self.assertEqual(reloaded.allocate(2, 'flashcard'), 'ch2-fc003')
+
+
+class CollisionTest(unittest.TestCase):
+    def test_repair_renames_duplicates_and_missing(self):
+        data = load_fixture()
+        questions = data['chapters'][0]['questions']
+        questions.append(copy.deepcopy(questions[0]))
+        del questions[1]['id']
+        self.assertEqual(len(find_id_collisions(data)), 2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            allocator = IdAllocator.load(data, Path(tmp) / "id_counters.json")
+            renames = repair_ids(data, allocator)
+        self.assertEqual([r['old_id'] for r in renames], [None, 'ch1-q001'])
+        self.assertEqual(find_id_collisions(data), [])
+
+    def test_content_key_ignores_id(self):
+        data = load_fixture()
+        question = data['chapters'][0]['questions'][0]
+        renamed = {**question, 'id': 'ch1-q999'}
+        self.assertEqual(content_key(renamed), content_key(question))
+        self.assertNotEqual(content_key({**question, 'difficulty': 'hard'}), content_key(question))
+
+        ids, contents = bank_keys(data)
+        self.assertIn('ch1-q001', ids)
+        self.assertIn(content_key(renamed), contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
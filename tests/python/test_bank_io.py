@@ -0,0 +1,138 @@
+"""
+Tests des écritures de la banque (scripts/bank_io.py) : verrou entre
+processus, écriture atomique, lecture-modification-écriture, lots différés
+"""
+
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from bank_io import WriteBatch, atomic_write_text, edit_bank, file_lock, save_bank  # noqa: E402
+
+# Processus qui garde le verrou jusqu'à ce que son entrée standard soit fermée
+HOLD_LOCK = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from bank_io import file_lock
+with file_lock(sys.argv[2]):
+    print('locked', flush=True)
+    sys.stdin.read()
+"""
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "questions.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lock_excludes_other_processes(self):
+        holder = subprocess.Popen(
+            [sys.executable, '-c', HOLD_LOCK, str(SCRIPTS_DIR), str(self.path)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), 'locked')
+            with self.assertRaises(TimeoutError), redirect_stderr(io.StringIO()):
+                with file_lock(self.path, timeout=0.2, poll_interval=0.01):
+                    pass
+        finally:
+            holder.stdin.close()
+            holder.wait(timeout=10)
+            holder.stdout.close()
+        with file_lock(self.path, timeout=5):
+            pass
+
+    def test_lock_is_reentrant_in_thread(self):
+        with file_lock(self.path, timeout=1):
+            with file_lock(self.path, timeout=0.1):
+                pass
+
+    def test_lock_excludes_other_threads(self):
+        errors = []
+
+        def contend():
+            try:
+                with redirect_stderr(io.StringIO()):
+                    with file_lock(self.path, timeout=0.2, poll_interval=0.01):
+                        pass
+            except TimeoutError as e:
+                errors.append(e)
+
+        with file_lock(self.path, timeout=1):
+            thread = threading.Thread(target=contend)
+            thread.start()
+            thread.join(timeout=10)
+        self.assertEqual(len(errors), 1)
+        with file_lock(self.path, timeout=5):
+            pass
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replaces_content_without_leftovers(self):
+        path = self.dir / "sub" / "file.json"
+        atomic_write_text(path, "premier")
+        atomic_write_text(path, "second")
+        self.assertEqual(path.read_text(encoding='utf-8'), "second")
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), ["file.json"])
+
+    def test_edit_bank_writes_only_on_change(self):
+        path = self.dir / "questions.json"
+        save_bank({'chapters': []}, path)
+        inode = path.stat().st_ino
+        with edit_bank(path):
+            pass
+        # Contenu inchangé : le fichier n'est pas remplacé
+        self.assertEqual(path.stat().st_ino, inode)
+
+        with edit_bank(path) as data:
+            data['chapters'].append({'chapter_id': 1, 'questions': []})
+        self.assertNotEqual(path.stat().st_ino, inode)
+        self.assertEqual(json.loads(path.read_text(encoding='utf-8'))['chapters'][0]['chapter_id'], 1)
+
+    def test_edit_bank_discards_on_error(self):
+        path = self.dir / "questions.json"
+        original = json.dumps({'chapters': []})
+        path.write_text(original, encoding='utf-8')
+        with self.assertRaises(RuntimeError):
+            with edit_bank(path) as data:
+                data['chapters'].append({'chapter_id': 1})
+                raise RuntimeError("abandon")
+        self.assertEqual(path.read_text(encoding='utf-8'), original)
+
+    def test_write_batch_defers_writes_and_removals(self):
+        kept = self.dir / "kept.json"
+        removed = self.dir / "removed.json"
+        removed.write_text("ancien", encoding='utf-8')
+        batch = WriteBatch()
+        batch.add_text(kept, "v1")
+        batch.add_text(kept, "v2")
+        batch.remove(removed)
+        self.assertFalse(kept.exists())
+        self.assertTrue(removed.exists())
+
+        self.assertEqual(batch.commit(), [kept])
+        self.assertEqual(kept.read_text(encoding='utf-8'), "v2")
+        self.assertFalse(removed.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Fichiers de tests/fixtures/ lus par les tests JavaScript (tests/utils.test.js),
+produits par les scripts Python à partir de mini-bank.json :
+
+    mini-bank.facets.json    index de facettes (bank_facets)
+    mini-bank.msgpack        banque binaire (bank_binary.encode_bank)
+    mini-bank.figures.json   catalogue des figures et chapitres normalisés
+                             (bank_figures)
+
+Ces tests vérifient qu'ils correspondent toujours à l'encodage actuel.
+Régénération : python3 tests/python/test_client_fixtures.py --regenerate
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from bank_binary import decode_bank, encode_bank  # noqa: E402
+from bank_facets import build_facets  # noqa: E402
+from bank_figures import FigureIndex, build_catalog, expand_question, normalize_chapter  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+BANK_FIXTURE = FIXTURES / "mini-bank.json"
+FACETS_FIXTURE = FIXTURES / "mini-bank.facets.json"
+BINARY_FIXTURE = FIXTURES / "mini-bank.msgpack"
+FIGURES_FIXTURE = FIXTURES / "mini-bank.figures.json"
+
+
+def load_bank():
+    with open(BANK_FIXTURE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def figures_fixture(data):
+    catalog = build_catalog(data)
+    index = FigureIndex(catalog)
+    return {
+        'figures': catalog,
+        'shards': [normalize_chapter(chapter, index) for chapter in data['chapters']],
+    }
+
+
+def json_text(value):
+    return json.dumps(value, ensure_ascii=False, indent=2) + "\n"
+
+
+def regenerate():
+    data = load_bank()
+    FACETS_FIXTURE.write_text(json_text(build_facets(data)), encoding='utf-8')
+    BINARY_FIXTURE.write_bytes(encode_bank(data))
+    FIGURES_FIXTURE.write_text(json_text(figures_fixture(data)), encoding='utf-8')
+
+
+class ClientFixturesTest(unittest.TestCase):
+    def setUp(self):
+        self.data = load_bank()
+
+    def test_binary_round_trip(self):
+        self.assertEqual(decode_bank(encode_bank(self.data)), self.data)
+
+    def test_figures_round_trip(self):
+        derived = figures_fixture(self.data)
+        for chapter, shard in zip(self.data['chapters'], derived['shards']):
+            expanded = [expand_question(q, derived['figures']) for q in shard['questions']]
+            self.assertEqual(expanded, chapter['questions'])
+
+    def test_fixtures_are_current(self):
+        stale = "fixture périmée : python3 tests/python/test_client_fixtures.py --regenerate"
+        self.assertEqual(FACETS_FIXTURE.read_text(encoding='utf-8'), json_text(build_facets(self.data)), stale)
+        self.assertEqual(BINARY_FIXTURE.read_bytes(), encode_bank(self.data), stale)
+        self.assertEqual(FIGURES_FIXTURE.read_text(encoding='utf-8'), json_text(figures_fixture(self.data)),
+                         stale)
+
+
+if __name__ == '__main__':
+    if '--regenerate' in sys.argv:
+        regenerate()
+    else:
+        unittest.main()
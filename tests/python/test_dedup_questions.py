@@ -0,0 +1,56 @@
+"""
+Tests de la détection des doublons (scripts/dedup_questions.py)
+"""
+
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from dedup_questions import answer_key, find_duplicates  # noqa: E402
+
+HOTSPOT = {
+    'id': 'ch2-h001',
+    'type': 'hotspot',
+    'difficulty': 'hard',
+    'question': "Dans Stern-Gerlach orienté selon z, où arrive l'atome ?",
+    'image_url': 'assets/images/ch2/stern-gerlach.svg',
+    'hotspots': [
+        {'id': 'up', 'label': 'Détecteur haut', 'x': 380, 'y': 120, 'radius': 35},
+        {'id': 'down', 'label': 'Détecteur bas', 'x': 380, 'y': 280, 'radius': 35},
+    ],
+    'correct_hotspot': 'up',
+}
+
+
+class AnswerKeyTest(unittest.TestCase):
+    def test_hotspots_differing_only_in_answer_are_kept(self):
+        other = {**copy.deepcopy(HOTSPOT), 'id': 'ch2-h002', 'correct_hotspot': 'down'}
+        self.assertNotEqual(answer_key(other), answer_key(HOTSPOT))
+        self.assertEqual(find_duplicates([(2, HOTSPOT), (2, other)]), [])
+
+    def test_same_answer_is_a_duplicate(self):
+        # Zones dans un autre ordre : même réponse attendue
+        other = {**copy.deepcopy(HOTSPOT), 'id': 'ch2-h002'}
+        other['hotspots'].reverse()
+        clusters = find_duplicates([(2, HOTSPOT), (2, other)])
+        self.assertEqual([cluster['members'] for cluster in clusters], [[0, 1]])
+
+    def test_drag_drop_matches_are_part_of_the_answer(self):
+        question = {
+            'type': 'drag_drop',
+            'question': "Classez ces expériences selon leur époque",
+            'draggable_items': [{'id': 'young', 'text': "Fentes d'Young"}, {'id': 'bell', 'text': "Bell"}],
+            'drop_zones': [{'id': 'a', 'label': 'XIXe siècle'}, {'id': 'b', 'label': 'Années 1960'}],
+            'correct_matches': {'young': 'a', 'bell': 'b'},
+        }
+        swapped = {**question, 'correct_matches': {'young': 'b', 'bell': 'a'}}
+        self.assertNotEqual(answer_key(swapped), answer_key(question))
+        self.assertEqual(find_duplicates([(1, question), (1, swapped)]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
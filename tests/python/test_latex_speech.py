@@ -0,0 +1,29 @@
+"""
+Tests de la lecture à voix haute du LaTeX (scripts/latex_speech.py)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from latex_speech import tex_to_speech, text_to_speech  # noqa: E402
+
+
+class TexToSpeechTest(unittest.TestCase):
+    def test_symbols_and_commands(self):
+        self.assertEqual(tex_to_speech(r"\frac{h}{p}"), "h sur p")
+        self.assertEqual(tex_to_speech(r"E = mc^2"), "E égale m c au carré")
+
+    def test_matrix_reads_cells_not_environment_name(self):
+        self.assertEqual(tex_to_speech(r"\begin{pmatrix}0&1\\1&0\end{pmatrix}"), "matrice 0, 1; 1, 0")
+        self.assertEqual(tex_to_speech(r"\begin{array}{cc} a & b \\ c & d \end{array}"), "a, b; c, d")
+
+    def test_matrix_inside_text(self):
+        spoken = text_to_speech(r"Soit $\hat{A} = \begin{pmatrix}3&1\\1&3\end{pmatrix}$. Valeur propre ?")
+        self.assertEqual(spoken, "Soit A chapeau égale matrice 3, 1; 1, 3. Valeur propre ?")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Tests de la correction des dimensions d'image (scripts/validate_hotspots.py)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from validate_hotspots import fill_image_dimensions  # noqa: E402
+
+IMAGE = 'assets/images/ch2/stern-gerlach.svg'
+
+
+def bank(*questions):
+    return {'chapters': [{'chapter_id': 2, 'questions': list(questions)}]}
+
+
+class FillImageDimensionsTest(unittest.TestCase):
+    def test_missing_dimensions_are_filled(self):
+        question = {'id': 'q1', 'image_url': IMAGE, 'hotspots': [{'id': 'up', 'x': 380, 'y': 120, 'radius': 35}]}
+        self.assertEqual(fill_image_dimensions(bank(question), {IMAGE: (800, 400)}), ['q1'])
+        self.assertEqual(question['image_dimensions'], {'width': 800, 'height': 400})
+        self.assertEqual(question['hotspots'][0], {'id': 'up', 'x': 380, 'y': 120, 'radius': 35})
+
+    def test_mismatched_dimensions_rescale_hotspots(self):
+        question = {
+            'id': 'q1', 'image_url': IMAGE,
+            'image_dimensions': {'width': 400, 'height': 200},
+            'hotspots': [{'id': 'up', 'x': 190, 'y': 60, 'radius': 20}],
+        }
+        self.assertEqual(fill_image_dimensions(bank(question), {IMAGE: (800, 300)}), ['q1'])
+        self.assertEqual(question['image_dimensions'], {'width': 800, 'height': 300})
+        self.assertEqual(question['hotspots'][0], {'id': 'up', 'x': 380, 'y': 90, 'radius': 30})
+
+    def test_matching_dimensions_are_left_alone(self):
+        question = {
+            'id': 'q1', 'image_url': IMAGE,
+            'image_dimensions': {'width': 800, 'height': 400},
+            'hotspots': [{'id': 'up', 'x': 380, 'y': 120, 'radius': 35}],
+        }
+        self.assertEqual(fill_image_dimensions(bank(question), {IMAGE: (800, 400)}), [])
+        self.assertEqual(question['hotspots'][0]['x'], 380)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests des modes de validation (scripts/validate_questions.py) : sur place,
+pool de processus, flux NDJSON, et cache (par question et par fichier)
+"""
+
+import copy
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import validate_questions  # noqa: E402
+from bank_ndjson import bank_to_ndjson  # noqa: E402
+from validate_questions import (  # noqa: E402
+    load_validation_cache, validate_questions_parallel, validate_questions_stream
+)
+
+FIXTURE = ROOT / "tests" / "fixtures" / "mini-bank.json"
+
+
+def quietly(function, *args, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+class ValidationModesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        with open(FIXTURE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # Une erreur (difficulté inconnue) et un ID dupliqué
+        questions = data['chapters'][1]['questions']
+        questions[0]['difficulty'] = 'impossible'
+        questions.append(copy.deepcopy(questions[1]))
+        self.duplicate = questions[1]['id']
+        self.bank = self.dir / "questions.json"
+        self.bank.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        self.ndjson = self.dir / "questions.ndjson"
+        self.ndjson.write_text(bank_to_ndjson(data), encoding='utf-8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def report(self, cache_file):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)['report']
+
+    def test_modes_agree(self):
+        sequential = self.dir / "sequential.json"
+        self.assertFalse(quietly(validate_questions_parallel, self.bank, workers=1, cache_file=sequential))
+        with mock.patch.object(validate_questions, 'PARALLEL_THRESHOLD', 1):
+            pooled = self.dir / "pooled.json"
+            self.assertFalse(quietly(validate_questions_parallel, self.bank, workers=2, cache_file=pooled))
+        self.assertEqual(self.report(pooled), self.report(sequential))
+
+        report = self.report(sequential)
+        self.assertEqual(report['duplicate_ids'], [self.duplicate])
+        self.assertTrue(any('impossible' in error for error in report['errors']))
+
+        errors = io.StringIO()
+        self.assertFalse(quietly(validate_questions_stream, self.ndjson, errors))
+        streamed = [line for line in errors.getvalue().splitlines() if line.startswith('ERREUR')]
+        self.assertEqual(len(streamed), report['error_count'])
+
+    def validate(self, cache_file):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            validate_questions_parallel(self.bank, workers=1, cache_file=cache_file)
+        return output.getvalue()
+
+    def test_cache_follows_file_content(self):
+        cache_file = self.dir / "validation_cache.json"
+        self.assertIn("(0 en cache, 11 à valider)", self.validate(cache_file))
+        self.assertEqual(len(load_validation_cache(cache_file)['results']), 11)
+        self.assertIn("rapport en cache", self.validate(cache_file))
+
+        # Même taille, une question modifiée : seule celle-ci est revalidée
+        self.bank.write_text(self.bank.read_text(encoding='utf-8').replace('impossible', 'impossibl3'),
+                             encoding='utf-8')
+        output = self.validate(cache_file)
+        self.assertNotIn("rapport en cache", output)
+        self.assertIn("(11 en cache, 1 à valider)", output)
+        self.assertTrue(any('impossibl3' in error for error in self.report(cache_file)['errors']))
+
+
+if __name__ == '__main__':
+    unittest.main()
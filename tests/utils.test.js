@@ -280,4 +280,265 @@ describe('Utils - Fonctions utilitaires', () => {
             expect(localStorage.removeItem).toHaveBeenCalledWith('test_key');
         });
     });
+
+    // ==================== js/utils.js (chargement de la banque) ====================
+    // Ces tests exécutent le vrai js/utils.js sur les fichiers de tests/fixtures/,
+    // produits par les scripts Python (tests/python/test_client_fixtures.py)
+    describe('Chargement de la banque (js/utils.js)', () => {
+        const fs = require('fs');
+        const path = require('path');
+        const { TextDecoder } = require('util');
+
+        const FIXTURES = path.join(__dirname, 'fixtures');
+        const readFixture = (name) => JSON.parse(fs.readFileSync(path.join(FIXTURES, name), 'utf8'));
+        const bank = readFixture('mini-bank.json');
+        const clone = (value) => JSON.parse(JSON.stringify(value));
+
+        // Chaque chargement a ses propres caches (banque, explications, facettes)
+        const loadUtils = (fetchMock) => {
+            const source = fs.readFileSync(path.join(__dirname, '../js/utils.js'), 'utf8');
+            const exported = ['loadQuestionBank', 'selectQuestionsByFacets', 'fetchQuestionsFromAPI',
+                'decodeBinaryBank', 'expandFigures', 'ensureExplanations', 'loadExplanationAudio'];
+            return new Function('fetch', 'TextDecoder', `${source}\nreturn { ${exported.join(', ')} };`)(
+                fetchMock, TextDecoder);
+        };
+
+        const jsonResponse = (body, status = 200) => Promise.resolve({
+            ok: status >= 200 && status < 300,
+            status,
+            json: () => Promise.resolve(clone(body)),
+            text: () => Promise.resolve(JSON.stringify(body))
+        });
+
+        // fetch simulé : URL (sans ?v=) -> contenu JSON
+        const fetchFiles = (files) => jest.fn((url) => {
+            const file = files[url.split('?')[0]];
+            return file === undefined ? jsonResponse({}, 404) : jsonResponse(file);
+        });
+        const fetchedUrls = (fetchMock) => fetchMock.mock.calls.map(call => call[0].split('?')[0]);
+
+        describe('loadQuestionBank()', () => {
+            const files = {
+                'data/shards/manifest.json': {
+                    course_info: bank.course_info,
+                    metadata: bank.metadata,
+                    shards: bank.chapters.map(chapter => ({
+                        chapter_id: chapter.chapter_id,
+                        url: `data/shards/chapter_${chapter.chapter_id}.json?v=0`
+                    }))
+                },
+                'data/shards/chapter_1.json': bank.chapters[0],
+                'data/shards/chapter_2.json': bank.chapters[1]
+            };
+
+            test('charge le manifeste puis tous les fragments', async () => {
+                const { loadQuestionBank } = loadUtils(fetchFiles(files));
+                expect(await loadQuestionBank()).toEqual(bank);
+            });
+
+            test('ne télécharge que les chapitres demandés, une seule fois', async () => {
+                const fetchMock = fetchFiles(files);
+                const { loadQuestionBank } = loadUtils(fetchMock);
+
+                const data = await loadQuestionBank([2]);
+                await loadQuestionBank([2]);
+
+                expect(data.chapters).toEqual([bank.chapters[1]]);
+                const urls = fetchedUrls(fetchMock);
+                expect(urls).not.toContain('data/shards/chapter_1.json');
+                expect(urls.filter(url => url === 'data/shards/chapter_2.json')).toHaveLength(1);
+            });
+
+            test('sans manifeste, retombe sur questions.json', async () => {
+                const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+                const { loadQuestionBank } = loadUtils(fetchFiles({ 'data/questions.json': bank }));
+                expect(await loadQuestionBank()).toEqual(bank);
+                expect(warn).toHaveBeenCalled();
+                warn.mockRestore();
+            });
+        });
+
+        describe('selectQuestionsByFacets()', () => {
+            const facets = readFixture('mini-bank.facets.json');
+            const questions = bank.chapters.flatMap(chapter => chapter.questions);
+
+            test('intersecte les facettes demandées', () => {
+                const { selectQuestionsByFacets } = loadUtils(jest.fn());
+                const selected = selectQuestionsByFacets(facets, bank, {
+                    chapter: '1', difficulty: ['easy', 'medium'], tag: null
+                });
+                const expected = bank.chapters[0].questions
+                    .filter(q => ['easy', 'medium'].includes(q.difficulty));
+                expect(selected.map(q => q.id)).toEqual(expected.map(q => q.id));
+            });
+
+            test('sans filtre, retourne toutes les questions chargées', () => {
+                const { selectQuestionsByFacets } = loadUtils(jest.fn());
+                expect(selectQuestionsByFacets(facets, bank, {})).toHaveLength(questions.length);
+            });
+
+            test('retourne null si l\'index ne correspond pas à la banque', () => {
+                const { selectQuestionsByFacets } = loadUtils(jest.fn());
+                const edited = clone(bank);
+                edited.chapters[1].questions.pop();
+                expect(selectQuestionsByFacets(facets, edited, { chapter: '2' })).toBeNull();
+            });
+        });
+
+        describe('fetchQuestionsFromAPI()', () => {
+            beforeEach(() => {
+                sessionStorage.clear();
+            });
+
+            test('transmet filtres, nombre et exclusions au service', async () => {
+                const picked = bank.chapters[0].questions.slice(0, 2);
+                const fetchMock = jest.fn(() => jsonResponse({ questions: picked }));
+                const { fetchQuestionsFromAPI } = loadUtils(fetchMock);
+
+                const result = await fetchQuestionsFromAPI(
+                    { chapter: '1', difficulty: ['easy', 'medium'], type: null }, 2, ['ch1-q003']);
+
+                expect(result).toEqual(picked);
+                const params = new URL(fetchMock.mock.calls[0][0], 'http://localhost/').searchParams;
+                expect(params.get('count')).toBe('2');
+                expect(params.get('chapter')).toBe('1');
+                expect(params.get('difficulty')).toBe('easy,medium');
+                expect(params.has('type')).toBe(false);
+                expect(params.get('exclude')).toBe('ch1-q003');
+            });
+
+            test('service absent : null, mémorisé pour la session', async () => {
+                const fetchMock = jest.fn(() => Promise.reject(new Error('réseau')));
+                const { fetchQuestionsFromAPI } = loadUtils(fetchMock);
+
+                expect(await fetchQuestionsFromAPI({}, 5)).toBeNull();
+                expect(await fetchQuestionsFromAPI({}, 5)).toBeNull();
+                expect(fetchMock).toHaveBeenCalledTimes(1);
+            });
+
+            test('requête refusée : null sans désactiver le service', async () => {
+                const fetchMock = jest.fn(() => jsonResponse({ error: 'count' }, 400));
+                const { fetchQuestionsFromAPI } = loadUtils(fetchMock);
+
+                expect(await fetchQuestionsFromAPI({}, 0)).toBeNull();
+                await fetchQuestionsFromAPI({}, 0);
+                expect(fetchMock).toHaveBeenCalledTimes(2);
+            });
+        });
+
+        describe('decodeBinaryBank()', () => {
+            const binary = fs.readFileSync(path.join(FIXTURES, 'mini-bank.msgpack'));
+            const buffer = () => binary.buffer.slice(binary.byteOffset, binary.byteOffset + binary.byteLength);
+
+            test('redonne la banque encodée par bank_binary.py', () => {
+                const { decodeBinaryBank } = loadUtils(jest.fn());
+                expect(decodeBinaryBank(buffer())).toEqual(bank);
+            });
+
+            test('refuse un fichier tronqué', () => {
+                const { decodeBinaryBank } = loadUtils(jest.fn());
+                expect(() => decodeBinaryBank(buffer().slice(0, 100))).toThrow('tronquée');
+            });
+
+            test('refuse un en-tête inconnu', () => {
+                const { decodeBinaryBank } = loadUtils(jest.fn());
+                expect(() => decodeBinaryBank(new Uint8Array([0x80]).buffer)).toThrow('En-tête');
+            });
+        });
+
+        describe('expandFigures()', () => {
+            const { figures, shards } = readFixture('mini-bank.figures.json');
+
+            test('redonne les questions hotspot de la banque', () => {
+                const { expandFigures } = loadUtils(jest.fn());
+                shards.forEach((shard, index) => {
+                    expect(expandFigures(clone(shard), figures)).toEqual(bank.chapters[index]);
+                });
+            });
+
+            test('laisse les autres questions intactes', () => {
+                const { expandFigures } = loadUtils(jest.fn());
+                const chapter = { chapter_id: 9, questions: [{ id: 'q1', type: 'qcm' }] };
+                expect(expandFigures(clone(chapter), figures)).toEqual(chapter);
+            });
+        });
+
+        describe('ensureExplanations()', () => {
+            const block = (chapter) => ({
+                chapter_id: chapter.chapter_id,
+                ids: chapter.questions.map(q => q.id),
+                explanations: chapter.questions.map(q => q.explanation === undefined ? null : q.explanation)
+            });
+            const files = {
+                'data/explanations/manifest.json': {
+                    chapters: bank.chapters.map(chapter => ({
+                        chapter_id: chapter.chapter_id,
+                        url: `data/explanations/chapter_${chapter.chapter_id}.json?v=0`
+                    }))
+                },
+                'data/explanations/chapter_1.json': block(bank.chapters[0]),
+                'data/explanations/chapter_2.json': block(bank.chapters[1]),
+                'data/facets.json': readFixture('mini-bank.facets.json')
+            };
+            const withoutExplanation = (question) => {
+                const copy = clone(question);
+                delete copy.explanation;
+                return copy;
+            };
+
+            test('complète les questions par chapitre connu', async () => {
+                const fetchMock = fetchFiles(files);
+                const { ensureExplanations } = loadUtils(fetchMock);
+                const original = bank.chapters[1].questions[0];
+                const question = { ...withoutExplanation(original), chapter_id: 2 };
+
+                await ensureExplanations([question]);
+
+                expect(question.explanation).toBe(original.explanation);
+                expect(fetchedUrls(fetchMock)).not.toContain('data/explanations/chapter_1.json');
+                expect(fetchedUrls(fetchMock)).not.toContain('data/facets.json');
+            });
+
+            test('trouve le chapitre par l\'index de facettes', async () => {
+                const fetchMock = fetchFiles(files);
+                const { ensureExplanations } = loadUtils(fetchMock);
+                const original = bank.chapters[0].questions[2];
+                const question = withoutExplanation(original);
+
+                await ensureExplanations([question]);
+
+                expect(question.explanation).toBe(original.explanation);
+                expect(fetchedUrls(fetchMock)).not.toContain('data/explanations/chapter_2.json');
+            });
+
+            test('ne télécharge rien si les explications sont présentes', async () => {
+                const fetchMock = fetchFiles(files);
+                const { ensureExplanations } = loadUtils(fetchMock);
+
+                await ensureExplanations([clone(bank.chapters[0].questions[0])]);
+
+                expect(fetchMock).not.toHaveBeenCalled();
+            });
+        });
+
+        describe('loadExplanationAudio()', () => {
+            const narration = { url: 'assets/audio/explanations/0123456789abcdef0123.mp3', bytes: 1000, chars: 80 };
+
+            test('retourne les fichiers audio par ID, une seule fois', async () => {
+                const fetchMock = fetchFiles({
+                    'assets/audio/explanations/manifest.json': { version: 1, questions: { 'ch1-q001': narration } }
+                });
+                const { loadExplanationAudio } = loadUtils(fetchMock);
+
+                expect(await loadExplanationAudio()).toEqual({ 'ch1-q001': narration });
+                await loadExplanationAudio();
+                expect(fetchMock).toHaveBeenCalledTimes(1);
+            });
+
+            test('sans narration générée, aucune question n\'a d\'audio', async () => {
+                const { loadExplanationAudio } = loadUtils(fetchFiles({}));
+                expect(await loadExplanationAudio()).toEqual({});
+            });
+        });
+    });
 });